@@ -0,0 +1,56 @@
+import threading
+from typing import Callable, List
+
+
+class TaskCancelled(Exception):
+    """任务已被取消"""
+
+
+class CancellationToken:
+    """
+    线程安全的取消令牌
+
+    由发起方（通常是 ViewModel）持有并调用 cancel()，执行方（API 层）在
+    循环中检查 is_cancelled 或调用 raise_if_cancelled()。注册的回调会在
+    取消时立即执行，用于关闭阻塞中的网络连接等资源。
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    def cancel(self):
+        """请求取消"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"执行取消回调失败: {e}")
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """如果已取消则抛出 TaskCancelled"""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+    def add_callback(self, callback: Callable[[], None]):
+        """注册取消回调；若已取消则立即执行"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
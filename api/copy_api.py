@@ -7,10 +7,12 @@ from typing import List, Dict
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from config import config
+from api.http_session import get_session, response_json
 
 
 class CopyAPI:
     def __init__(self, token: str = ""):
+        self._session = get_session()
         self.token = token
         self.headers = {
             "Authorization": f"Bearer {token}" if token else "",
@@ -20,6 +22,7 @@ class CopyAPI:
     def set_token(self, token: str):
         """设置认证 token"""
         self.token = token
+        self._session.set_token(token)
         self.headers["Authorization"] = f"Bearer {token}"
     
     def copy_files(self, files: List[str], to_dir: str, action: str = "copy") -> Dict:
@@ -46,7 +49,7 @@ class CopyAPI:
             }
             
             # 发送POST请求
-            response = requests.post(
+            response = self._session.post(
                 api_url,
                 json=request_data,
                 headers=self.headers,
@@ -57,14 +60,14 @@ class CopyAPI:
             if response.status_code == 200:
                 return {
                     "success": True,
-                    "data": response.json(),
+                    "data": response_json(response),
                     "message": "操作成功"
                 }
             else:
                 return {
                     "success": False,
                     "error": f"请求失败，状态码: {response.status_code}",
-                    "data": response.json() if response.content else None
+                    "data": response_json(response) if response.content else None
                 }
                 
         except requests.exceptions.RequestException as e:
@@ -7,10 +7,12 @@ from typing import List, Dict
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from config import config
+from api.http_session import get_session, response_json
 
 
 class DeleteAPI:
     def __init__(self, token: str = ""):
+        self._session = get_session()
         self.token = token
         self.headers = {
             "Authorization": f"Bearer {token}" if token else "",
@@ -20,6 +22,7 @@ class DeleteAPI:
     def set_token(self, token: str):
         """设置认证 token"""
         self.token = token
+        self._session.set_token(token)
         self.headers["Authorization"] = f"Bearer {token}"
     
     def delete_files(self, files: List[str]) -> Dict:
@@ -39,12 +42,12 @@ class DeleteAPI:
         }
         
         try:
-            response = requests.post(url, headers=self.headers, json=data)
+            response = self._session.post(url, headers=self.headers, json=data)
             
             return {
                 "success": response.status_code == 200,
                 "status_code": response.status_code,
-                "data": response.json() if response.status_code == 200 else None,
+                "data": response_json(response) if response.status_code == 200 else None,
                 "error": response.text if response.status_code != 200 else None
             }
             
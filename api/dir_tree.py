@@ -0,0 +1,220 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class DirNode:
+    """目录树中的一个文件夹"""
+
+    __slots__ = ("path", "title", "parent", "children", "raw")
+
+    def __init__(self, path: str, title: str, parent: Optional[str], raw: Optional[list]):
+        self.path = path
+        self.title = title
+        self.parent = parent  # 父节点路径，虚拟根节点为 None
+        self.children: Optional[List[str]] = None  # 子节点路径，None 表示尚未展开
+        self.raw = raw  # 尚未展开的子目录（/api/getdirtree 返回的原始结构）
+
+    @property
+    def is_expanded(self) -> bool:
+        return self.children is not None
+
+    @property
+    def has_children(self) -> bool:
+        return bool(self.children) if self.children is not None else bool(self.raw)
+
+
+def _base_name(path: str) -> str:
+    return path.rpartition("/")[2]
+
+
+def _join(parent: str, name: str) -> str:
+    return f"{parent}/{name}" if parent else name
+
+
+def _rebase(raw: Dict, old_prefix: str, new_prefix: str) -> Dict:
+    """复制原始目录结构，把路径前缀 old_prefix 换成 new_prefix"""
+    value = raw.get("value", "") or ""
+    if value == old_prefix or value.startswith(old_prefix + "/"):
+        value = new_prefix + value[len(old_prefix):]
+    return {
+        "value": value,
+        "title": raw.get("title", ""),
+        "children": [_rebase(child, old_prefix, new_prefix) for child in raw.get("children") or [] if child]
+    }
+
+
+def iter_dir_paths(dirs: Optional[list]) -> Iterator[Tuple[str, bool]]:
+    """遍历 /api/getdirtree 的 dirs 结构，产生 (路径, True)，可直接交给搜索索引"""
+    stack = list(dirs or [])
+    while stack:
+        raw = stack.pop()
+        if not raw:
+            continue
+        path = raw.get("value", "") or ""
+        if path:
+            yield path, True
+        stack.extend(raw.get("children") or [])
+
+
+class DirTreeIndex:
+    """
+    目录树索引
+
+    由 /api/getdirtree 的结果构建，节点按路径保存在字典中，查找为 O(1)。
+    子目录在第一次访问时才展开建立索引，大目录树不必一次性全部建好；
+    查找尚未展开的深层路径时沿路径逐级展开。
+    新建、移动、复制、删除文件夹后可直接修补索引，不必重新请求整棵树。
+    只应在 GUI 线程中访问（查找也可能展开节点）。
+    """
+
+    def __init__(self, dirs: Optional[list] = None):
+        self._root = DirNode("", "", None, list(dirs or []))
+        self._nodes: Dict[str, DirNode] = {"": self._root}
+        self.version = 0  # 每次修补后递增
+
+    @classmethod
+    def from_response(cls, data: Optional[Dict]) -> "DirTreeIndex":
+        return cls((data or {}).get("dirs") or [])
+
+    # ---- 查找 ----
+
+    def _expand(self, node: DirNode) -> List[str]:
+        if node.children is None:
+            children = []
+            for raw in node.raw or []:
+                if not raw:
+                    continue
+                path = raw.get("value", "") or ""
+                if not path or path in self._nodes:
+                    continue
+                title = raw.get("title", "") or _base_name(path)
+                self._nodes[path] = DirNode(path, title, node.path, raw.get("children") or [])
+                children.append(path)
+            node.children = children
+            node.raw = None
+        return node.children
+
+    def get(self, path: str) -> Optional[DirNode]:
+        """按路径查找文件夹（"" 为虚拟根节点），不存在时返回 None"""
+        node = self._nodes.get(path)
+        if node is None and path:
+            # 祖先目录尚未展开时沿路径逐级展开
+            self._expand(self._root)
+            parts = path.split("/")
+            for depth in range(1, len(parts)):
+                ancestor = self._nodes.get("/".join(parts[:depth]))
+                if ancestor is not None:
+                    self._expand(ancestor)
+            node = self._nodes.get(path)
+        return node
+
+    def __contains__(self, path: str) -> bool:
+        return self.get(path) is not None
+
+    def children(self, path: str = "") -> List[DirNode]:
+        """列出子文件夹"""
+        node = self.get(path)
+        if node is None:
+            return []
+        return [self._nodes[child] for child in self._expand(node)]
+
+    def ancestors(self, path: str) -> List[DirNode]:
+        """从顶层到 path 本身的各级文件夹（面包屑），不包括虚拟根节点"""
+        chain = []
+        node = self.get(path)
+        while node is not None and node.parent is not None:
+            chain.append(node)
+            node = self._nodes.get(node.parent)
+        chain.reverse()
+        return chain
+
+    def complete(self, text: str, limit: int = 20) -> List[str]:
+        """路径补全：返回父目录下名称以最后一段开头的子文件夹（不区分大小写）"""
+        parent, _, partial = text.rpartition("/")
+        partial = partial.casefold()
+        matches = []
+        for child in self.children(parent):
+            if child.title.casefold().startswith(partial):
+                matches.append(child.path)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def is_empty(self) -> bool:
+        return not self._root.has_children
+
+    def indexed_count(self) -> int:
+        """已展开建立索引的文件夹数"""
+        return len(self._nodes) - 1
+
+    # ---- 修补 ----
+
+    def add(self, path: str, title: str = "") -> bool:
+        """新建文件夹；父目录不在树中或路径已存在时返回 False"""
+        if not path or self.get(path) is not None:
+            return False
+        parent = self.get(path.rpartition("/")[0])
+        if parent is None:
+            return False
+        self._attach(parent, {"value": path, "title": title or _base_name(path), "children": []})
+        return True
+
+    def remove(self, path: str) -> bool:
+        """删除文件夹及其全部子目录；不在树中（例如是文件）时返回 False"""
+        node = self.get(path)
+        if node is None or node.parent is None:
+            return False
+        self._nodes[node.parent].children.remove(path)
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            del self._nodes[current.path]
+            if current.children:
+                stack.extend(self._nodes[child] for child in current.children)
+        self.version += 1
+        return True
+
+    def move(self, path: str, new_parent: str) -> bool:
+        """把文件夹移动到 new_parent 下"""
+        return self._transfer(path, new_parent, keep_source=False)
+
+    def copy(self, path: str, new_parent: str) -> bool:
+        """把文件夹复制到 new_parent 下"""
+        return self._transfer(path, new_parent, keep_source=True)
+
+    def _transfer(self, path: str, new_parent: str, keep_source: bool) -> bool:
+        node = self.get(path)
+        target = self.get(new_parent)
+        if node is None or node.parent is None or target is None:
+            return False
+        if new_parent == path or new_parent.startswith(path + "/"):
+            return False
+        new_path = _join(new_parent, _base_name(path))
+        if new_path == path or self.get(new_path) is not None:
+            return False
+        subtree = _rebase(self._export(node), path, new_path)
+        if not keep_source:
+            self.remove(path)
+        self._attach(target, subtree)
+        return True
+
+    def _attach(self, parent: DirNode, raw: Dict):
+        if parent.children is None:
+            parent.raw.append(raw)
+        else:
+            path = raw["value"]
+            self._nodes[path] = DirNode(path, raw["title"], parent.path, raw["children"])
+            parent.children.append(path)
+        self.version += 1
+
+    # ---- 导出 ----
+
+    def _export(self, node: DirNode) -> Dict:
+        if node.children is None:
+            children = list(node.raw or [])
+        else:
+            children = [self._export(self._nodes[child]) for child in node.children]
+        return {"value": node.path, "title": node.title, "children": children}
+
+    def to_dirs(self) -> list:
+        """导出为 /api/getdirtree 的 dirs 结构（用于写入本地缓存）"""
+        return self._export(self._root)["children"]
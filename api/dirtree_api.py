@@ -0,0 +1,50 @@
+import requests
+import sys
+import os
+from typing import Dict
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config import config
+from api.http_session import get_session, response_json
+
+
+class DirTreeAPI:
+    def __init__(self, token: str = ""):
+        self._session = get_session()
+        self.token = token
+        self.headers = {
+            "Authorization": f"Bearer {token}" if token else "",
+            "Content-Type": "application/json"
+        }
+
+    def set_token(self, token: str):
+        """设置认证 token"""
+        self.token = token
+        self._session.set_token(token)
+        self.headers["Authorization"] = f"Bearer {token}"
+
+    def get_dir_tree(self) -> Dict:
+        """
+        获取当前用户的完整目录树（只包含文件夹，不含 USB 目录）
+
+        Returns:
+            Dict: data 为 {"dirs": [{"value": 相对路径, "title": 名称, "children": [...]}]}
+        """
+        url = f"{config.get_api_base_url()}/api/getdirtree"
+        try:
+            response = self._session.get(url, headers=self.headers)
+            return {
+                "success": response.status_code == 200,
+                "status_code": response.status_code,
+                "data": response_json(response) if response.status_code == 200 else None,
+                "error": response.text if response.status_code != 200 else None
+            }
+        except requests.exceptions.RequestException as e:
+            return {
+                "success": False,
+                "status_code": 0,
+                "data": None,
+                "error": str(e)
+            }
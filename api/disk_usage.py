@@ -0,0 +1,225 @@
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class UsageNode:
+    """空间占用树中的一个文件夹"""
+
+    __slots__ = ("path", "parent", "children", "own_bytes", "own_files",
+                 "total_bytes", "total_files", "listed", "unlisted")
+
+    def __init__(self, path: str, parent: Optional["UsageNode"]):
+        self.path = path
+        self.parent = parent
+        self.children: Dict[str, "UsageNode"] = {}  # 子文件夹路径 -> 节点
+        self.own_bytes = 0  # 直接位于该文件夹中的文件大小之和
+        self.own_files = 0
+        self.total_bytes = 0  # 包含所有子文件夹
+        self.total_files = 0
+        self.listed = False  # 是否已获取过该文件夹的列表
+        self.unlisted = 1  # 子树中尚未获取列表的文件夹数（包括自身），0 表示统计完整
+
+
+def _parent(path: str) -> str:
+    return path.rpartition("/")[0]
+
+
+class DiskUsageTree:
+    """
+    递归空间占用统计
+
+    每个文件夹只保存自身文件的大小之和以及包含子文件夹的合计，
+    某个目录的列表更新时只把差值沿父目录链加上去，代价为 O(深度)，不必重新汇总整棵树。
+    尚未获取列表的文件夹按 0 计入，unlisted 记录子树中还缺少多少个文件夹。
+    由遍历线程写入、GUI 线程读取，内部加锁。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._root = UsageNode("", None)
+        self._nodes: Dict[str, UsageNode] = {"": self._root}
+        self.version = 0  # 每次变化后递增
+
+    # ---- 更新 ----
+
+    def update_directory(self, directory: str, entries) -> bool:
+        """用一个目录的完整列表（FileEntries）更新统计；返回是否有变化"""
+        own_bytes = own_files = 0
+        child_dirs = set()
+        for row in range(len(entries)):
+            if entries.is_dir(row):
+                child_dirs.add(entries.rel_path(row))
+            else:
+                own_bytes += entries.size(row)
+                own_files += 1
+        with self._lock:
+            node = self._ensure(directory)
+            changed = False
+            for path in [path for path in node.children if path not in child_dirs]:
+                self._drop(node.children[path])
+                changed = True
+            for path in child_dirs:
+                if path not in node.children:
+                    self._attach(node, path)
+                    changed = True
+            delta_bytes = own_bytes - node.own_bytes
+            delta_files = own_files - node.own_files
+            delta_unlisted = 0 if node.listed else -1
+            if delta_bytes or delta_files or delta_unlisted:
+                node.listed = True
+                node.own_bytes = own_bytes
+                node.own_files = own_files
+                self._propagate(node, delta_bytes, delta_files, delta_unlisted)
+                changed = True
+            if changed:
+                self.version += 1
+            return changed
+
+    def remove(self, path: str) -> bool:
+        """删除文件夹及其子树（删除、移走文件夹后调用）"""
+        with self._lock:
+            node = self._nodes.get(path)
+            if node is None or node is self._root:
+                return False
+            self._drop(node)
+            self.version += 1
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._root = UsageNode("", None)
+            self._nodes = {"": self._root}
+            self.version += 1
+
+    def _ensure(self, path: str) -> UsageNode:
+        """取得节点，缺少的祖先节点按未获取列表创建（调用方持有锁）"""
+        node = self._nodes.get(path)
+        if node is None:
+            node = self._attach(self._ensure(_parent(path)), path)
+        return node
+
+    def _attach(self, parent: UsageNode, path: str) -> UsageNode:
+        node = UsageNode(path, parent)
+        parent.children[path] = node
+        self._nodes[path] = node
+        self._propagate(parent, 0, 0, 1)
+        return node
+
+    def _drop(self, node: UsageNode):
+        """从父节点摘下整棵子树并从祖先的合计中减去（调用方持有锁）"""
+        parent = node.parent
+        del parent.children[node.path]
+        self._propagate(parent, -node.total_bytes, -node.total_files, -node.unlisted)
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._nodes.pop(current.path, None)
+            stack.extend(current.children.values())
+
+    @staticmethod
+    def _propagate(node: Optional[UsageNode], delta_bytes: int, delta_files: int, delta_unlisted: int):
+        """把差值加到 node 及其所有祖先上"""
+        while node is not None:
+            node.total_bytes += delta_bytes
+            node.total_files += delta_files
+            node.unlisted += delta_unlisted
+            node = node.parent
+
+    # ---- 查询 ----
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def usage(self, path: str) -> Optional[Tuple[int, int, int]]:
+        """(合计字节数, 合计文件数, 尚未获取列表的文件夹数)，未知目录返回 None"""
+        with self._lock:
+            node = self._nodes.get(path)
+            if node is None:
+                return None
+            return node.total_bytes, node.total_files, node.unlisted
+
+    def breakdown(self, path: str) -> Optional[Tuple[Tuple[int, int], List[Tuple[str, int, int, int]]]]:
+        """
+        path 的组成：((自身文件字节数, 自身文件数), [(子文件夹, 字节数, 文件数, 未获取数)])，
+        子文件夹按大小从大到小排列；未知目录返回 None
+        """
+        with self._lock:
+            node = self._nodes.get(path)
+            if node is None:
+                return None
+            children = [(child.path, child.total_bytes, child.total_files, child.unlisted)
+                        for child in node.children.values()]
+            own = (node.own_bytes, node.own_files)
+        children.sort(key=lambda item: item[1], reverse=True)
+        return own, children
+
+
+def squarify(values: Sequence[float], width: float = 1.0,
+             height: float = 1.0) -> List[Tuple[float, float, float, float]]:
+    """
+    矩形树图布局（squarified treemap）：把 width x height 的矩形按 values 的比例切分，
+    尽量让每块接近正方形。返回与 values 顺序对应的 (x, y, w, h)，值为 0 的项得到空矩形。
+    """
+    rects = [(0.0, 0.0, 0.0, 0.0)] * len(values)
+    total = float(sum(value for value in values if value > 0))
+    if total <= 0 or width <= 0 or height <= 0:
+        return rects
+    scale = width * height / total
+    order = sorted((i for i, value in enumerate(values) if value > 0), key=lambda i: -values[i])
+    x, y, w, h = 0.0, 0.0, float(width), float(height)
+
+    def worst(row_area: float, largest: float, smallest: float, side: float) -> float:
+        """一行中最差的长宽比"""
+        return max(side * side * largest / (row_area * row_area), row_area * row_area / (side * side * smallest))
+
+    def lay_out(row: list, row_area: float):
+        nonlocal x, y, w, h
+        if w >= h:
+            # 沿左边竖排
+            thickness = row_area / h
+            offset = y
+            for i, area in row:
+                rects[i] = (x, offset, thickness, area / thickness)
+                offset += area / thickness
+            x += thickness
+            w -= thickness
+        else:
+            # 沿上边横排
+            thickness = row_area / w
+            offset = x
+            for i, area in row:
+                rects[i] = (offset, y, area / thickness, thickness)
+                offset += area / thickness
+            y += thickness
+            h -= thickness
+
+    row: list = []
+    row_area = 0.0
+    for i in order:
+        area = values[i] * scale
+        side = min(w, h)
+        # 按大小降序加入，行中最大的是第一项、最小的是新加入的一项
+        if row and worst(row_area + area, row[0][1], area, side) > worst(row_area, row[0][1], row[-1][1], side):
+            lay_out(row, row_area)
+            row, row_area = [], 0.0
+        row.append((i, area))
+        row_area += area
+    if row:
+        lay_out(row, row_area)
+    return rects
+
+
+_usage: Optional[DiskUsageTree] = None
+_usage_lock = threading.Lock()
+
+
+def get_disk_usage() -> DiskUsageTree:
+    """获取全局的空间占用统计"""
+    global _usage
+    with _usage_lock:
+        if _usage is None:
+            _usage = DiskUsageTree()
+    return _usage
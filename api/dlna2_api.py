@@ -7,10 +7,12 @@ from typing import List, Dict
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from config import config
+from api.http_session import get_session, response_json
 
 
 class Dlna2API:
     def __init__(self, token: str = ""):
+        self._session = get_session()
         self.token = token
         self.headers = {
             "Authorization": f"Bearer {token}" if token else "",
@@ -20,15 +22,16 @@ class Dlna2API:
     def set_token(self, token: str):
         """设置认证 token"""
         self.token = token
+        self._session.set_token(token)
         self.headers["Authorization"] = f"Bearer {token}"
     
     def list_dlna2(self) -> List[Dict]:
         """获取DLNA2设备列表"""
         try:
             url = f"{config.API_BASE_URL}/dlna2/list"
-            response = requests.get(url, headers=self.headers)
+            response = self._session.get(url, headers=self.headers)
             response.raise_for_status()
-            data = response.json()
+            data = response_json(response)
             return data.get("dlna", [])
         except requests.exceptions.RequestException as e:
             print(f"获取DLNA2设备列表失败: {e}")
@@ -42,9 +45,9 @@ class Dlna2API:
                 "relpath": relpath,
                 "dlna": dlna_id
             }
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self._session.post(url, headers=self.headers, json=payload)
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except requests.exceptions.RequestException as e:
             print(f"在DLNA2设备上播放失败: {e}")
             return {"error": str(e)}
@@ -70,9 +73,9 @@ class Dlna2API:
                 "cmd": cmd,
                 "val": val
             }
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self._session.post(url, headers=self.headers, json=payload)
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except requests.exceptions.RequestException as e:
             print(f"控制DLNA2设备失败: {e}")
             return {"error": str(e)}
@@ -1,3 +1,4 @@
+import hashlib
 import requests
 import sys
 import os
@@ -6,9 +7,11 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from config import config
+from api.http_session import get_session, response_json
 
 class DownloadAPI:
     def __init__(self, token: str = ""):
+        self._session = get_session()
         self.token = token
         self.headers = {
             "Authorization": f"Bearer {token}" if token else ""
@@ -18,15 +21,18 @@ class DownloadAPI:
         """设置认证 token"""
         print(f"DownloadAPI.set_token: 设置token={token[:10] if token else 'None'}...")
         self.token = token
+        self._session.set_token(token)
         self.headers["Authorization"] = f"Bearer {token}"
         print(f"DownloadAPI.set_token: 认证头已设置为={self.headers.get('Authorization', 'None')}")
 
-    def download_file(self, relpath: str, save_path: str = None) -> dict:
+    def download_file(self, relpath: str, save_path: str = None, cancel_token=None, progress_callback=None) -> dict:
         """
         下载指定路径的文件（修复 URL 编码问题）
         Args:
             relpath: 文件的相对路径（如 "admin/图片/file.jpg"）
             save_path: 保存到本地的路径（可选）
+            cancel_token: 取消令牌（可选），取消后立即断开连接并删除未完成的文件
+            progress_callback: 进度回调函数（可选），接收进度百分比参数
         """
         # 使用 params 参数让 requests 正确处理 URL 编码
         url = f"{config.get_api_base_url()}/api/file/download"
@@ -37,8 +43,16 @@ class DownloadAPI:
         print(f"download_file: 请求参数={params}")
         print(f"download_file: 认证头={self.headers.get('Authorization', 'None')}")
         
+        response = None
+        file_path = None
         try:
-            response = requests.get(url, headers=self.headers, params=params, stream=True)
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            response = self._session.get(url, headers=self.headers, params=params, stream=True,
+                                         timeout=config.get_http_transfer_timeout())
+            if cancel_token is not None:
+                # 取消时直接关闭连接，打断阻塞中的读取
+                cancel_token.add_callback(response.close)
             print(f"download_file: 实际请求URL={response.url}")
             print(f"download_file: 响应状态码={response.status_code}")
             
@@ -54,26 +68,133 @@ class DownloadAPI:
                 
                 print(f"download_file: 保存文件到 {file_path}")
                 
+                total_size = int(response.headers.get('Content-Length', 0) or 0)
+                downloaded_size = 0
+                last_progress = -1
+                
                 # 保存文件
                 with open(file_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        if cancel_token is not None:
+                            cancel_token.raise_if_cancelled()
                         if chunk:
                             f.write(chunk)
+                            downloaded_size += len(chunk)
+                            if progress_callback and total_size > 0:
+                                progress = int(downloaded_size * 100 / total_size)
+                                if progress != last_progress:
+                                    last_progress = progress
+                                    progress_callback(progress)
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
                 return {
                     "success": True,
                     "filename": file_path,
                     "error": None
                 }
             else:
-                error = response.json().get("error", response.text) if response.text else "Unknown error"
+                error = response_json(response).get("error", response.text) if response.text else "Unknown error"
                 print(f"download_file: 下载失败 - {error}")
                 return {
                     "success": False,
                     "error": f"HTTP {response.status_code}: {error}"
                 }
         except Exception as e:
+            if cancel_token is not None and cancel_token.is_cancelled:
+                print(f"download_file: 已取消 - {relpath}")
+                self._remove_partial_file(file_path)
+                return {
+                    "success": False,
+                    "cancelled": True,
+                    "error": "下载已取消"
+                }
             print(f"download_file: 异常 - {e}")
+            self._remove_partial_file(file_path)
             return {
                 "success": False,
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+        finally:
+            if response is not None:
+                if cancel_token is not None:
+                    cancel_token.remove_callback(response.close)
+                response.close()
+
+    def read_range(self, relpath: str, start: int, length: int, cancel_token=None) -> dict:
+        """
+        读取文件的一段（HTTP Range），start 为负数时读取最后 -start 个字节
+
+        服务器忽略 Range 返回整个文件时：读取开头的请求只读取需要的部分后断开连接；
+        读取末尾的请求无法完成，返回 range_unsupported 为 True。
+        Returns:
+            dict: success、data（bytes）、error
+        """
+        url = f"{config.get_api_base_url()}/api/file/download"
+        byte_range = f"bytes={start}" if start < 0 else f"bytes={start}-{start + length - 1}"
+        headers = dict(self.headers, Range=byte_range)
+        response = None
+        try:
+            response = self._session.get(url, headers=headers, params={"relpath": relpath}, stream=True)
+            if cancel_token is not None:
+                cancel_token.add_callback(response.close)
+            if response.status_code == 200 and start != 0:
+                return {"success": False, "range_unsupported": True, "data": None,
+                        "error": "服务器不支持 Range 请求"}
+            if response.status_code not in (200, 206):
+                return {"success": False, "data": None, "error": f"HTTP {response.status_code}"}
+            data = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                data += chunk
+                if len(data) >= length:
+                    break
+            return {"success": True, "data": bytes(data[:length]), "error": None}
+        except requests.exceptions.RequestException as e:
+            return {"success": False, "data": None, "error": str(e)}
+        finally:
+            if response is not None:
+                if cancel_token is not None:
+                    cancel_token.remove_callback(response.close)
+                response.close()
+
+    def hash_file(self, relpath: str, cancel_token=None, algorithm: str = "sha1") -> dict:
+        """
+        流式下载文件并计算摘要，不写入磁盘
+
+        Returns:
+            dict: success、digest（十六进制）、bytes（读取的字节数）、error
+        """
+        url = f"{config.get_api_base_url()}/api/file/download"
+        digest = hashlib.new(algorithm)
+        received = 0
+        response = None
+        try:
+            response = self._session.get(url, headers=self.headers, params={"relpath": relpath}, stream=True,
+                                         timeout=config.get_http_transfer_timeout())
+            if cancel_token is not None:
+                cancel_token.add_callback(response.close)
+            if response.status_code != 200:
+                return {"success": False, "digest": None, "bytes": 0, "error": f"HTTP {response.status_code}"}
+            for chunk in response.iter_content(chunk_size=256 * 1024):
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                digest.update(chunk)
+                received += len(chunk)
+            return {"success": True, "digest": digest.hexdigest(), "bytes": received, "error": None}
+        except requests.exceptions.RequestException as e:
+            return {"success": False, "digest": None, "bytes": received, "error": str(e)}
+        finally:
+            if response is not None:
+                if cancel_token is not None:
+                    cancel_token.remove_callback(response.close)
+                response.close()
+
+    @staticmethod
+    def _remove_partial_file(file_path: str):
+        """删除下载失败或取消后残留的不完整文件"""
+        if file_path and os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+            except OSError as e:
+                print(f"download_file: 删除不完整文件失败 - {e}")
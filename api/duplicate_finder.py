@@ -0,0 +1,168 @@
+import hashlib
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.cancellation import CancellationToken
+from api.download_api import DownloadAPI
+from api.metadata_store import KIND_HASH, MetadataStore
+
+HEAD_TAIL_BYTES = 64 * 1024  # 初筛时读取文件开头和末尾各这么多字节
+
+
+class DuplicateFinder:
+    """
+    重复文件查找
+
+    1. 按文件大小分组，大小唯一的文件不可能重复，不需要读取任何内容
+    2. 同样大小的文件通过 HTTP Range 读取开头和末尾各 64 KB 计算摘要，进一步分组
+       （不超过 128 KB 的文件此时已读完整个内容）
+    3. 仍然相同的大文件才完整下载计算摘要
+
+    下载与摘要计算在线程池中并行进行（hashlib 处理大块数据时会释放 GIL）。
+    已算出的摘要按 (大小, 修改时间) 保存在本地元数据缓存中，中断后再次查找时直接使用。
+    """
+
+    def __init__(self, download_api: DownloadAPI, scope: str, store: Optional[MetadataStore] = None,
+                 workers: int = 4, min_size: int = 1):
+        self._api = download_api
+        self._scope = scope
+        self._store = store
+        self._workers = max(1, workers)
+        self._min_size = max(1, min_size)
+        self.stats = {"files": 0, "candidates": 0, "hashed": 0, "to_hash": 0, "cached": 0,
+                      "errors": 0, "bytes_read": 0, "bytes_listed": 0, "groups": 0}
+
+    def find(self, files: Iterable[Tuple[str, int, int]], token: CancellationToken,
+             on_progress: Optional[Callable[[dict], None]] = None) -> List[Tuple[int, List[str]]]:
+        """
+        files 为 (路径, 大小, 修改时间)；返回重复文件组 [(大小, [路径...])]，
+        按可释放的空间从大到小排列。取消时抛出 TaskCancelled
+        """
+        by_size: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+        for path, size, mtime in files:
+            self.stats["files"] += 1
+            self.stats["bytes_listed"] += size
+            if size >= self._min_size:
+                by_size[size].append((path, mtime))
+        groups = [(size, members) for size, members in by_size.items() if len(members) > 1]
+        self.stats["candidates"] = sum(len(members) for _, members in groups)
+        self.stats["to_hash"] = self.stats["candidates"]
+        if on_progress is not None:
+            on_progress(dict(self.stats))
+
+        pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="duplicates")
+        try:
+            # 第二步：开头和末尾的摘要
+            jobs = [(path, size, mtime) for size, members in groups for path, mtime in members]
+            groups = self._group(pool, jobs, self._partial_digest, token, on_progress)
+            # 第三步：仍然相同的大文件完整计算摘要
+            small = [group for group in groups if group[0] <= 2 * HEAD_TAIL_BYTES]
+            large = [group for group in groups if group[0] > 2 * HEAD_TAIL_BYTES]
+            jobs = [(path, size, mtime) for size, members in large for path, mtime in members]
+            self.stats["to_hash"] += len(jobs)
+            groups = small + self._group(pool, jobs, self._full_digest, token, on_progress)
+        finally:
+            pool.shutdown(wait=not token.is_cancelled, cancel_futures=True)
+
+        result = [(size, sorted(path for path, _ in members)) for size, members in groups]
+        result.sort(key=lambda group: group[0] * (len(group[1]) - 1), reverse=True)
+        self.stats["groups"] = len(result)
+        if on_progress is not None:
+            on_progress(dict(self.stats))
+        return result
+
+    def _group(self, pool: ThreadPoolExecutor, jobs: list, digest_fn: Callable, token: CancellationToken,
+               on_progress) -> List[Tuple[int, List[Tuple[str, int]]]]:
+        """对 jobs 并行计算摘要，按 (大小, 摘要) 分组，只保留多于一个文件的组"""
+        by_digest: Dict[Tuple[int, str], List[Tuple[str, int]]] = defaultdict(list)
+        futures = {}
+        for path, size, mtime in jobs:
+            cached = self._cached(path, size, mtime, digest_fn)
+            if cached is not None:
+                self.stats["cached"] += 1
+                self.stats["hashed"] += 1
+                by_digest[(size, cached)].append((path, mtime))
+            else:
+                futures[pool.submit(digest_fn, path, size, mtime, token)] = (path, size, mtime)
+        while futures:
+            token.raise_if_cancelled()
+            done, _ = wait(futures, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, size, mtime = futures.pop(future)
+                digest, bytes_read = future.result()
+                self.stats["hashed"] += 1
+                self.stats["bytes_read"] += bytes_read
+                if digest is None:
+                    self.stats["errors"] += 1
+                else:
+                    by_digest[(size, digest)].append((path, mtime))
+            if done and on_progress is not None:
+                on_progress(dict(self.stats))
+        return [(size, members) for (size, _), members in by_digest.items() if len(members) > 1]
+
+    # ---- 摘要（在线程池中执行） ----
+
+    def _partial_digest(self, path: str, size: int, mtime: int, token: CancellationToken) -> Tuple[Optional[str], int]:
+        """开头和末尾各 HEAD_TAIL_BYTES 的摘要；小文件直接读取全部内容"""
+        if size <= 2 * HEAD_TAIL_BYTES:
+            result = self._api.read_range(path, 0, size, token)
+            if not result["success"]:
+                print(f"读取文件 {path} 失败: {result['error']}")
+                return None, 0
+            digest = hashlib.sha1(result["data"]).hexdigest()
+            self._save(path, size, mtime, partial=digest, full=digest)
+            return digest, len(result["data"])
+        head = self._api.read_range(path, 0, HEAD_TAIL_BYTES, token)
+        tail = self._api.read_range(path, -HEAD_TAIL_BYTES, HEAD_TAIL_BYTES, token) if head["success"] else head
+        if tail.get("range_unsupported"):
+            # 服务器不支持读取末尾，只能完整计算
+            digest, bytes_read = self._full_digest(path, size, mtime, token)
+            if digest is None:
+                return None, bytes_read + len(head["data"])
+            self._save(path, size, mtime, partial=f"full:{digest}")
+            return f"full:{digest}", bytes_read + len(head["data"])
+        if not tail["success"]:
+            print(f"读取文件 {path} 失败: {tail['error']}")
+            return None, len(head["data"] or b"")
+        digest = hashlib.sha1(head["data"] + tail["data"]).hexdigest()
+        self._save(path, size, mtime, partial=digest)
+        return digest, len(head["data"]) + len(tail["data"])
+
+    def _full_digest(self, path: str, size: int, mtime: int, token: CancellationToken) -> Tuple[Optional[str], int]:
+        result = self._api.hash_file(path, token)
+        if not result["success"]:
+            print(f"计算文件 {path} 的摘要失败: {result['error']}")
+            return None, result["bytes"]
+        self._save(path, size, mtime, full=result["digest"])
+        return result["digest"], result["bytes"]
+
+    # ---- 摘要缓存 ----
+
+    def _cached(self, path: str, size: int, mtime: int, digest_fn: Callable) -> Optional[str]:
+        """本地缓存中文件未变化时已算出的摘要"""
+        if self._store is None:
+            return None
+        entry = self._store.get_json(self._scope, KIND_HASH, path)
+        if not entry or entry.get("size") != size or entry.get("mtime") != mtime:
+            return None
+        if digest_fn == self._full_digest:
+            return entry.get("full")
+        return entry.get("partial")
+
+    def _save(self, path: str, size: int, mtime: int, partial: Optional[str] = None, full: Optional[str] = None):
+        if self._store is None:
+            return
+        entry = self._store.get_json(self._scope, KIND_HASH, path) or {}
+        if entry.get("size") != size or entry.get("mtime") != mtime:
+            entry = {"size": size, "mtime": mtime}
+        if partial is not None:
+            entry["partial"] = partial
+        if full is not None:
+            entry["full"] = full
+        self._store.put_json(self._scope, KIND_HASH, path, entry)
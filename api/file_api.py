@@ -1,5 +1,6 @@
+import hashlib
 import requests
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List
 import sys
 import os
 
@@ -7,9 +8,16 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from config import config
+from api.http_session import get_session, response_json
+from api.file_entries import TYPE_NAMES, file_type_code, format_size, format_timestamp, transform_files
+from api.listing_stream import FilesArrayParser, ListingStreamError, iter_file_batches
+
+# 流式读取目录列表时每次读取的字节数
+STREAM_CHUNK_SIZE = 16 * 1024
 
 class FileAPI:
     def __init__(self, token: str = ""):
+        self._session = get_session()
         self.token = token
         self.headers = {
             "Authorization": f"Bearer {token}" if token else "",
@@ -19,17 +27,20 @@ class FileAPI:
     def set_token(self, token: str):
         """设置认证 token"""
         self.token = token
+        self._session.set_token(token)
         self.headers["Authorization"] = f"Bearer {token}"
     
-    def get_file_list(self, currentdir: Optional[str] = None) -> Dict:
+    def get_file_list(self, currentdir: Optional[str] = None, etag: Optional[str] = None) -> Dict:
         """
         获取文件列表
         
         Args:
             currentdir: 目标目录的相对路径，如果为空则获取根目录
+            etag: 上次响应的 ETag，提供时发送 If-None-Match 进行条件请求
             
         Returns:
-            Dict: 包含文件列表的响应数据
+            Dict: 包含文件列表的响应数据；另含 etag、content_hash，
+                  服务器返回 304 时 not_modified 为 True 且 data 为 None
         """
         url = f"{config.get_api_base_url()}/api/file/files"
         
@@ -38,13 +49,29 @@ class FileAPI:
         if currentdir:
             params["currentdir"] = currentdir
         
+        headers = self.headers
+        if etag:
+            headers = dict(self.headers, **{"If-None-Match": etag})
+        
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._session.get(url, headers=headers, params=params)
+            if response.status_code == 304:
+                return {
+                    "success": True,
+                    "status_code": 304,
+                    "data": None,
+                    "error": None,
+                    "not_modified": True,
+                    "etag": response.headers.get("ETag", etag),
+                    "content_hash": None
+                }
             return {
                 "success": response.status_code == 200,
                 "status_code": response.status_code,
-                "data": response.json() if response.status_code == 200 else None,
-                "error": response.text if response.status_code != 200 else None
+                "data": response_json(response, file_list=True) if response.status_code == 200 else None,
+                "error": response.text if response.status_code != 200 else None,
+                "etag": response.headers.get("ETag"),
+                "content_hash": hashlib.sha1(response.content).hexdigest() if response.status_code == 200 else None
             }
         except requests.exceptions.RequestException as e:
             return {
@@ -54,6 +81,90 @@ class FileAPI:
                 "error": str(e)
             }
     
+    def get_file_list_streaming(self, currentdir: Optional[str] = None,
+                                on_batch: Optional[Callable[[List[Dict]], None]] = None,
+                                batch_size: int = 500, cancel_token=None) -> Dict:
+        """
+        流式获取文件列表：边下载边解析 files 数组，逐批交给 on_batch
+        
+        第一批在收到前几 KB 后即可交付；解析缓冲区只保留尚未解析完的
+        条目，内存占用不随响应大小增长。
+        
+        Args:
+            currentdir: 目标目录的相对路径，如果为空则获取根目录
+            on_batch: 批回调函数，接收一批原始文件条目（在调用线程中执行）
+            batch_size: 每批条目数
+            cancel_token: 取消令牌（可选），取消后立即断开连接
+            
+        Returns:
+            Dict: 与 get_file_list 相同的结构，data 为 files 以外的顶层字段，
+                  另含 count（条目总数）和 streamed=True
+        """
+        url = f"{config.get_api_base_url()}/api/file/files"
+        
+        params = {}
+        if currentdir:
+            params["currentdir"] = currentdir
+        
+        response = None
+        try:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            response = self._session.get(url, headers=self.headers, params=params, stream=True)
+            if cancel_token is not None:
+                # 取消时直接关闭连接，打断阻塞中的读取
+                cancel_token.add_callback(response.close)
+            if response.status_code != 200:
+                return {
+                    "success": False,
+                    "status_code": response.status_code,
+                    "data": None,
+                    "error": response.text
+                }
+            
+            digest = hashlib.sha1()
+            
+            def chunks():
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    if cancel_token is not None:
+                        cancel_token.raise_if_cancelled()
+                    digest.update(chunk)
+                    yield chunk
+            
+            parser = FilesArrayParser()
+            for batch in iter_file_batches(chunks(), batch_size, parser):
+                if on_batch is not None:
+                    on_batch(batch)
+            return {
+                "success": True,
+                "status_code": response.status_code,
+                "data": parser.extra,
+                "error": None,
+                "etag": response.headers.get("ETag"),
+                "content_hash": digest.hexdigest(),
+                "count": parser.count,
+                "streamed": True
+            }
+        except ListingStreamError as e:
+            return {
+                "success": False,
+                "status_code": response.status_code if response is not None else 0,
+                "data": None,
+                "error": str(e)
+            }
+        except requests.exceptions.RequestException as e:
+            return {
+                "success": False,
+                "status_code": 0,
+                "data": None,
+                "error": str(e)
+            }
+        finally:
+            if response is not None:
+                if cancel_token is not None:
+                    cancel_token.remove_callback(response.close)
+                response.close()
+    
     def create_directory(self, root_dir: str = "", cur_dir: str = "", name: str = "") -> Dict:
         """
         创建文件夹
@@ -75,12 +186,12 @@ class FileAPI:
         }
         
         try:
-            response = requests.post(url, headers=self.headers, json=data)
+            response = self._session.post(url, headers=self.headers, json=data)
             
             return {
                 "success": response.status_code == 200,
                 "status_code": response.status_code,
-                "data": response.json() if response.status_code == 200 else None,
+                "data": response_json(response) if response.status_code == 200 else None,
                 "error": response.text if response.status_code != 200 else None
             }
             
@@ -109,16 +220,7 @@ class FileAPI:
         Returns:
             str: 格式化后的大小字符串
         """
-        if size_bytes == 0:
-            return "0 B"
-        
-        size_names = ["B", "KB", "MB", "GB", "TB"]
-        i = 0
-        while size_bytes >= 1024 and i < len(size_names) - 1:
-            size_bytes /= 1024.0
-            i += 1
-        
-        return f"{size_bytes:.1f} {size_names[i]}"
+        return format_size(size_bytes)
     
     def format_date(self, date_string: str) -> str:
         """
@@ -130,12 +232,7 @@ class FileAPI:
         Returns:
             str: 格式化后的日期字符串
         """
-        try:
-            from datetime import datetime
-            dt = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
-            return dt.strftime("%Y-%m-%d %H:%M")
-        except:
-            return date_string
+        return format_timestamp(date_string)
     
     def transform_file_data(self, file_data: Dict) -> Dict:
         """
@@ -160,6 +257,18 @@ class FileAPI:
             "type": self.get_file_type(file_data.get("Filename", ""), file_data.get("IsDir", False))
         }
     
+    def transform_files(self, files_data: List[Dict]) -> List[Dict]:
+        """
+        批量转换文件数据格式，结果与逐条调用 transform_file_data 相同
+        
+        Args:
+            files_data: /api/file/files 返回的 files 数组
+            
+        Returns:
+            List[Dict]: 转换后的文件数据列表
+        """
+        return transform_files(files_data)
+    
     def get_file_type(self, filename: str, is_dir: bool) -> str:
         """
         根据文件名和目录状态获取文件类型
@@ -171,35 +280,7 @@ class FileAPI:
         Returns:
             str: 文件类型
         """
-        if is_dir:
-            return "文件夹"
-        
-        # 根据文件扩展名判断类型
-        ext = filename.lower().split('.')[-1] if '.' in filename else ""
-        
-        type_mapping = {
-            # 文档类型
-            "doc": "文档", "docx": "文档", "pdf": "文档", "txt": "文档",
-            "xls": "文档", "xlsx": "文档", "ppt": "文档", "pptx": "文档",
-            
-            # 图片类型
-            "jpg": "图片", "jpeg": "图片", "png": "图片", "gif": "图片",
-            "bmp": "图片", "svg": "图片", "webp": "图片",
-            
-            # 视频类型
-            "mp4": "视频", "avi": "视频", "mov": "视频", "wmv": "视频",
-            "flv": "视频", "mkv": "视频", "webm": "视频",
-            
-            # 音频类型
-            "mp3": "音频", "wav": "音频", "flac": "音频", "aac": "音频",
-            "ogg": "音频", "wma": "音频",
-            
-            # 压缩包类型
-            "zip": "压缩包", "rar": "压缩包", "7z": "压缩包", "tar": "压缩包",
-            "gz": "压缩包"
-        }
-        
-        return type_mapping.get(ext, "其他")
+        return TYPE_NAMES[file_type_code(filename, is_dir)]
     
     def get_parent_directory(self, current_directory: str) -> str:
         """
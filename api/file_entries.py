@@ -0,0 +1,454 @@
+import json
+import struct
+import time
+from array import array
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 文件类型编码：条目中只保存一个字节的编码，显示时再查表
+TYPE_FOLDER, TYPE_DOCUMENT, TYPE_IMAGE, TYPE_VIDEO, TYPE_AUDIO, TYPE_ARCHIVE, TYPE_OTHER = range(7)
+TYPE_NAMES = ("文件夹", "文档", "图片", "视频", "音频", "压缩包", "其他")
+
+EXTENSION_TYPES = {
+    # 文档类型
+    "doc": TYPE_DOCUMENT, "docx": TYPE_DOCUMENT, "pdf": TYPE_DOCUMENT, "txt": TYPE_DOCUMENT,
+    "xls": TYPE_DOCUMENT, "xlsx": TYPE_DOCUMENT, "ppt": TYPE_DOCUMENT, "pptx": TYPE_DOCUMENT,
+
+    # 图片类型
+    "jpg": TYPE_IMAGE, "jpeg": TYPE_IMAGE, "png": TYPE_IMAGE, "gif": TYPE_IMAGE,
+    "bmp": TYPE_IMAGE, "svg": TYPE_IMAGE, "webp": TYPE_IMAGE,
+
+    # 视频类型
+    "mp4": TYPE_VIDEO, "avi": TYPE_VIDEO, "mov": TYPE_VIDEO, "wmv": TYPE_VIDEO,
+    "flv": TYPE_VIDEO, "mkv": TYPE_VIDEO, "webm": TYPE_VIDEO,
+
+    # 音频类型
+    "mp3": TYPE_AUDIO, "wav": TYPE_AUDIO, "flac": TYPE_AUDIO, "aac": TYPE_AUDIO,
+    "ogg": TYPE_AUDIO, "wma": TYPE_AUDIO,
+
+    # 压缩包类型
+    "zip": TYPE_ARCHIVE, "rar": TYPE_ARCHIVE, "7z": TYPE_ARCHIVE, "tar": TYPE_ARCHIVE,
+    "gz": TYPE_ARCHIVE
+}
+
+_FLAG_DIR = 0x01
+_FLAG_PUBLIC = 0x02
+
+# 无法解析的修改时间
+NO_MTIME = -(2 ** 62)
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+_SIZE_DIVISORS = tuple(1024.0 ** i for i in range(len(_SIZE_UNITS)))
+_MAX_SIZE_UNIT = len(_SIZE_UNITS) - 1
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MILLIS_PER_DAY = 86400 * 1000
+
+# 时间解析缓存：同一目录中的大量文件往往落在少数几天内
+_TIMESTAMP_CACHE_LIMIT = 65536
+_day_cache: Dict[str, int] = {}
+_timestamp_cache: Dict[str, Tuple[int, int]] = {}
+
+
+def file_type_code(filename: str, is_dir: bool) -> int:
+    """根据文件名和目录状态获取文件类型编码"""
+    if is_dir:
+        return TYPE_FOLDER
+    _, dot, ext = filename.rpartition(".")
+    if not dot:
+        return TYPE_OTHER
+    return EXTENSION_TYPES.get(ext.lower(), TYPE_OTHER)
+
+
+def size_unit(size_bytes: int) -> int:
+    """大小所属的单位下标：按 1024 的幂分桶，用 bit_length 代替逐级除法"""
+    if size_bytes < 1024:
+        return 0
+    return min((int(size_bytes).bit_length() - 1) // 10, _MAX_SIZE_UNIT)
+
+
+def format_size(size_bytes: int) -> str:
+    """格式化文件大小显示"""
+    if size_bytes == 0:
+        return "0 B"
+    unit = size_unit(size_bytes)
+    return f"{size_bytes / _SIZE_DIVISORS[unit]:.1f} {_SIZE_UNITS[unit]}"
+
+
+def format_sizes(sizes: Iterable[int]) -> List[str]:
+    """批量格式化文件大小，先统一分桶再格式化"""
+    units = _SIZE_UNITS
+    divisors = _SIZE_DIVISORS
+    max_unit = _MAX_SIZE_UNIT
+    result = []
+    append = result.append
+    for size in sizes:
+        if size == 0:
+            append("0 B")
+            continue
+        unit = min((int(size).bit_length() - 1) // 10, max_unit) if size >= 1024 else 0
+        append(f"{size / divisors[unit]:.1f} {units[unit]}")
+    return result
+
+
+def _day_millis(day: str) -> int:
+    """YYYY-MM-DD 对应的 UTC 毫秒数（带缓存）"""
+    millis = _day_cache.get(day)
+    if millis is None:
+        millis = (date.fromisoformat(day).toordinal() - _EPOCH_ORDINAL) * _MILLIS_PER_DAY
+        if len(_day_cache) < _TIMESTAMP_CACHE_LIMIT:
+            _day_cache[day] = millis
+    return millis
+
+
+def _parse_utc_fast(date_string: str) -> Optional[int]:
+    """
+    快速解析服务器常用的 YYYY-MM-DDTHH:MM:SS[.fff]Z 格式，
+    日期部分查缓存，时分秒直接按位置切片；其他格式返回 None
+    """
+    if (len(date_string) < 20 or date_string[-1] != "Z" or date_string[10] != "T"
+            or date_string[13] != ":" or date_string[16] != ":"):
+        return None
+    hour, minute, second = date_string[11:13], date_string[14:16], date_string[17:19]
+    if not (hour.isdigit() and minute.isdigit() and second.isdigit()):
+        return None
+    fraction = date_string[19:-1]
+    if not fraction:
+        millis = 0
+    elif fraction[0] == "." and 2 <= len(fraction) <= 4 and fraction[1:].isdigit():
+        millis = int(fraction[1:].ljust(3, "0"))
+    else:
+        return None
+    hour, minute, second = int(hour), int(minute), int(second)
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    try:
+        day = _day_millis(date_string[:10])
+    except ValueError:
+        return None
+    return day + ((hour * 60 + minute) * 60 + second) * 1000 + millis
+
+
+def parse_timestamp(date_string: str) -> Tuple[int, int]:
+    """
+    解析 ISO 格式的时间字符串
+
+    Returns:
+        (UTC 毫秒数, 时区偏移分钟数)；无法解析时返回 (NO_MTIME, 0)
+    """
+    if type(date_string) is str:
+        millis = _parse_utc_fast(date_string)
+        if millis is not None:
+            return millis, 0
+    cached = _timestamp_cache.get(date_string) if type(date_string) is str else None
+    if cached is not None:
+        return cached
+    parsed = _parse_iso(date_string)
+    if type(date_string) is str and len(_timestamp_cache) < _TIMESTAMP_CACHE_LIMIT:
+        _timestamp_cache[date_string] = parsed
+    return parsed
+
+
+def _parse_iso(date_string: str) -> Tuple[int, int]:
+    try:
+        dt = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+    except (AttributeError, TypeError, ValueError):
+        return NO_MTIME, 0
+    offset = dt.utcoffset()
+    if offset is None:
+        # 没有时区信息时按 UTC 处理
+        return round(dt.replace(tzinfo=timezone.utc).timestamp() * 1000), 0
+    return round(dt.timestamp() * 1000), int(offset.total_seconds() // 60)
+
+
+def format_mtime(mtime_ms: int, offset_minutes: int = 0) -> str:
+    """按服务器给出的时区格式化修改时间，与原字符串的墙上时间一致"""
+    return time.strftime("%Y-%m-%d %H:%M", time.gmtime(mtime_ms // 1000 + offset_minutes * 60))
+
+
+def format_timestamp(date_string: str) -> str:
+    """格式化 ISO 时间字符串，无法解析时原样返回"""
+    mtime, offset = parse_timestamp(date_string)
+    if mtime == NO_MTIME:
+        return date_string
+    if len(date_string) >= 16 and date_string[10] == "T" and date_string[13] == ":":
+        # 墙上时间就是字符串本身的日期和时分
+        return f"{date_string[:10]} {date_string[11:16]}"
+    return format_mtime(mtime, offset)
+
+
+def transform_files(files_data: Iterable[Optional[Dict]]) -> List[Dict]:
+    """
+    批量转换 /api/file/files 返回的条目，结果与逐条调用
+    FileAPI.transform_file_data 相同；空条目会被跳过
+    """
+    files_data = [f for f in files_data if f]
+    sizes = [f.get("Size", 0) for f in files_data]
+    size_strings = format_sizes(sizes)
+    type_names = TYPE_NAMES
+    result = []
+    append = result.append
+    for file_data, size, size_string in zip(files_data, sizes, size_strings):
+        name = file_data.get("Filename", "")
+        is_dir = file_data.get("IsDir", False)
+        raw_date = file_data.get("UpdatedAt", "")
+        append({
+            "name": name,
+            "relPath": file_data.get("RelPath", ""),
+            "isDir": is_dir,
+            "isPublic": file_data.get("IsPublic", False),
+            "size": size_string,
+            "sizeBytes": size,
+            "updatedAt": format_timestamp(raw_date),
+            "rawUpdatedAt": raw_date,
+            "selected": False,  # 前端选择状态
+            "type": type_names[file_type_code(name, is_dir)]
+        })
+    return result
+
+
+class FileEntries:
+    """
+    紧凑的目录条目存储
+
+    每个条目不再是一个 11 个键的字典，而是分散在几组并行数组中：
+    文件名与相对路径保存为字符串（相对路径可由目录和文件名推出时不单独保存），
+    目录/公开标志、类型编码、字节数和修改时间（毫秒）保存在 array 中。
+    大小和日期的显示字符串只在读取某一行时才格式化。
+    """
+
+    __slots__ = ("directory", "_names", "_rel_paths", "_flags", "_types",
+                 "_sizes", "_mtimes", "_offsets", "_raw_dates")
+
+    def __init__(self, directory: str = ""):
+        self.directory = directory
+        self._names: List[str] = []
+        self._rel_paths: List[Optional[str]] = []  # None 表示可由 directory/name 推出
+        self._flags = array("B")
+        self._types = array("B")
+        self._sizes = array("q")
+        self._mtimes = array("q")
+        self._offsets = array("h")
+        self._raw_dates: Dict[str, str] = {}  # 无法解析的时间字符串，按相对路径保存
+
+    @classmethod
+    def from_raw(cls, files_data: Iterable[Optional[Dict]], directory: str = "") -> "FileEntries":
+        """
+        由 /api/file/files 返回的原始条目批量构建
+
+        整个 files 数组在一次循环中处理：扩展名查预先建好的表，
+        时间按日期缓存解析，各列直接追加到数组，不构造中间字典。
+        """
+        entries = cls(directory)
+        prefix = f"{directory}/" if directory else ""
+        names, rel_paths = entries._names, entries._rel_paths
+        flags, types, sizes = entries._flags, entries._types, entries._sizes
+        mtimes, offsets, raw_dates = entries._mtimes, entries._offsets, entries._raw_dates
+        extension_types = EXTENSION_TYPES
+        parse_fast = _parse_utc_fast
+
+        for file_data in files_data:
+            if not file_data:  # 确保file_data不为None
+                continue
+            get = file_data.get
+            name = get("Filename", "") or ""
+            rel_path = get("RelPath", "") or ""
+            is_dir = bool(get("IsDir", False))
+            raw_date = get("UpdatedAt", "") or ""
+
+            mtime = parse_fast(raw_date) if type(raw_date) is str else None
+            if mtime is None:
+                mtime, offset = parse_timestamp(raw_date)
+                if mtime == NO_MTIME and raw_date:
+                    raw_dates[rel_path] = raw_date
+            else:
+                offset = 0
+
+            if is_dir:
+                type_code = TYPE_FOLDER
+            else:
+                _, dot, ext = name.rpartition(".")
+                type_code = extension_types.get(ext.lower(), TYPE_OTHER) if dot else TYPE_OTHER
+
+            names.append(name)
+            rel_paths.append(None if rel_path == prefix + name else rel_path)
+            flags.append((_FLAG_DIR if is_dir else 0) | (_FLAG_PUBLIC if get("IsPublic", False) else 0))
+            types.append(type_code)
+            sizes.append(int(get("Size", 0) or 0))
+            mtimes.append(mtime)
+            offsets.append(offset)
+        return entries
+
+    # ---- 序列化 ----
+
+    # 头部（小端序）：魔数、条目数、字符串段长度；之后依次是字符串段 (JSON) 与各数值列（array 的本机字节序）
+    _HEADER = struct.Struct("<4sII")
+    _MAGIC = b"FEN1"
+
+    def to_bytes(self) -> bytes:
+        """序列化为紧凑的二进制格式，用于写入本地元数据缓存"""
+        text = json.dumps(
+            [self.directory, self._names, self._rel_paths, self._raw_dates],
+            ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        return b"".join((
+            self._HEADER.pack(self._MAGIC, len(self._names), len(text)), text,
+            self._flags.tobytes(), self._types.tobytes(), self._sizes.tobytes(),
+            self._mtimes.tobytes(), self._offsets.tobytes()
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "FileEntries":
+        """由 to_bytes() 的结果恢复；数据不完整或格式不符时抛出 ValueError"""
+        header = cls._HEADER
+        if len(data) < header.size:
+            raise ValueError("FileEntries 数据不完整")
+        magic, count, text_len = header.unpack_from(data)
+        if magic != cls._MAGIC:
+            raise ValueError("FileEntries 数据格式不符")
+        pos = header.size + text_len
+        directory, names, rel_paths, raw_dates = json.loads(data[header.size:pos].decode("utf-8"))
+        entries = cls(directory)
+        entries._names = names
+        entries._rel_paths = rel_paths
+        entries._raw_dates = raw_dates
+        for column in (entries._flags, entries._types, entries._sizes, entries._mtimes, entries._offsets):
+            end = pos + count * column.itemsize
+            column.frombytes(data[pos:end])
+            pos = end
+        if pos != len(data) or len(names) != count or len(rel_paths) != count:
+            raise ValueError("FileEntries 数据不完整")
+        return entries
+
+    def _derived_path(self, name: str) -> str:
+        return f"{self.directory}/{name}" if self.directory else name
+
+    # ---- 单行访问 ----
+
+    def __len__(self):
+        return len(self._names)
+
+    def name(self, row: int) -> str:
+        return self._names[row]
+
+    def rel_path(self, row: int) -> str:
+        rel_path = self._rel_paths[row]
+        return rel_path if rel_path is not None else self._derived_path(self._names[row])
+
+    def is_dir(self, row: int) -> bool:
+        return bool(self._flags[row] & _FLAG_DIR)
+
+    def is_public(self, row: int) -> bool:
+        return bool(self._flags[row] & _FLAG_PUBLIC)
+
+    def type_code(self, row: int) -> int:
+        return self._types[row]
+
+    def type_name(self, row: int) -> str:
+        return TYPE_NAMES[self._types[row]]
+
+    def size(self, row: int) -> int:
+        return self._sizes[row]
+
+    def mtime(self, row: int) -> int:
+        """修改时间（UTC 毫秒数），无法解析时为 NO_MTIME"""
+        return self._mtimes[row]
+
+    def display_size(self, row: int) -> str:
+        return format_size(self._sizes[row])
+
+    def display_date(self, row: int) -> str:
+        mtime = self._mtimes[row]
+        if mtime == NO_MTIME:
+            return self._raw_dates.get(self.rel_path(row), "")
+        return format_mtime(mtime, self._offsets[row])
+
+    def raw_date(self, row: int) -> str:
+        mtime = self._mtimes[row]
+        if mtime == NO_MTIME:
+            return self._raw_dates.get(self.rel_path(row), "")
+        offset = self._offsets[row]
+        seconds, millis = divmod(mtime, 1000)
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds + offset * 60))
+        if millis:
+            stamp += f".{millis:03d}"
+        if offset == 0:
+            return stamp + "Z"
+        sign = "+" if offset > 0 else "-"
+        return f"{stamp}{sign}{abs(offset) // 60:02d}:{abs(offset) % 60:02d}"
+
+    def to_dict(self, row: int) -> Dict:
+        """转换为 FileAPI.transform_file_data 的字典格式"""
+        return {
+            "name": self.name(row),
+            "relPath": self.rel_path(row),
+            "isDir": self.is_dir(row),
+            "isPublic": self.is_public(row),
+            "size": self.display_size(row),
+            "sizeBytes": self.size(row),
+            "updatedAt": self.display_date(row),
+            "rawUpdatedAt": self.raw_date(row),
+            "selected": False,  # 前端选择状态
+            "type": self.type_name(row)
+        }
+
+    def row_key(self, row: int) -> tuple:
+        """用于比较两行内容是否相同"""
+        return (self.rel_path(row), self._names[row], self._flags[row],
+                self._sizes[row], self._mtimes[row], self._offsets[row])
+
+    # ---- 修改 ----
+
+    def copy(self) -> "FileEntries":
+        other = FileEntries(self.directory)
+        other._names = list(self._names)
+        other._rel_paths = list(self._rel_paths)
+        other._flags = array("B", self._flags)
+        other._types = array("B", self._types)
+        other._sizes = array("q", self._sizes)
+        other._mtimes = array("q", self._mtimes)
+        other._offsets = array("h", self._offsets)
+        other._raw_dates = dict(self._raw_dates)
+        return other
+
+    def extend(self, other: "FileEntries"):
+        """在末尾追加 other 的全部条目"""
+        if other.directory == self.directory:
+            self._names.extend(other._names)
+            self._rel_paths.extend(other._rel_paths)
+        else:
+            for row in range(len(other)):
+                name = other._names[row]
+                rel_path = other.rel_path(row)
+                self._names.append(name)
+                self._rel_paths.append(None if rel_path == self._derived_path(name) else rel_path)
+        self._flags.extend(other._flags)
+        self._types.extend(other._types)
+        self._sizes.extend(other._sizes)
+        self._mtimes.extend(other._mtimes)
+        self._offsets.extend(other._offsets)
+        self._raw_dates.update(other._raw_dates)
+
+    def delete_rows(self, first: int, last: int):
+        """删除 [first, last] 范围内的行"""
+        for column in (self._names, self._rel_paths, self._flags, self._types,
+                       self._sizes, self._mtimes, self._offsets):
+            del column[first:last + 1]
+
+    def insert_row(self, row: int, source: "FileEntries", source_row: int):
+        """把 source 的第 source_row 行插入到 row 位置"""
+        rel_path = source.rel_path(source_row)
+        name = source._names[source_row]
+        self._names.insert(row, name)
+        self._rel_paths.insert(row, None if rel_path == self._derived_path(name) else rel_path)
+        self._flags.insert(row, source._flags[source_row])
+        self._types.insert(row, source._types[source_row])
+        self._sizes.insert(row, source._sizes[source_row])
+        self._mtimes.insert(row, source._mtimes[source_row])
+        self._offsets.insert(row, source._offsets[source_row])
+        if rel_path in source._raw_dates:
+            self._raw_dates[rel_path] = source._raw_dates[rel_path]
+
+    def replace_row(self, row: int, source: "FileEntries", source_row: int):
+        self.delete_rows(row, row)
+        self.insert_row(row, source, source_row)
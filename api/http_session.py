@@ -0,0 +1,108 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Optional
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config import config
+from api.single_flight import SingleFlight
+from api import json_codec
+
+
+class HttpSession(requests.Session):
+    """
+    所有 API 类共享的 HTTP 会话
+
+    - 连接池复用 TCP 连接（keep-alive），每个主机的连接数由 config 限制
+    - 统一保存认证头，任意 API 类设置 token 后全部生效
+    - 未显式传入 timeout 的请求使用 config 中的默认超时
+    - 非流式 GET 请求按 (方法, URL, 参数, 请求头) 合并，相同请求进行中时
+      后来的调用者直接共享同一个响应
+    """
+
+    def __init__(self):
+        super().__init__()
+        pool_size = config.get_http_pool_size()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        if not config.get_http_keep_alive():
+            self.headers["Connection"] = "close"
+        self._token = ""
+        self._single_flight = SingleFlight()
+
+    def set_token(self, token: str):
+        """设置共享的认证 token"""
+        self._token = token
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        else:
+            self.headers.pop("Authorization", None)
+
+    def get_token(self) -> str:
+        return self._token
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = config.get_http_timeout()
+        if method.upper() == "GET" and not kwargs.get("stream"):
+            key = self._flight_key(url, kwargs)
+            return self._single_flight.do(
+                key, lambda: requests.Session.request(self, method, url, **kwargs)
+            )
+        return super().request(method, url, **kwargs)
+
+    def _flight_key(self, url: str, kwargs: dict) -> tuple:
+        params = kwargs.get("params") or {}
+        if isinstance(params, dict):
+            params = params.items()
+        headers = dict(self.headers)
+        headers.update(kwargs.get("headers") or {})
+        return (
+            "GET",
+            url,
+            tuple(sorted((str(k), str(v)) for k, v in params)),
+            tuple(sorted((str(k), str(v)) for k, v in headers.items()))
+        )
+
+    def coalescing_stats(self) -> dict:
+        """GET 请求合并计数"""
+        return self._single_flight.stats()
+
+
+_session: Optional[HttpSession] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> HttpSession:
+    """获取全局共享的 HTTP 会话（线程安全的懒加载）"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = HttpSession()
+    return _session
+
+
+def set_token(token: str):
+    """设置共享会话的认证 token"""
+    get_session().set_token(token)
+
+
+def response_json(response: requests.Response, file_list: bool = False):
+    """
+    使用 json_codec 选定的后端解码响应，替代 response.json()
+
+    file_list 为 True 时按 {"files": [...]} 解码（msgspec 后端下为 FileRecord）。
+    解码失败时与 response.json() 一样抛出 requests 的 JSONDecodeError。
+    """
+    try:
+        if file_list:
+            return json_codec.loads_file_list(response.content)
+        return json_codec.loads(response.content)
+    except ValueError as e:
+        raise requests.exceptions.JSONDecodeError(str(e), response.text, 0) from e
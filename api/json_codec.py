@@ -0,0 +1,129 @@
+import json
+from typing import Any, Dict, List, Optional, Union
+import sys
+import os
+
+try:
+    import msgspec
+except ImportError:  # 可选依赖
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config import config
+
+# 按速度从快到慢排列
+BACKENDS = ("msgspec", "orjson", "json")
+
+
+def available_backends() -> List[str]:
+    """当前环境中可用的解码后端"""
+    available = {"msgspec": msgspec is not None, "orjson": orjson is not None, "json": True}
+    return [name for name in BACKENDS if available[name]]
+
+
+def _select_backend(name: str) -> str:
+    available = available_backends()
+    if name in ("", "auto"):
+        return available[0]
+    if name not in available:
+        print(f"JSON 解码后端 {name} 不可用，改用 {available[0]}")
+        return available[0]
+    return name
+
+
+if msgspec is not None:
+    class FileRecord(msgspec.Struct):
+        """
+        文件条目，/api/file/files 与 /api/file/typefiles 共用
+
+        直接由响应字节解码，不经过中间字典；提供与 dict 相同的 get()，
+        已有的 file_data.get("Filename", "") 等转换代码无需区分两种形式。
+        """
+
+        Filename: Optional[str] = ""
+        RelPath: Optional[str] = ""
+        IsDir: Optional[bool] = False
+        IsPublic: Optional[bool] = False
+        Size: Union[int, float, None] = 0
+        UpdatedAt: Optional[str] = ""
+        CreatedAt: Optional[str] = ""
+        ID: Union[int, str, None] = ""
+        Owner: Optional[str] = ""
+        Type: Optional[str] = ""
+
+        def get(self, key: str, default: Any = None) -> Any:
+            return getattr(self, key, default)
+
+    class FileListPayload(msgspec.Struct):
+        """文件列表响应 {"files": [...]}"""
+
+        files: Optional[List[Optional[FileRecord]]] = None
+
+
+class JsonCodec:
+    """
+    JSON 解码器
+
+    已安装 msgspec 时文件列表类响应直接解码为 FileRecord，
+    其他响应由 msgspec / orjson 解码为普通对象；都没有安装时使用标准库。
+    解码失败统一抛出 ValueError。
+    """
+
+    def __init__(self, backend: str = "auto"):
+        self.backend = _select_backend(backend)
+        if self.backend == "msgspec":
+            self._decoder = msgspec.json.Decoder()
+            self._file_list_decoder = msgspec.json.Decoder(FileListPayload)
+        else:
+            self._decoder = None
+            self._file_list_decoder = None
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """解码任意 JSON 文档"""
+        if self.backend == "msgspec":
+            return self._decoder.decode(data)
+        if self.backend == "orjson":
+            return orjson.loads(data)
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode("utf-8")
+        return json.loads(data)
+
+    def loads_file_list(self, data: Union[bytes, str]) -> Dict:
+        """
+        解码 {"files": [...]} 形式的文件列表响应
+
+        msgspec 后端下条目为 FileRecord；字段类型与预期不符时退回普通解码。
+        """
+        if self._file_list_decoder is not None:
+            try:
+                payload = self._file_list_decoder.decode(data)
+            except msgspec.ValidationError:
+                return self.loads(data)
+            return {"files": payload.files if payload.files is not None else []}
+        return self.loads(data)
+
+
+_codec: Optional[JsonCodec] = None
+
+
+def get_codec() -> JsonCodec:
+    """获取全局的 JSON 解码器（后端由 JSON_BACKEND 配置决定）"""
+    global _codec
+    if _codec is None:
+        _codec = JsonCodec(config.get_json_backend())
+    return _codec
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return get_codec().loads(data)
+
+
+def loads_file_list(data: Union[bytes, str]) -> Dict:
+    return get_codec().loads_file_list(data)
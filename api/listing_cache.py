@@ -0,0 +1,67 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class ListingCacheEntry:
+    """单个目录的缓存内容"""
+
+    __slots__ = ("files", "etag", "content_hash", "fetched_at")
+
+    def __init__(self, files: Any, etag: Optional[str], content_hash: Optional[str], fresh: bool = True):
+        self.files = files
+        self.etag = etag
+        self.content_hash = content_hash
+        # 从本地元数据缓存恢复的内容视为已过期，使用前总要重新验证
+        self.fetched_at = time.monotonic() if fresh else float("-inf")
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def touch(self):
+        """服务器确认内容未变化，重新计时"""
+        self.fetched_at = time.monotonic()
+
+
+class ListingCache:
+    """
+    目录列表缓存（TTL + LRU）
+
+    超过 ttl 的条目仍然可以立即显示，但需要在后台重新验证；
+    条目数超过 max_entries 时淘汰最久未访问的目录。
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 64):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ListingCacheEntry]" = OrderedDict()
+
+    def get(self, directory: str) -> Optional[ListingCacheEntry]:
+        entry = self._entries.get(directory)
+        if entry is not None:
+            self._entries.move_to_end(directory)
+        return entry
+
+    def put(self, directory: str, files: Any, etag: Optional[str] = None,
+            content_hash: Optional[str] = None, fresh: bool = True) -> ListingCacheEntry:
+        entry = ListingCacheEntry(files, etag, content_hash, fresh)
+        self._entries[directory] = entry
+        self._entries.move_to_end(directory)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def is_fresh(self, entry: ListingCacheEntry) -> bool:
+        return entry.age() < self.ttl
+
+    def invalidate(self, directory: str):
+        self._entries.pop(directory, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, directory: str):
+        return directory in self._entries
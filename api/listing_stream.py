@@ -0,0 +1,180 @@
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_INCOMPLETE = object()
+
+# 解析状态
+(_START, _KEY, _COLON, _VALUE, _AFTER_VALUE,
+ _ITEMS_OPEN, _ITEM, _AFTER_ITEM, _DONE) = range(9)
+
+
+class ListingStreamError(ValueError):
+    """响应不是完整的 {"files": [...]} JSON 对象"""
+
+
+class FilesArrayParser:
+    """
+    目录列表响应的增量 JSON 解析器
+
+    按收到的顺序 feed() 响应字节，每次返回已经完整解析出的 files 条目；
+    缓冲区只保留尚未解析完的一小段，内存占用与响应总大小无关。
+    顶层对象中的其他字段保存在 extra 中。
+    """
+
+    def __init__(self, array_key: str = "files"):
+        self.array_key = array_key
+        self.extra: Dict[str, Any] = {}
+        self.count = 0  # 已解析的条目数
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = _START
+        self._key = None
+
+    @property
+    def is_done(self) -> bool:
+        return self._state == _DONE
+
+    def feed(self, data: bytes) -> List[Any]:
+        """输入一段响应字节，返回新解析出的条目"""
+        self._buffer += self._text_decoder.decode(data)
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """响应结束，返回剩余条目；响应不完整时抛出 ListingStreamError"""
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        items = self._parse(final=True)
+        if self._state != _DONE:
+            raise ListingStreamError("目录列表响应不完整")
+        return items
+
+    def _decode_value(self, buffer: str, pos: int, final: bool):
+        try:
+            value, end = self._json_decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise ListingStreamError(f"目录列表响应格式错误: {e}") from e
+            return _INCOMPLETE, pos
+        # 恰好结束在缓冲区末尾的值（例如数字）可能还没收完
+        if end >= len(buffer) and not final:
+            return _INCOMPLETE, pos
+        return value, end
+
+    def _parse(self, final: bool) -> List[Any]:
+        items = []
+        buffer = self._buffer
+        pos = 0
+        length = len(buffer)
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos >= length:
+                break
+            state = self._state
+            char = buffer[pos]
+
+            if state == _START:
+                if char != "{":
+                    raise ListingStreamError("目录列表响应不是 JSON 对象")
+                pos += 1
+                self._state = _KEY
+            elif state == _KEY:
+                if char == "}":
+                    pos += 1
+                    self._state = _DONE
+                    continue
+                key, end = self._decode_value(buffer, pos, final)
+                if key is _INCOMPLETE:
+                    break
+                if not isinstance(key, str):
+                    raise ListingStreamError("目录列表响应的键不是字符串")
+                self._key = key
+                pos = end
+                self._state = _COLON
+            elif state == _COLON:
+                if char != ":":
+                    raise ListingStreamError("目录列表响应缺少冒号")
+                pos += 1
+                self._state = _ITEMS_OPEN if self._key == self.array_key else _VALUE
+            elif state == _VALUE:
+                value, end = self._decode_value(buffer, pos, final)
+                if value is _INCOMPLETE:
+                    break
+                self.extra[self._key] = value
+                pos = end
+                self._state = _AFTER_VALUE
+            elif state == _AFTER_VALUE:
+                if char == ",":
+                    self._state = _KEY
+                elif char == "}":
+                    self._state = _DONE
+                else:
+                    raise ListingStreamError(f"目录列表响应在位置 {pos} 出现意外字符 {char!r}")
+                pos += 1
+            elif state == _ITEMS_OPEN:
+                if char == "[":
+                    pos += 1
+                    self._state = _ITEM
+                    continue
+                # files 为 null 等非数组值时按空列表处理
+                value, end = self._decode_value(buffer, pos, final)
+                if value is _INCOMPLETE:
+                    break
+                pos = end
+                self._state = _AFTER_VALUE
+            elif state == _ITEM:
+                if char == "]":
+                    pos += 1
+                    self._state = _AFTER_VALUE
+                    continue
+                value, end = self._decode_value(buffer, pos, final)
+                if value is _INCOMPLETE:
+                    break
+                items.append(value)
+                self.count += 1
+                pos = end
+                self._state = _AFTER_ITEM
+            elif state == _AFTER_ITEM:
+                if char == ",":
+                    self._state = _ITEM
+                elif char == "]":
+                    self._state = _AFTER_VALUE
+                else:
+                    raise ListingStreamError(f"目录列表响应在位置 {pos} 出现意外字符 {char!r}")
+                pos += 1
+            else:
+                raise ListingStreamError("目录列表响应在对象结束后还有多余内容")
+
+        self._buffer = buffer[pos:]
+        return items
+
+
+def iter_file_batches(chunks: Iterable[bytes], batch_size: int = 500,
+                      parser: FilesArrayParser = None) -> Iterator[List[Any]]:
+    """
+    从响应字节块中逐批产出 files 条目
+
+    第一批在解析出任意条目后立即产出，保证首屏尽快显示；
+    之后每凑满 batch_size 条产出一批。
+    """
+    parser = parser or FilesArrayParser()
+    pending: List[Any] = []
+    emitted = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        pending.extend(parser.feed(chunk))
+        if pending and not emitted:
+            emitted = True
+            yield pending[:batch_size]
+            del pending[:batch_size]
+        while len(pending) >= batch_size:
+            yield pending[:batch_size]
+            del pending[:batch_size]
+    pending.extend(parser.close())
+    while pending:
+        yield pending[:batch_size]
+        del pending[:batch_size]
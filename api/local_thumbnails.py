@@ -0,0 +1,131 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+import threading
+import sys
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config import config
+
+# QImageReader 能直接解码的格式；视频等其他文件仍由服务器生成缩略图
+IMAGE_EXTENSIONS = frozenset((".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp", ".tif", ".tiff"))
+GENERATE_TIMEOUT = 30.0  # 单张缩略图的最长等待时间(秒)，超时改由服务器生成
+JPEG_QUALITY = 85
+
+
+def _render(path: str, width: int, height: int) -> Optional[bytes]:
+    """
+    在子进程中生成缩略图，返回编码后的图片数据，无法解码时返回 None
+
+    通过 QImageReader.setScaledSize 按显示尺寸解码，JPEG 由 libjpeg 直接以 1/2、1/4、1/8 缩小解码，
+    不需要先解码整张原图。
+    """
+    from PySide6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+    from PySide6.QtGui import QImageReader
+
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if width and height and size.isValid() and (size.width() > width or size.height() > height):
+        reader.setScaledSize(size.scaled(width, height, Qt.KeepAspectRatioByExpanding))
+    image = reader.read()
+    if image.isNull():
+        return None
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    # 带透明通道的图片保存为 PNG，其余保存为 JPEG
+    if image.hasAlphaChannel():
+        saved = image.save(buffer, "PNG")
+    else:
+        saved = image.save(buffer, "JPEG", JPEG_QUALITY)
+    buffer.close()
+    return bytes(data) if saved else None
+
+
+class LocalThumbnailer:
+    """
+    本地缩略图生成
+
+    NAS 存储目录挂载在本机（FILE_BASE_PATH）时，图片缩略图直接从本地文件生成，不经过 HTTP。
+    解码在进程池中进行（默认与 CPU 核数相同），不受 GIL 限制，也不占用 GUI 进程的内存。
+    文件在本地不可读、格式不支持或解码失败时返回 None，由调用方改为向服务器请求。
+    """
+
+    def __init__(self, base_path: str, workers: int = 0):
+        self.base_path = os.path.realpath(base_path)
+        self.workers = workers or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._closed = False
+
+    def local_path(self, rel_path: str) -> Optional[str]:
+        """文件在本地可读时返回完整路径，否则返回 None"""
+        if os.path.splitext(rel_path)[1].lower() not in IMAGE_EXTENSIONS:
+            return None
+        path = os.path.realpath(os.path.join(self.base_path, rel_path.replace("\\", "/").lstrip("/")))
+        # 不允许通过 .. 或符号链接访问存储目录以外的文件
+        if os.path.commonpath((self.base_path, path)) != self.base_path:
+            return None
+        if not os.path.isfile(path) or not os.access(path, os.R_OK):
+            return None
+        return path
+
+    def generate(self, rel_path: str, width: Optional[int], height: Optional[int]) -> Optional[bytes]:
+        """同步生成缩略图（在工作线程中调用），不能在本地生成时返回 None"""
+        path = self.local_path(rel_path)
+        if path is None:
+            return None
+        pool = self._get_pool()
+        if pool is None:
+            return None
+        try:
+            return pool.submit(_render, path, width or 0, height or 0).result(timeout=GENERATE_TIMEOUT)
+        except BrokenProcessPool:
+            # 子进程异常退出（如解码崩溃），下次重新创建进程池
+            print(f"本地缩略图进程异常退出: {rel_path}")
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False)
+        except Exception as e:
+            print(f"本地生成缩略图失败 {rel_path}: {e}")
+        return None
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._closed:
+                return None
+            if self._pool is None:
+                # GUI 进程中有多个线程，fork 可能复制到被持有的锁，使用 spawn 启动子进程
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def shutdown(self):
+        """退出程序时关闭进程池，不等待排队中的缩略图"""
+        with self._lock:
+            self._closed = True
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_thumbnailer: Optional[LocalThumbnailer] = None
+_thumbnailer_opened = False
+
+
+def get_local_thumbnailer() -> Optional[LocalThumbnailer]:
+    """获取全局的本地缩略图生成器；LOCAL_THUMBNAILS 关闭或 FILE_BASE_PATH 不是本机目录时返回 None"""
+    global _thumbnailer, _thumbnailer_opened
+    if _thumbnailer_opened:
+        return _thumbnailer
+    _thumbnailer_opened = True
+    base_path = config.get_file_base_path()
+    if config.get_local_thumbnails() and base_path and os.path.isdir(base_path):
+        _thumbnailer = LocalThumbnailer(base_path, config.get_local_thumbnail_workers())
+    return _thumbnailer
@@ -1,4 +1,3 @@
-import requests
 import sys
 import os
 
@@ -6,6 +5,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from config import config
+from api.http_session import get_session, response_json
 
 class LoginAPI:
     def __init__(self):
@@ -20,7 +20,7 @@ class LoginAPI:
                 "username": username,
                 "password": password
             }
-            response = requests.post(url, json=data)
-            return response.json(), response.status_code
+            response = get_session().post(url, json=data)
+            return response_json(response), response.status_code
         except Exception as e:
             return {"error": str(e)}, 500 
\ No newline at end of file
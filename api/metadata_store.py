@@ -0,0 +1,282 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Tuple
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config import config
+from api import json_codec
+from api.file_entries import FileEntries
+
+# 表结构或序列化格式变化时递增，旧数据库会被整体重建
+SCHEMA_VERSION = 1
+
+# 条目种类
+KIND_FILES = "files"  # 目录列表，key 为目录
+KIND_TYPEFILES = "typefiles"  # 分类文件分页，key 为 "类型:页码:每页条数"
+KIND_DIRTREE = "dirtree"  # 目录树，key 为根目录
+KIND_CRAWL = "crawl"  # 后台遍历的进度，key 为遍历的根目录
+KIND_HASH = "hash"  # 文件摘要（重复文件查找），key 为文件路径
+
+_SCHEMA = """
+CREATE TABLE entries (
+    scope TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    etag TEXT,
+    content_hash TEXT,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (scope, kind, key)
+);
+CREATE INDEX entries_accessed ON entries (accessed_at);
+"""
+
+
+def metadata_scope(username: str) -> str:
+    """缓存作用域：服务器地址 + 用户名，不同服务器或用户的数据互不可见"""
+    return f"{config.get_api_base_url().rstrip('/')}|{username}"
+
+
+class MetadataStore:
+    """
+    本地元数据缓存（SQLite，WAL 模式）
+
+    按 (作用域, 种类, key) 保存目录列表、分类文件分页和目录树，
+    启动后先显示上次保存的内容，再由后台请求与服务器同步。
+    总大小超过 max_bytes 时淘汰最久未访问的条目。
+    缓存内容都能从服务器重新获取，因此所有数据库错误只打印日志，不向调用方抛出。
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()  # 同一连接在 GUI 线程和工作线程间共享
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+        if version:
+            print(f"元数据缓存版本 {version} 与当前版本 {SCHEMA_VERSION} 不符，重建缓存")
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DROP TABLE IF EXISTS entries")
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    self._conn.execute(statement)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except sqlite3.Error:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    # ---- 通用读写 ----
+
+    def get(self, scope: str, kind: str, key: str) -> Optional[Tuple[bytes, Optional[str], Optional[str]]]:
+        """读取条目，返回 (payload, etag, content_hash)，不存在时返回 None"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT payload, etag, content_hash FROM entries WHERE scope=? AND kind=? AND key=?",
+                    (scope, kind, key)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE entries SET accessed_at=? WHERE scope=? AND kind=? AND key=?",
+                        (time.time(), scope, kind, key)
+                    )
+        except sqlite3.Error as e:
+            print(f"读取元数据缓存失败: {e}")
+            return None
+        return row
+
+    def put(self, scope: str, kind: str, key: str, payload: bytes,
+            etag: Optional[str] = None, content_hash: Optional[str] = None):
+        """写入条目（覆盖已有内容），之后按大小上限淘汰旧条目"""
+        size = len(payload)
+        if size > self.max_bytes:
+            # 单个条目超过上限时不缓存，也不再保留旧内容
+            self.delete(scope, kind, key)
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entries "
+                        "(scope, kind, key, size, updated_at, accessed_at, etag, content_hash, payload) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (scope, kind, key, size, now, now, etag, content_hash, payload)
+                    )
+                    self._evict()
+                except sqlite3.Error:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            print(f"写入元数据缓存失败: {e}")
+
+    def _evict(self):
+        """淘汰最久未访问的条目直到总大小不超过上限（调用方持有锁并已开启事务）"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        while total > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT rowid, size FROM entries ORDER BY accessed_at LIMIT 32"
+            ).fetchall()
+            if not rows:
+                break
+            for rowid, size in rows:
+                self._conn.execute("DELETE FROM entries WHERE rowid=?", (rowid,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def updated_at(self, scope: str, kind: str, key: str) -> Optional[float]:
+        """条目最后一次从服务器获取（或确认未变化）的时间，不读取内容"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT updated_at FROM entries WHERE scope=? AND kind=? AND key=?",
+                    (scope, kind, key)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"读取元数据缓存失败: {e}")
+            return None
+        return row[0] if row is not None else None
+
+    def touch(self, scope: str, kind: str, key: str, etag: Optional[str] = None):
+        """服务器确认内容未变化：更新获取时间（以及新的 ETag）"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE entries SET updated_at=?, etag=COALESCE(?, etag) WHERE scope=? AND kind=? AND key=?",
+                    (time.time(), etag, scope, kind, key)
+                )
+        except sqlite3.Error as e:
+            print(f"更新元数据缓存失败: {e}")
+
+    def delete(self, scope: str, kind: str, key: str):
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE scope=? AND kind=? AND key=?", (scope, kind, key)
+                )
+        except sqlite3.Error as e:
+            print(f"删除元数据缓存失败: {e}")
+
+    def clear(self, scope: Optional[str] = None):
+        """清空某个作用域（或全部）的缓存"""
+        try:
+            with self._lock:
+                if scope is None:
+                    self._conn.execute("DELETE FROM entries")
+                else:
+                    self._conn.execute("DELETE FROM entries WHERE scope=?", (scope,))
+        except sqlite3.Error as e:
+            print(f"清空元数据缓存失败: {e}")
+
+    def stats(self) -> dict:
+        """条目数与总字节数"""
+        try:
+            with self._lock:
+                count, total = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"读取元数据缓存统计失败: {e}")
+            count, total = 0, 0
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---- 目录列表 ----
+
+    def get_listing(self, scope: str, directory: str) -> Optional[Tuple[FileEntries, Optional[str], Optional[str]]]:
+        """读取目录列表，返回 (FileEntries, etag, content_hash)"""
+        row = self.get(scope, KIND_FILES, directory)
+        if row is None:
+            return None
+        payload, etag, content_hash = row
+        try:
+            return FileEntries.from_bytes(payload), etag, content_hash
+        except ValueError as e:
+            print(f"元数据缓存中的目录 {directory} 已损坏: {e}")
+            self.delete(scope, KIND_FILES, directory)
+            return None
+
+    def put_listing(self, scope: str, directory: str, files: FileEntries,
+                    etag: Optional[str] = None, content_hash: Optional[str] = None):
+        self.put(scope, KIND_FILES, directory, files.to_bytes(), etag, content_hash)
+
+    # ---- JSON 数据（分类文件、目录树） ----
+
+    def get_json(self, scope: str, kind: str, key: str) -> Any:
+        """读取 JSON 条目，不存在时返回 None"""
+        row = self.get(scope, kind, key)
+        if row is None:
+            return None
+        try:
+            return json_codec.loads(row[0])
+        except ValueError as e:
+            print(f"元数据缓存条目 {kind}/{key} 已损坏: {e}")
+            self.delete(scope, kind, key)
+            return None
+
+    def put_json(self, scope: str, kind: str, key: str, value: Any,
+                 etag: Optional[str] = None, content_hash: Optional[str] = None):
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.put(scope, kind, key, payload, etag, content_hash)
+
+
+_store: Optional[MetadataStore] = None
+_store_opened = False
+
+
+def get_metadata_store() -> Optional[MetadataStore]:
+    """
+    获取全局的本地元数据缓存
+
+    METADATA_CACHE_MB 为 0 或数据库无法打开时返回 None，调用方按无缓存处理。
+    数据库文件损坏时删除后重建一次。
+    """
+    global _store, _store_opened
+    if _store_opened:
+        return _store
+    _store_opened = True
+    max_bytes = config.get_metadata_cache_bytes()
+    if max_bytes <= 0:
+        return None
+    path = os.path.join(config.get_cache_dir(), "metadata.sqlite3")
+    for attempt in range(2):
+        try:
+            _store = MetadataStore(path, max_bytes)
+            break
+        except sqlite3.DatabaseError as e:
+            print(f"打开元数据缓存失败: {e}")
+            if attempt == 0 and os.path.exists(path):
+                for suffix in ("", "-wal", "-shm"):
+                    try:
+                        os.remove(path + suffix)
+                    except OSError:
+                        pass
+        except OSError as e:
+            print(f"无法创建元数据缓存目录: {e}")
+            break
+    return _store
@@ -0,0 +1,214 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, Optional, Tuple
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.cancellation import CancellationToken
+from api.file_api import FileAPI
+from api.file_entries import FileEntries
+from api.metadata_store import KIND_CRAWL, KIND_FILES, MetadataStore
+
+
+class NamespaceSnapshot:
+    """
+    遍历得到的命名空间快照：目录 -> 该目录的完整列表
+
+    供搜索、空间占用统计和重复文件检测使用；每个目录同时记录获取时间。
+    """
+
+    def __init__(self, root: str = "", parent_of: Optional[Callable[[str], str]] = None):
+        self.root = root
+        self._parent_of = parent_of or FileAPI().get_parent_directory
+        self.directories: Dict[str, FileEntries] = {}
+        self.fetched_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, directory: str, files: FileEntries, fetched_at: Optional[float] = None):
+        with self._lock:
+            self.directories[directory] = files
+            self.fetched_at[directory] = fetched_at if fetched_at is not None else time.time()
+
+    def get(self, directory: str) -> Optional[FileEntries]:
+        return self.directories.get(directory)
+
+    def __len__(self):
+        return len(self.directories)
+
+    def __contains__(self, directory: str) -> bool:
+        return directory in self.directories
+
+    def parent(self, directory: str) -> Optional[str]:
+        """上级目录；root 本身或不在快照内时返回 None"""
+        if directory == self.root:
+            return None
+        parent = self._parent_of(directory)
+        return parent if parent in self.directories else None
+
+    def file_count(self) -> int:
+        """快照中的条目总数（文件与文件夹）"""
+        return sum(len(files) for files in list(self.directories.values()))
+
+    def iter_files(self) -> Iterator[Tuple[FileEntries, int]]:
+        """遍历所有文件（不含文件夹），产生 (FileEntries, 行号)"""
+        for files in list(self.directories.values()):
+            for row in range(len(files)):
+                if not files.is_dir(row):
+                    yield files, row
+
+
+class NamespaceCrawler:
+    """
+    后台遍历用户的目录树
+
+    - 同时最多 concurrency 个请求，请求之间至少间隔 1/rate 秒
+    - foreground_busy() 返回 True 时（界面有请求进行中）暂停发出新请求
+    - 本地元数据缓存中获取时间未超过 max_age 的目录直接使用缓存，不再请求；
+      过期目录带 ETag 条件请求，未变化时只更新获取时间。
+      因此遍历中断后再次开始，已遍历的目录不会重复请求
+    """
+
+    def __init__(self, file_api: FileAPI, scope: str, store: Optional[MetadataStore] = None,
+                 concurrency: int = 2, rate: float = 4.0, max_age: float = 3600.0,
+                 foreground_busy: Optional[Callable[[], bool]] = None,
+                 on_directory: Optional[Callable[[str, FileEntries], None]] = None):
+        self._file_api = file_api
+        self._scope = scope
+        self._store = store
+        self._concurrency = max(1, concurrency)
+        self._min_interval = 1.0 / rate if rate > 0 else 0.0
+        self._max_age = max_age
+        self._foreground_busy = foreground_busy or (lambda: False)
+        self._on_directory = on_directory  # 每得到一个目录的列表时调用（工作线程）
+        self._next_request_at = 0.0
+        self._resume = threading.Event()  # 未设置表示手动暂停
+        self._resume.set()
+        self.stats = {"directories": 0, "files": 0, "fetched": 0, "not_modified": 0,
+                      "cached": 0, "errors": 0, "pending": 0, "paused": False}
+
+    # ---- 暂停控制（可在任意线程调用） ----
+
+    def pause(self):
+        self._resume.clear()
+
+    def resume(self):
+        self._resume.set()
+
+    @property
+    def is_paused(self) -> bool:
+        return not self._resume.is_set()
+
+    # ---- 遍历 ----
+
+    def crawl(self, root: str, token: CancellationToken,
+              on_progress: Optional[Callable[[dict], None]] = None) -> NamespaceSnapshot:
+        """广度优先遍历 root 下的所有目录，返回快照；取消时抛出 TaskCancelled"""
+        snapshot = NamespaceSnapshot(root, self._file_api.get_parent_directory)
+        pending = deque([root])
+        seen = {root}
+        started_at = time.time()
+        self._save_state(root, started_at, complete=False)
+        pool = ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="crawler")
+        in_flight = {}
+        try:
+            while pending or in_flight:
+                token.raise_if_cancelled()
+                while pending and len(in_flight) < self._concurrency:
+                    directory = pending.popleft()
+                    cached = self._fresh_listing(directory)
+                    if cached is not None:
+                        self.stats["cached"] += 1
+                        self._visit(snapshot, directory, cached, pending, seen)
+                        continue
+                    self._wait_for_turn(token, on_progress)
+                    in_flight[pool.submit(self._fetch, directory)] = directory
+                if in_flight:
+                    done, _ = wait(in_flight, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        directory = in_flight.pop(future)
+                        status, files = future.result()
+                        self.stats[status] += 1
+                        if files is not None:
+                            self._visit(snapshot, directory, files, pending, seen)
+                self.stats["pending"] = len(pending) + len(in_flight)
+                if on_progress is not None:
+                    on_progress(dict(self.stats))
+        finally:
+            pool.shutdown(wait=not token.is_cancelled, cancel_futures=True)
+        self._save_state(root, started_at, complete=True)
+        return snapshot
+
+    def _visit(self, snapshot: NamespaceSnapshot, directory: str, files: FileEntries,
+               pending: deque, seen: set):
+        snapshot.add(directory, files)
+        self.stats["directories"] += 1
+        self.stats["files"] += len(files)
+        if self._on_directory is not None:
+            self._on_directory(directory, files)
+        for row in range(len(files)):
+            if files.is_dir(row):
+                child = files.rel_path(row)
+                if child not in seen:
+                    seen.add(child)
+                    pending.append(child)
+
+    def _fresh_listing(self, directory: str) -> Optional[FileEntries]:
+        """本地缓存中未过期的目录列表"""
+        if self._store is None:
+            return None
+        updated_at = self._store.updated_at(self._scope, KIND_FILES, directory)
+        if updated_at is None or time.time() - updated_at > self._max_age:
+            return None
+        stored = self._store.get_listing(self._scope, directory)
+        return stored[0] if stored is not None else None
+
+    def _wait_for_turn(self, token: CancellationToken, on_progress):
+        """等待手动暂停解除、前台请求结束，并遵守请求间隔"""
+        while True:
+            token.raise_if_cancelled()
+            paused = self.is_paused or self._foreground_busy()
+            if paused != self.stats["paused"]:
+                self.stats["paused"] = paused
+                if on_progress is not None:
+                    on_progress(dict(self.stats))
+            if not paused:
+                delay = self._next_request_at - time.monotonic()
+                if delay <= 0:
+                    break
+                time.sleep(min(delay, 0.2))
+            else:
+                self._resume.wait(0.2)
+                time.sleep(0.05 if self.is_paused else 0.2)
+        self._next_request_at = time.monotonic() + self._min_interval
+
+    def _fetch(self, directory: str) -> Tuple[str, Optional[FileEntries]]:
+        """请求一个目录（在遍历线程池中执行），返回 (统计项, 列表)"""
+        stored = self._store.get_listing(self._scope, directory) if self._store is not None else None
+        etag, content_hash = (stored[1], stored[2]) if stored is not None else (None, None)
+        result = self._file_api.get_file_list(directory, etag=etag)
+        if not result["success"]:
+            print(f"遍历目录 {directory} 失败: {result.get('error')}")
+            return "errors", None
+        if stored is not None and (result.get("not_modified")
+                                   or (content_hash and result.get("content_hash") == content_hash)):
+            self._store.touch(self._scope, KIND_FILES, directory, result.get("etag"))
+            return "not_modified", stored[0]
+        files_data = result["data"].get("files", []) if result["data"] else []
+        files = FileEntries.from_raw(files_data or [], directory)
+        if self._store is not None:
+            self._store.put_listing(self._scope, directory, files, result.get("etag"), result.get("content_hash"))
+        return "fetched", files
+
+    def _save_state(self, root: str, started_at: float, complete: bool):
+        """记录遍历进度（开始时间、是否完成），界面可据此显示上次完整遍历的时间"""
+        if self._store is None:
+            return
+        state = {"started_at": started_at, "complete": complete,
+                 "finished_at": time.time() if complete else None,
+                 "directories": self.stats["directories"], "files": self.stats["files"]}
+        self._store.put_json(self._scope, KIND_CRAWL, root, state)
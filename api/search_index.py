@@ -0,0 +1,278 @@
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 单个搜索词少于 3 个字符时，ASCII 词按“词首前缀”匹配；以 \0 开头与三元组区分
+_PREFIX_MARK = "\0"
+_ASCII_TOKEN = re.compile(r"[0-9a-z]+")
+# 中日韩文字（含扩展区、假名与谚文）
+_CJK_RUN = re.compile("[\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\U00020000-\U0002fa1f]+")
+# 既不是 ASCII 字母数字、也不是中日韩文字或空白的字符（_ - . 等符号、带重音的字母）
+_SYMBOL = re.compile(r"[^0-9a-z\s\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\U00020000-\U0002fa1f]")
+
+# 已删除条目超过该数量且超过存活条目数时重建倒排表
+_COMPACT_MIN_DEAD = 10000
+# 查询时每次校验的候选条目数
+_SCAN_CHUNK = 2048
+# 第二短的倒排表不超过最短的这么多倍时，先与之求交集再校验子串
+_INTERSECT_RATIO = 4
+
+
+def _is_cjk(ch: str) -> bool:
+    return _CJK_RUN.match(ch) is not None
+
+
+def name_grams(name: str) -> set:
+    """
+    文件名（已 casefold）的索引项
+
+    - 所有字符的三元组，用于 3 个字符以上的子串查询
+    - 每个中日韩字及相邻两个中日韩字，中文名常用一两个字搜索
+    - ASCII 词的前 1、2 个字符，用于短英文前缀查询
+    - 含符号的两个字符（如 "1_"、"-2"、"._"），用于包含符号的短查询
+    """
+    grams = {name[i:i + 3] for i in range(len(name) - 2)}
+    if not name.isascii():
+        for run in _CJK_RUN.findall(name):
+            grams.update(run)
+            grams.update(run[i:i + 2] for i in range(len(run) - 1))
+    for match in _ASCII_TOKEN.finditer(name):
+        start = match.start()
+        grams.add(_PREFIX_MARK + name[start])
+        if match.end() - start >= 2:
+            grams.add(_PREFIX_MARK + name[start:start + 2])
+    for match in _SYMBOL.finditer(name):
+        start = match.start()
+        for pair in (name[start - 1:start + 1] if start else "", name[start:start + 2]):
+            if len(pair) == 2 and not (pair[0].isspace() or pair[1].isspace()):
+                grams.add(pair)
+    return grams
+
+
+def _query_grams(term: str) -> List[str]:
+    """搜索词必须出现的索引项；返回空列表表示无法用索引缩小范围"""
+    if len(term) >= 3:
+        return [term[i:i + 3] for i in range(len(term) - 2)]
+    cjk = [ch for ch in term if _is_cjk(ch)]
+    if len(cjk) == 2:
+        return [term]
+    if cjk:
+        return cjk
+    if _ASCII_TOKEN.fullmatch(term):
+        return [_PREFIX_MARK + term]
+    if len(term) == 2 and _SYMBOL.search(term):
+        return [term]
+    return []
+
+
+class FilenameIndex:
+    """
+    文件名搜索索引
+
+    收录目录列表、分类文件和目录树中见到的所有路径，按文件名（casefold 后）
+    建立倒排表：三元组 + 中日韩单字/双字 + 英文词首前缀。
+    查询时以最短的倒排表为候选，与第二短的倒排表求交集后再逐个校验子串，名称以搜索词开头的结果排在前面。
+    条目编号只增不减，删除只做标记，删除过多时重建倒排表。
+    可在任意线程中调用，内部加锁。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self._paths: List[str] = []
+        self._names: List[str] = []  # casefold 后的文件名
+        self._is_dir = bytearray()
+        self._alive = bytearray()
+        self._ids: Dict[str, int] = {}  # 路径 -> 编号
+        self._children: Dict[str, set] = {}  # 父目录 -> 子条目编号
+        self._postings: Dict[str, array] = defaultdict(partial(array, "I"))
+        self._dead = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._ids
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    # ---- 写入 ----
+
+    def add(self, path: str, is_dir: bool = False) -> bool:
+        return self.add_many(((path, is_dir),)) > 0
+
+    def add_many(self, items: Iterable[Tuple[str, bool]]) -> int:
+        """批量加入 (路径, 是否目录)，已存在的路径只更新目录标志；返回新增条目数"""
+        prepared = []
+        for path, is_dir in items:
+            if not path:
+                continue
+            if path in self._ids:
+                # 已收录：写入时只更新目录标志
+                prepared.append((path, is_dir, None, None))
+                continue
+            # 索引项在锁外计算，写入时只做追加
+            name = path.rpartition("/")[2].casefold()
+            prepared.append((path, is_dir, name, name_grams(name)))
+        if not prepared:
+            return 0
+        with self._lock:
+            return self._insert(prepared)
+
+    def _insert(self, prepared: list) -> int:
+        added = 0
+        postings = self._postings
+        for path, is_dir, name, grams in prepared:
+            existing = self._ids.get(path)
+            if existing is not None:
+                self._is_dir[existing] = 1 if is_dir else 0
+                continue
+            if grams is None:
+                continue
+            item_id = len(self._paths)
+            self._paths.append(path)
+            self._names.append(name)
+            self._is_dir.append(1 if is_dir else 0)
+            self._alive.append(1)
+            self._ids[path] = item_id
+            self._children.setdefault(path.rpartition("/")[0], set()).add(item_id)
+            for gram in grams:
+                postings[gram].append(item_id)
+            added += 1
+        return added
+
+    def remove_tree(self, path: str) -> int:
+        """删除 path 及其下所有已收录的路径；返回删除的条目数"""
+        with self._lock:
+            removed = self._remove_tree(path)
+            self._maybe_compact()
+        return removed
+
+    def _remove_tree(self, path: str) -> int:
+        item_id = self._ids.pop(path, None)
+        if item_id is None:
+            return 0
+        self._alive[item_id] = 0
+        self._dead += 1
+        siblings = self._children.get(path.rpartition("/")[0])
+        if siblings is not None:
+            siblings.discard(item_id)
+        removed = 1
+        children = self._children.pop(path, None)
+        if children:
+            for child in children:
+                removed += self._remove_tree(self._paths[child])
+        return removed
+
+    def sync_directory(self, directory: str, entries) -> int:
+        """
+        用一个目录的完整列表（FileEntries）更新索引：
+        加入新条目，删除列表中已不存在的条目及其子树；返回变化的条目数
+        """
+        items = [(entries.rel_path(row), entries.is_dir(row)) for row in range(len(entries))]
+        current = {path for path, _ in items}
+        changed = 0
+        with self._lock:
+            stale = [self._paths[i] for i in self._children.get(directory, ())
+                     if self._paths[i] not in current]
+            for path in stale:
+                changed += self._remove_tree(path)
+            if stale:
+                self._maybe_compact()
+        return changed + self.add_many(items)
+
+    def _maybe_compact(self):
+        """删除标记过多时按存活条目重建（调用方持有锁）"""
+        if self._dead < _COMPACT_MIN_DEAD or self._dead < len(self._ids):
+            return
+        items = [(self._paths[i], self._names[i], self._is_dir[i]) for i in sorted(self._ids.values())]
+        self._clear()
+        self._insert([(path, is_dir, name, name_grams(name)) for path, name, is_dir in items])
+
+    # ---- 查询 ----
+
+    def _candidates(self, terms: List[str]) -> Optional[List[array]]:
+        """
+        所有搜索词的索引项的倒排表，按长度从短到长排列；
+        None 表示没有搜索词能用索引缩小范围，空列表表示有索引项没有任何条目
+        """
+        postings = {}
+        for term in terms:
+            for gram in _query_grams(term):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return []
+                postings[gram] = posting
+        if not postings:
+            return None
+        return sorted(postings.values(), key=len)
+
+    @staticmethod
+    def _candidate_chunks(postings: List[array]) -> Iterable[List[int]]:
+        """
+        按块给出候选条目：最短的倒排表每一块只保留同时出现在第二短的倒排表中的条目。
+        倒排表按编号递增，每块只需取第二短的倒排表中编号范围相同的一段；
+        第二短的倒排表长得多时求交集反而更慢，直接校验子串
+        """
+        if not postings:
+            return
+        shortest = postings[0]
+        second = None
+        if len(postings) > 1 and len(postings[1]) <= _INTERSECT_RATIO * len(shortest):
+            second = postings[1]
+        for start in range(0, len(shortest), _SCAN_CHUNK):
+            chunk = shortest[start:start + _SCAN_CHUNK]
+            if second is not None:
+                low = bisect_left(second, chunk[0])
+                chunk = sorted(set(chunk).intersection(second[low:bisect_right(second, chunk[-1], low)]))
+            yield chunk
+
+    def search(self, query: str, limit: int = 500) -> List[Tuple[str, bool]]:
+        """
+        按文件名搜索，返回 [(路径, 是否目录)]
+
+        空格分隔的多个词须全部出现在文件名中；名称以第一个词开头的结果在前。
+        只有单个符号（如 "_"、"."）这类无法用索引缩小范围的查询不做全表扫描，直接返回空结果，
+        避免在持有锁的情况下遍历全部条目、阻塞写入。
+        """
+        terms = query.casefold().split()
+        if not terms or limit <= 0:
+            return []
+        first, other_terms = terms[0], terms[1:]
+        prefix_matches, other_matches = [], []
+        with self._lock:
+            postings = self._candidates(terms)
+            if postings is None:
+                return []
+            names, alive = self._names, self._alive
+            # 分块用推导式过滤，比逐条判断快，又能在结果足够时提前结束
+            for chunk in self._candidate_chunks(postings):
+                chunk = [i for i in chunk if alive[i] and first in names[i]]
+                for term in other_terms:
+                    chunk = [i for i in chunk if term in names[i]]
+                for item_id in chunk:
+                    (prefix_matches if names[item_id].startswith(first) else other_matches).append(item_id)
+                if len(prefix_matches) + len(other_matches) >= limit:
+                    break
+            paths, is_dir = self._paths, self._is_dir
+            return [(paths[i], bool(is_dir[i])) for i in (prefix_matches + other_matches)[:limit]]
+
+_index: Optional[FilenameIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> FilenameIndex:
+    """获取全局的文件名搜索索引"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FilenameIndex()
+    return _index
@@ -2,9 +2,11 @@ import requests
 from urllib.parse import quote
 from typing import Optional, Union, Dict, Any
 from config import config
+from api.http_session import get_session, response_json
 
 class ThumbnailAPI:
     def __init__(self, token: str = ""):
+        self._session = get_session()
         self.token = token
         self.headers = {
             "Accept": "image/*",  # 明确表示接受图片响应
@@ -15,6 +17,7 @@ class ThumbnailAPI:
 
     def set_token(self, token: str):
         self.token = token
+        self._session.set_token(token)
         if token:
             self.headers["Authorization"] = f"Bearer {token}"
         elif "Authorization" in self.headers:
@@ -112,12 +115,11 @@ class ThumbnailAPI:
             if quality:
                 params["quality"] = str(max(1, min(100, quality)))  # 1-100
 
-            response = requests.get(
+            response = self._session.get(
                 f"{config.get_api_base_url()}/api/file/thumbnail",
                 headers=self.headers,
                 params=params,
-                timeout=timeout,
-                stream=True
+                timeout=timeout
             )
 
             if response.status_code == 200:
@@ -126,7 +128,7 @@ class ThumbnailAPI:
                     return response.content
                 else:
                     try:
-                        return response.json()
+                        return response_json(response)
                     except ValueError:
                         return {
                             "error": "Invalid response format",
@@ -135,7 +137,7 @@ class ThumbnailAPI:
                         }
             else:
                 try:
-                    return response.json()
+                    return response_json(response)
                 except ValueError:
                     return {
                         "error": "Failed to get thumbnail",
@@ -0,0 +1,67 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class ThumbnailCache:
+    """
+    缩略图内存缓存（按字节数限制的 LRU，线程安全）
+
+    key 由调用方决定（文件路径、请求尺寸、文件修改时间），文件修改后 key 随之变化，旧条目自然被淘汰。
+    每个条目的大小由 size_of 计算（解码后的 QImage 使用 sizeInBytes）。
+    总字节数超过 max_bytes 时淘汰最久未使用的条目；单个条目超过上限时不缓存。
+    """
+
+    def __init__(self, max_bytes: int, size_of: Callable[[Any], int] = sys.getsizeof):
+        self.max_bytes = max_bytes
+        self._size_of = size_of
+        self._lock = threading.Lock()  # GUI 线程与图片加载线程共享
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        size = self._size_of(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+                self._bytes -= self._sizes.pop(key)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
@@ -0,0 +1,161 @@
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+TIER_VISIBLE = 0  # 当前可见的单元格
+TIER_PREFETCH = 1  # 可见范围前后一屏以内
+TIER_BACKGROUND = 2  # 更远的位置或不知道位置的请求
+
+
+class ThumbnailJob:
+    """一次排队的缩略图加载"""
+
+    __slots__ = ("view", "index", "request", "callback", "seq", "queued_at", "cancelled")
+
+    def __init__(self, view: str, index: int, request: tuple, callback: Callable[[Any], None], seq: int):
+        self.view = view
+        self.index = index  # 在视图中的行号，-1 表示未知
+        self.request = request
+        self.callback = callback
+        self.seq = seq
+        self.queued_at = time.monotonic()
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class ThumbnailScheduler:
+    """
+    缩略图加载调度（有界并发 + 按可见范围排优先级）
+
+    视图滚动时通过 set_viewport 告知可见的行范围；工作线程每次取任务时按当前可见范围重新分级：
+    可见的单元格最先，其次是前后一屏以内（预取），其余最后；同一级中最新的请求最先，
+    快速滑动时先加载停下来的位置。委托被销毁时取消的任务在出队时直接丢弃，不会占用工作线程。
+    """
+
+    def __init__(self, load: Callable[[tuple], Any], workers: int = 4):
+        self._load = load
+        self._workers = max(1, workers)
+        self._cond = threading.Condition()
+        self._queue: List[ThumbnailJob] = []
+        self._viewports: Dict[str, Tuple[int, int]] = {}
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+        self._running = 0
+        self.completed = 0
+        self.cancelled = 0
+        # 滚动停下后可见区域第一张缩略图的耗时
+        self._scrolled_at: Optional[float] = None
+        self.first_thumbnail_ms = 0.0
+        self.visible_latency_ms = 0.0  # 可见单元格从排队到完成的耗时（指数平均）
+
+    def submit(self, view: str, index: int, request: tuple, callback: Callable[[Any], None]) -> ThumbnailJob:
+        """排队加载，完成后在工作线程中调用 callback(结果)；任务被取消时不调用"""
+        with self._cond:
+            job = ThumbnailJob(view, index, request, callback, next(self._seq))
+            self._queue.append(job)
+            if len(self._threads) < self._workers and len(self._threads) <= self._running:
+                thread = threading.Thread(target=self._work, name=f"thumbnail-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+            return job
+
+    def set_viewport(self, view: str, first: int, last: int):
+        """视图可见的行范围（含两端）"""
+        with self._cond:
+            if self._viewports.get(view) != (first, last):
+                self._viewports[view] = (first, last)
+                if self._scrolled_at is None:
+                    self._scrolled_at = time.monotonic()
+
+    def _tier(self, job: ThumbnailJob) -> int:
+        viewport = self._viewports.get(job.view)
+        if viewport is None or job.index < 0:
+            return TIER_BACKGROUND
+        first, last = viewport
+        if first <= job.index <= last:
+            return TIER_VISIBLE
+        screen = last - first + 1
+        if first - screen <= job.index <= last + screen:
+            return TIER_PREFETCH
+        return TIER_BACKGROUND
+
+    def _next_job(self) -> Optional[ThumbnailJob]:
+        """取优先级最高的任务，同时丢弃已取消的任务（调用时持有锁）"""
+        best = None
+        best_rank = None
+        alive = []
+        for job in self._queue:
+            if job.cancelled:
+                self.cancelled += 1
+                continue
+            alive.append(job)
+            rank = (self._tier(job), -job.seq)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = job, rank
+        if best is not None:
+            alive.remove(best)
+        self._queue = alive
+        return best
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None and not self._stopped:
+                    self._cond.wait()
+                    job = self._next_job()
+                if job is None:
+                    return
+                self._running += 1
+                visible = self._tier(job) == TIER_VISIBLE
+            try:
+                result = self._load(job.request)
+            except Exception as e:
+                print(f"加载缩略图失败: {e}")
+                result = None
+            finally:
+                with self._cond:
+                    self._running -= 1
+            self._finished(job, visible)
+            if job.cancelled:
+                continue
+            job.callback(result)
+
+    def _finished(self, job: ThumbnailJob, visible: bool):
+        now = time.monotonic()
+        with self._cond:
+            self.completed += 1
+            if visible:
+                latency = (now - job.queued_at) * 1000
+                self.visible_latency_ms = latency if not self.visible_latency_ms else \
+                    self.visible_latency_ms * 0.9 + latency * 0.1
+                if self._scrolled_at is not None:
+                    self.first_thumbnail_ms = (now - max(self._scrolled_at, job.queued_at)) * 1000
+                    self._scrolled_at = None
+
+    @property
+    def queue_depth(self) -> int:
+        """排队中未取消的任务数"""
+        with self._cond:
+            return sum(1 for job in self._queue if not job.cancelled)
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def shutdown(self, timeout: float = 3.0):
+        """丢弃排队的任务并等待正在执行的任务结束"""
+        with self._cond:
+            self._stopped = True
+            for job in self._queue:
+                job.cancelled = True
+            self._queue = []
+            self._cond.notify_all()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
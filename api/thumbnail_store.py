@@ -0,0 +1,157 @@
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+from typing import Optional
+import sys
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config import config
+
+STORE_VERSION = "v1"  # 文件名或内容格式变化时递增，旧目录不再使用
+TRIM_TARGET = 0.9  # 超出上限时删除到上限的这个比例，避免频繁清理
+
+
+def thumbnail_key(scope: str, rel_path: str, width: Optional[int], height: Optional[int], updated_at: str) -> str:
+    """缩略图在磁盘上的名字：服务器与用户、路径、尺寸和修改时间的摘要，文件修改后自然对应新的名字"""
+    raw = f"{scope}\n{rel_path}\n{width or 0}x{height or 0}\n{updated_at}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ThumbnailStore:
+    """
+    磁盘缩略图缓存
+
+    每个缩略图是 root/ab/cd/<摘要> 一个文件（按摘要前 4 位分两级子目录，避免单个目录文件过多），
+    先写临时文件再 rename，进程中断也不会留下不完整的缩略图。读取时通过 mmap 映射文件。
+    命中时更新文件的修改时间，总大小超过 max_bytes 时在后台线程中删除修改时间最早的文件。
+    缓存内容都能从服务器重新获取，因此文件系统错误只打印日志，不向调用方抛出。
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None  # 首次清理时统计
+        self._trimming = False
+        os.makedirs(root, exist_ok=True)
+        self._schedule_trim()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def get(self, key: str) -> Optional[mmap.mmap]:
+        """返回映射缩略图文件的只读 mmap（调用方用完后 close），不存在时返回 None"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)  # LRU：按修改时间淘汰
+            return data
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"读取缩略图缓存失败: {e}")
+            return None
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            except OSError:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            print(f"写入缩略图缓存失败: {e}")
+            return
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data)
+                if self._total_bytes > self.max_bytes:
+                    self._schedule_trim()
+
+    def _schedule_trim(self):
+        """在后台线程中统计总大小并按需清理（同一时间只有一个清理线程）"""
+        if self._trimming:
+            return
+        self._trimming = True
+        threading.Thread(target=self._trim, name="thumbnail-trim", daemon=True).start()
+
+    def _trim(self):
+        try:
+            entries = []
+            total = 0
+            for dirpath, _, filenames in os.walk(self.root):
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    if name.startswith(".tmp-"):
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+            if total > self.max_bytes:
+                entries.sort()
+                target = int(self.max_bytes * TRIM_TARGET)
+                removed = 0
+                for _, size, path in entries:
+                    if total <= target:
+                        break
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    total -= size
+                    removed += 1
+                print(f"缩略图缓存清理: 删除 {removed} 个文件")
+            with self._lock:
+                self._total_bytes = total
+        finally:
+            with self._lock:
+                self._trimming = False
+
+    def clear(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                try:
+                    os.remove(os.path.join(dirpath, name))
+                except OSError:
+                    pass
+        with self._lock:
+            self._total_bytes = 0
+
+
+_store: Optional[ThumbnailStore] = None
+_store_opened = False
+
+
+def get_thumbnail_store() -> Optional[ThumbnailStore]:
+    """获取全局的磁盘缩略图缓存；THUMBNAIL_DISK_CACHE_MB 为 0 或目录无法创建时返回 None"""
+    global _store, _store_opened
+    if _store_opened:
+        return _store
+    _store_opened = True
+    max_bytes = config.get_thumbnail_disk_cache_mb() * 1024 * 1024
+    if max_bytes <= 0:
+        return None
+    try:
+        _store = ThumbnailStore(os.path.join(config.get_cache_dir(), "thumbnails", STORE_VERSION), max_bytes)
+    except OSError as e:
+        print(f"无法创建缩略图缓存目录: {e}")
+    return _store
@@ -0,0 +1,155 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+GRANULARITIES = ("day", "month", "year")
+_KEY_LENGTHS = {"day": 10, "month": 7, "year": 4}  # "2021-03-14" / "2021-03" / "2021"
+
+
+def date_key(file: dict) -> str:
+    """文件的日期（YYYY-MM-DD），优先使用 createdAt，没有时使用 updatedAt；都没有时为空字符串"""
+    value = file.get("createdAt") or file.get("updatedAt") or ""
+    return value[:10] if len(value) >= 10 and value[4] == "-" else ""
+
+
+def granularity_of(key: str) -> Optional[str]:
+    """分组 key 的粒度（按长度判断），格式不对时为 None"""
+    granularity = next((g for g, length in _KEY_LENGTHS.items() if length == len(key)), None)
+    if granularity is None or not all(part.isdigit() for part in key.split("-")):
+        return None
+    return granularity
+
+
+def format_key(key: str) -> str:
+    """分组标题：2021年 / 2021年3月 / 2021年3月14日"""
+    if not key:
+        return "未知日期"
+    parts = key.split("-")
+    label = f"{parts[0]}年"
+    if len(parts) > 1:
+        label += f"{int(parts[1])}月"
+    if len(parts) > 2:
+        label += f"{int(parts[2])}日"
+    return label
+
+
+class _Buckets:
+    """某一粒度的分组：行顺序上的连续段，以及每个分组第一次出现的行"""
+
+    __slots__ = ("starts", "keys", "first_row", "counts", "sorted_keys")
+
+    def __init__(self):
+        self.starts: List[int] = []  # 每一段的起始行（递增）
+        self.keys: List[str] = []  # 每一段的分组
+        self.first_row: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {}
+        self.sorted_keys: List[str] = []  # 出现过的分组，升序
+
+    def add(self, row: int, key: str, count: int):
+        if not self.keys or self.keys[-1] != key:
+            self.starts.append(row)
+            self.keys.append(key)
+            if key not in self.first_row:
+                self.first_row[key] = row
+                insort(self.sorted_keys, key)
+        self.counts[key] = self.counts.get(key, 0) + count
+
+
+class TimelineIndex:
+    """
+    照片时间线索引
+
+    按行顺序（服务器顺序）记录每个日/月/年分组的连续段和第一次出现的行，
+    追加一页时增量更新，只保存分组边界，不保存行数据（模型释放的块不影响索引）。
+    查找某行所属的分组和跳转到某个日期都是二分查找，O(log n)。
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, _Buckets] = {}
+        self._count = 0
+        self.clear()
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        self._buckets = {granularity: _Buckets() for granularity in GRANULARITIES}
+        self._count = 0
+
+    def extend(self, files: Iterable[dict]):
+        """在末尾追加一批行"""
+        for file in files:
+            self._add_day(date_key(file), 1)
+
+    def _add_day(self, day: str, count: int):
+        row = self._count
+        for granularity, buckets in self._buckets.items():
+            buckets.add(row, day[:_KEY_LENGTHS[granularity]], count)
+        self._count += count
+
+    def truncate(self, count: int):
+        """只保留前 count 行（按段重建，段数远少于行数）"""
+        if count >= self._count:
+            return
+        day_buckets = self._buckets["day"]
+        runs = list(zip(day_buckets.starts, day_buckets.keys, day_buckets.starts[1:] + [self._count]))
+        self.clear()
+        for start, key, end in runs:
+            if start >= count:
+                break
+            self._add_day(key, min(end, count) - start)
+
+    def section_of(self, row: int, granularity: str) -> str:
+        """第 row 行所属的分组"""
+        buckets = self._buckets[granularity]
+        position = bisect_right(buckets.starts, row) - 1
+        return buckets.keys[position] if position >= 0 and row < self._count else ""
+
+    def is_section_start(self, row: int, granularity: str) -> bool:
+        """第 row 行是否为一段的第一行"""
+        buckets = self._buckets[granularity]
+        position = bisect_left(buckets.starts, row)
+        return position < len(buckets.starts) and buckets.starts[position] == row
+
+    def seek(self, key: str) -> int:
+        """
+        跳转到分组 key（"2021" / "2021-03" / "2021-03-14"）第一次出现的行；该分组没有照片时
+        跳到不晚于它的最近分组，都晚于它时跳到最早的分组；索引为空或 key 格式不对时返回 -1
+        """
+        granularity = granularity_of(key)
+        if granularity is None:
+            return -1
+        buckets = self._buckets[granularity]
+        row = buckets.first_row.get(key)
+        if row is not None:
+            return row
+        if not buckets.sorted_keys:
+            return -1
+        position = bisect_right(buckets.sorted_keys, key) - 1
+        nearest = buckets.sorted_keys[max(position, 0)]
+        return buckets.first_row[nearest]
+
+    def covers(self, key: str) -> bool:
+        """
+        已加载的行是否足以确定分组 key 的位置：key 已经出现，或按行顺序已经越过 key
+        （服务器按日期排序，从新到旧时最后一段早于 key，从旧到新时晚于 key）；key 格式不对时为 True
+        """
+        granularity = granularity_of(key)
+        if granularity is None:
+            return True
+        buckets = self._buckets[granularity]
+        if key in buckets.first_row:
+            return True
+        first = next((k for k in buckets.keys if k), None)
+        if first is None:
+            return False
+        last = next(k for k in reversed(buckets.keys) if k)
+        return last < key if first >= last else last > key
+
+    def sections(self, granularity: str) -> List[Tuple[str, int, int]]:
+        """所有分组 (分组, 第一次出现的行, 行数)，按第一次出现的顺序"""
+        buckets = self._buckets[granularity]
+        return sorted(((key, row, buckets.counts[key]) for key, row in buckets.first_row.items()),
+                      key=lambda section: section[1])
+
+    def first_row(self, key: str, granularity: str) -> Optional[int]:
+        return self._buckets[granularity].first_row.get(key)
@@ -1,8 +1,10 @@
 import requests
 from config import config
+from api.http_session import get_session, response_json
 
 class TypeFilesAPI:
     def __init__(self, token: str = ""):
+        self._session = get_session()
         self.token = token
         self.headers = {
             "Content-Type": "application/json"
@@ -12,6 +14,7 @@ class TypeFilesAPI:
 
     def set_token(self, token: str):
         self.token = token
+        self._session.set_token(token)
         if token:
             self.headers["Authorization"] = f"Bearer {token}"
         elif "Authorization" in self.headers:
@@ -26,11 +29,11 @@ class TypeFilesAPI:
             "pagesize": pagesize
         }
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._session.get(url, headers=self.headers, params=params)
             return {
                 "success": response.status_code == 200,
                 "status_code": response.status_code,
-                "data": response.json() if response.status_code == 200 else None,
+                "data": response_json(response, file_list=True) if response.status_code == 200 else None,
                 "error": response.text if response.status_code != 200 else None
             }
         except requests.exceptions.RequestException as e:
@@ -1,4 +1,5 @@
 import os
+import uuid
 import requests
 from typing import Dict, Optional
 import sys
@@ -7,6 +8,78 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from config import config
+from api.http_session import get_session, response_json
+
+
+class _MultipartFileStream:
+    """
+    流式 multipart/form-data 请求体
+
+    requests 会按块调用 read()，因此可以在发送过程中统计进度、检查取消，
+    且不会把整个文件读入内存。
+    """
+
+    def __init__(self, file_path: str, field_name: str, progress_callback=None, cancel_token=None):
+        boundary = uuid.uuid4().hex
+        filename = os.path.basename(file_path).replace('"', '%22')
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self._head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("utf-8")
+        self._tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+        self._file_size = os.path.getsize(file_path)
+        self._file = open(file_path, "rb")
+        self._progress_callback = progress_callback
+        self._cancel_token = cancel_token
+        self._position = 0
+        self._last_progress = -1
+        self.len = len(self._head) + self._file_size + len(self._tail)
+
+    def __len__(self):
+        return self.len
+
+    def read(self, size: int = -1) -> bytes:
+        if self._cancel_token is not None:
+            self._cancel_token.raise_if_cancelled()
+        if size is None or size < 0:
+            size = self.len
+        chunks = []
+        remaining = size
+        while remaining > 0 and self._position < self.len:
+            chunk = self._read_part(remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        self._report_progress()
+        return b"".join(chunks)
+
+    def _read_part(self, size: int) -> bytes:
+        head_len = len(self._head)
+        file_end = head_len + self._file_size
+        if self._position < head_len:
+            chunk = self._head[self._position:self._position + size]
+        elif self._position < file_end:
+            chunk = self._file.read(min(size, file_end - self._position))
+        else:
+            offset = self._position - file_end
+            chunk = self._tail[offset:offset + size]
+        self._position += len(chunk)
+        return chunk
+
+    def _report_progress(self):
+        if not self._progress_callback or self._file_size <= 0:
+            return
+        sent = min(max(self._position - len(self._head), 0), self._file_size)
+        progress = int(sent * 100 / self._file_size)
+        if progress != self._last_progress:
+            self._last_progress = progress
+            self._progress_callback(progress)
+
+    def close(self):
+        self._file.close()
 
 
 class UploadAPI:
@@ -19,6 +92,7 @@ class UploadAPI:
         Args:
             token: 认证token
         """
+        self._session = get_session()
         self.headers = {
             "Authorization": f"Bearer {token}" if token else "",
             "Content-Type": "application/json"
@@ -32,6 +106,7 @@ class UploadAPI:
             token: 认证token
         """
         self.headers["Authorization"] = f"Bearer {token}"
+        self._session.set_token(token)
     
     def upload_file(self, file_path: str, current_dir: str = "") -> Dict:
         """
@@ -61,12 +136,13 @@ class UploadAPI:
                     "Authorization": self.headers["Authorization"]
                 }
                 
-                response = requests.post(url, headers=upload_headers, params=params, files=files)
+                response = self._session.post(url, headers=upload_headers, params=params, files=files,
+                                              timeout=config.get_http_transfer_timeout())
                 
                 return {
                     "success": response.status_code == 200,
                     "status_code": response.status_code,
-                    "data": response.json() if response.status_code == 200 else None,
+                    "data": response_json(response) if response.status_code == 200 else None,
                     "error": response.text if response.status_code != 200 else None
                 }
                 
@@ -92,7 +168,8 @@ class UploadAPI:
                 "error": f"上传失败: {str(e)}"
             }
     
-    def upload_file_with_progress(self, file_path: str, current_dir: str = "", progress_callback=None) -> Dict:
+    def upload_file_with_progress(self, file_path: str, current_dir: str = "", progress_callback=None,
+                                  cancel_token=None) -> Dict:
         """
         带进度回调的文件上传
         
@@ -100,6 +177,7 @@ class UploadAPI:
             file_path: 本地文件路径
             current_dir: 目标目录的相对路径
             progress_callback: 进度回调函数，接收进度百分比参数
+            cancel_token: 取消令牌（可选），取消后立即中断请求体发送
             
         Returns:
             Dict: 包含上传结果的响应数据
@@ -111,47 +189,30 @@ class UploadAPI:
         if current_dir:
             params["curdir"] = current_dir
         
+        body = None
         try:
-            # 获取文件大小
-            file_size = os.path.getsize(file_path)
+            # 按块读取文件生成 multipart 请求体，发送过程中上报进度并检查取消
+            body = _MultipartFileStream(file_path, "file", progress_callback, cancel_token)
             
-            with open(file_path, 'rb') as file:
-                files = {'file': (os.path.basename(file_path), file, 'application/octet-stream')}
-                
-                upload_headers = {
-                    "Authorization": self.headers["Authorization"]
-                }
-                
-                # 创建自定义的进度监控器
-                class ProgressMonitor:
-                    def __init__(self, total_size, callback):
-                        self.total_size = total_size
-                        self.uploaded_size = 0
-                        self.callback = callback
-                    
-                    def update(self, chunk_size):
-                        self.uploaded_size += chunk_size
-                        if self.callback and self.total_size > 0:
-                            progress = int((self.uploaded_size / self.total_size) * 100)
-                            self.callback(progress)
-                
-                progress_monitor = ProgressMonitor(file_size, progress_callback)
-                
-                # 使用流式上传来监控进度
-                response = requests.post(
-                    url, 
-                    headers=upload_headers, 
-                    params=params, 
-                    files=files,
-                    stream=True
-                )
-                
-                return {
-                    "success": response.status_code == 200,
-                    "status_code": response.status_code,
-                    "data": response.json() if response.status_code == 200 else None,
-                    "error": response.text if response.status_code != 200 else None
-                }
+            upload_headers = {
+                "Authorization": self.headers["Authorization"],
+                "Content-Type": body.content_type
+            }
+            
+            response = self._session.post(
+                url, 
+                headers=upload_headers, 
+                params=params, 
+                data=body,
+                timeout=config.get_http_transfer_timeout()
+            )
+            
+            return {
+                "success": response.status_code == 200,
+                "status_code": response.status_code,
+                "data": response_json(response) if response.status_code == 200 else None,
+                "error": response.text if response.status_code != 200 else None
+            }
                 
         except FileNotFoundError:
             return {
@@ -160,20 +221,28 @@ class UploadAPI:
                 "data": None,
                 "error": f"文件不存在: {file_path}"
             }
-        except requests.exceptions.RequestException as e:
-            return {
-                "success": False,
-                "status_code": 0,
-                "data": None,
-                "error": str(e)
-            }
         except Exception as e:
+            if cancel_token is not None and cancel_token.is_cancelled:
+                return {
+                    "success": False,
+                    "cancelled": True,
+                    "status_code": 0,
+                    "data": None,
+                    "error": "上传已取消"
+                }
+            if isinstance(e, requests.exceptions.RequestException):
+                error = str(e)
+            else:
+                error = f"上传失败: {str(e)}"
             return {
                 "success": False,
                 "status_code": 0,
                 "data": None,
-                "error": f"上传失败: {str(e)}"
+                "error": error
             }
+        finally:
+            if body is not None:
+                body.close()
     
     def validate_file(self, file_path: str) -> Dict:
         """
@@ -0,0 +1,50 @@
+"""
+目录条目内存占用对比：FileAPI.transform_file_data 生成的字典列表 vs FileEntries
+
+用法：
+    python benchmarks/file_entries_memory.py [条目数 ...]
+"""
+import gc
+import sys
+import os
+import time
+import tracemalloc
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.file_api import FileAPI
+from api.file_entries import FileEntries
+from synthetic_listing import DIRECTORY, make_raw_files
+
+
+def measure(build):
+    """返回 (构建结果占用的字节数, 构建耗时秒数)；耗时在关闭 tracemalloc 时单独测量"""
+    gc.collect()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, elapsed
+
+
+def main(counts):
+    file_api = FileAPI()
+    print(f"{'条目数':>10} {'字典列表':>12} {'FileEntries':>12} {'节省':>8} {'字典耗时':>10} {'紧凑耗时':>10}")
+    for count in counts:
+        raw_files = make_raw_files(count)
+        dict_bytes, dict_time = measure(lambda: [file_api.transform_file_data(f) for f in raw_files])
+        compact_bytes, compact_time = measure(lambda: FileEntries.from_raw(raw_files, DIRECTORY))
+        saving = 1 - compact_bytes / dict_bytes if dict_bytes else 0
+        print(f"{count:>10} {dict_bytes / 1024 ** 2:>10.1f}MB {compact_bytes / 1024 ** 2:>10.1f}MB "
+              f"{saving:>7.0%} {dict_time:>9.2f}s {compact_time:>9.2f}s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
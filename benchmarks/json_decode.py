@@ -0,0 +1,91 @@
+"""
+JSON 解码后端对比：标准库 json / orjson / msgspec（含 FileRecord 结构体解码）
+
+负载取自 nas-server-api-login-filemanager.yaml 中 /api/file/files 与
+/api/file/typefiles 的响应示例，按条目数放大。
+
+用法：
+    python benchmarks/json_decode.py [条目数 ...]
+"""
+import json
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.file_entries import FileEntries
+from api.json_codec import JsonCodec, available_backends
+
+# /api/file/files 响应示例
+LISTING_EXAMPLES = [
+    {"Filename": "admin", "RelPath": "admin", "IsDir": True, "IsPublic": False,
+     "Size": 4096, "UpdatedAt": "2025-06-04T23:01:18.056Z"},
+    {"Filename": "child", "RelPath": "child", "IsDir": True, "IsPublic": False,
+     "Size": 4096, "UpdatedAt": "2025-06-04T23:01:18.064Z"},
+    {"Filename": "b.txt", "RelPath": "admin/文档/b.txt", "IsDir": False, "IsPublic": False,
+     "Size": 0, "UpdatedAt": "2025-06-04T23:03:16.080Z"},
+]
+
+# /api/file/typefiles 响应示例
+TYPEFILES_EXAMPLES = [
+    {"ID": 123, "CreatedAt": "2025-06-04T10:30:00Z", "UpdatedAt": "2025-06-04T10:30:00Z",
+     "Filename": "sunset.jpg", "RelPath": "admin/photos/sunset.jpg", "Owner": "admin",
+     "IsPublic": False, "Size": 2048567, "Type": "photo"},
+    {"ID": 124, "CreatedAt": "2025-06-04T11:15:00Z", "UpdatedAt": "2025-06-04T11:15:00Z",
+     "Filename": "landscape.png", "RelPath": "admin/photos/landscape.png", "Owner": "admin",
+     "IsPublic": False, "Size": 1024000, "Type": "photo"},
+]
+
+
+def make_payload(examples: list, count: int) -> bytes:
+    """按示例条目生成 count 条记录的响应体，文件名与路径逐条不同"""
+    files = []
+    for i in range(count):
+        item = dict(examples[i % len(examples)])
+        item["Filename"] = f"{i}_{item['Filename']}"
+        item["RelPath"] = f"{item['RelPath']}_{i}"
+        if "ID" in item:
+            item["ID"] = i
+        files.append(item)
+    return json.dumps({"files": files}, ensure_ascii=False).encode("utf-8")
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(counts):
+    codecs = {name: JsonCodec(name) for name in available_backends()}
+    print(f"可用后端: {', '.join(codecs)}")
+    for label, examples in (("files", LISTING_EXAMPLES), ("typefiles", TYPEFILES_EXAMPLES)):
+        for count in counts:
+            body = make_payload(examples, count)
+            print(f"\n/{label} {count} 条 ({len(body) / 1024 ** 2:.1f} MB)")
+            baseline = best_of(lambda: codecs["json"].loads_file_list(body))
+            for name, codec in codecs.items():
+                elapsed = best_of(lambda: codec.loads(body))
+                line = f"  {name:<8} 解码 {elapsed * 1000:8.1f} ms"
+                if name == "msgspec":
+                    typed = best_of(lambda: codec.loads_file_list(body))
+                    line += f" | FileRecord {typed * 1000:8.1f} ms"
+                if label == "files":
+                    end_to_end = best_of(
+                        lambda: FileEntries.from_raw(codec.loads_file_list(body)["files"], "admin")
+                    )
+                    line += f" | 解码+FileEntries {end_to_end * 1000:8.1f} ms"
+                print(line)
+            for name, codec in codecs.items():
+                if name != "json":
+                    speedup = baseline / best_of(lambda: codec.loads_file_list(body))
+                    print(f"  {name} 文件列表解码相对标准库: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
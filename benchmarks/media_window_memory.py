@@ -0,0 +1,89 @@
+"""
+分类页面稀疏窗口模型的内存上限验证：从头到尾滚动 N 张图片，
+对比不限制与按 TYPEFILES_MEMORY_MB 释放远处页面时模型的常驻数据量和进程 RSS
+（缩略图由 ThumbnailVM 的内存缓存单独限制，见 THUMBNAIL_CACHE_MB）；
+开始前先校验追加不满一块的页后每一行仍读到正确的条目
+
+用法：
+    python benchmarks/media_window_memory.py [图片数] [预算MB]
+"""
+import gc
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.file_entries import format_size
+from api.memory_usage import current_rss
+from viewmodels.paged_files_model import PagedFilesModel
+from viewmodels.typefiles_vm import TypeFilesViewModel
+
+PAGE_SIZE = 60  # 与 typefiles_vm.MAX_PAGE_SIZE 相同
+VISIBLE_ROWS = 40  # 每次"滚动"读取的行数
+
+
+def make_page(start: int, count: int) -> list:
+    return [TypeFilesViewModel.transform_file_data({
+        "ID": i, "Filename": f"IMG_{i:06d}.jpg", "RelPath": f"admin/photos/IMG_{i:06d}.jpg",
+        "Owner": "admin", "Size": 3_000_000 + i, "Type": "photo",
+        "CreatedAt": "2025-06-01T12:00:00Z", "UpdatedAt": "2025-06-01T12:00:00Z",
+    }) for i in range(start, start + count)]
+
+
+def scroll(count: int, budget_bytes):
+    """模拟滚动到底：追加页面、读取可见行；返回 (峰值常驻字节, 峰值 RSS)"""
+    model = PagedFilesModel()
+    model.set_block_size(30)
+    name_role = next(role for role, name in model._ROLES.items() if name == "name")
+    peak_resident = peak_rss = 0
+    for start in range(0, count, PAGE_SIZE):
+        model.append_files(make_page(start, min(PAGE_SIZE, count - start)), has_more=True)
+        for row in range(max(0, model.rowCount() - PAGE_SIZE), model.rowCount(), VISIBLE_ROWS):
+            for visible in range(row, min(row + VISIBLE_ROWS, model.rowCount())):
+                model.data(model.index(visible), name_role)
+            if budget_bytes is not None:
+                model.evict(budget_bytes)
+        peak_resident = max(peak_resident, model.resident_bytes())
+        peak_rss = max(peak_rss, current_rss() or 0)
+    print(f"  行数 {model.rowCount()}, 常驻 {model.resident_count()} 条, "
+          f"常驻数据 {format_size(model.resident_bytes())}")
+    del model
+    gc.collect()
+    return peak_resident, peak_rss
+
+
+def check_short_pages():
+    """按 15、15、30、7 条追加（块大小 30），释放后重新加载，逐行核对名称"""
+    model = PagedFilesModel()
+    model.set_block_size(30)
+    name_role = next(role for role, name in model._ROLES.items() if name == "name")
+    offset = 0
+    for size in (15, 15, 30, 15, 7):
+        model.append_files(make_page(offset, size), has_more=True)
+        offset += size
+    expected = [f"IMG_{i:06d}.jpg" for i in range(offset)]
+    actual = [model.data(model.index(row), name_role) for row in range(model.rowCount())]
+    assert actual == expected, "追加不满一块的页后行与块错位"
+    model._release_block(1)
+    model.fill_block(30, make_page(30, 30))
+    actual = [model.data(model.index(row), name_role) for row in range(model.rowCount())]
+    assert actual == expected, "重新加载的块与原内容不一致"
+    print(f"追加不满一块的页: {model.rowCount()} 行全部正确")
+
+
+def main(count: int, budget_mb: int):
+    check_short_pages()
+    baseline = current_rss() or 0
+    print(f"{count} 张图片，起始 RSS {format_size(baseline)}")
+    print(f"按 {budget_mb} MB 释放远处页面:")
+    resident, rss = scroll(count, budget_mb * 1024 * 1024)
+    print(f"  峰值常驻数据 {format_size(resident)}, 峰值 RSS {format_size(rss)}")
+    print("不限制:")
+    resident, rss = scroll(count, None)
+    print(f"  峰值常驻数据 {format_size(resident)}, 峰值 RSS {format_size(rss)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 8)
@@ -0,0 +1,60 @@
+"""
+文件名搜索索引基准：构建耗时与各类查询的延迟
+
+用法：
+    python benchmarks/search_index.py [路径数]
+"""
+import random
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.search_index import FilenameIndex
+
+CJK_WORDS = ("报告", "会议纪要", "合同", "发票", "照片", "旅行", "家庭", "项目", "设计稿", "预算",
+             "年度总结", "课件", "简历", "视频", "录音", "备份", "扫描件", "说明书", "方案", "草稿")
+ASCII_WORDS = ("IMG", "DSC", "report", "scan", "backup", "final", "draft", "v2", "export", "meeting")
+EXTENSIONS = ("jpg", "png", "mp4", "pdf", "docx", "xlsx", "mp3", "zip", "txt")
+QUERIES = ("报告", "会", "纪要", "年度总结", "img", "ds", "2023", "jpg", "设计稿 v2", "final 报告", "不存在的文件",
+           "1_", "_1", "-2", "._", "jpg mp4", "pdf zip", "报告 合同 发票")
+
+
+def make_paths(count: int, seed: int = 1) -> list:
+    """生成中英文混合的 (路径, 是否目录)"""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        directory = f"admin/{rng.choice(CJK_WORDS)}/{2015 + i % 10}/{rng.choice(CJK_WORDS)}_{i % 997}"
+        if i % 40 == 0:
+            paths.append((f"{directory}/{rng.choice(CJK_WORDS)}{i}", True))
+            continue
+        parts = [rng.choice(CJK_WORDS) if rng.random() < 0.7 else rng.choice(ASCII_WORDS) for _ in range(2)]
+        name = f"{'_'.join(parts)}_{i}.{rng.choice(EXTENSIONS)}"
+        paths.append((f"{directory}/{name}", False))
+    return paths
+
+
+def main(count: int):
+    paths = make_paths(count)
+    index = FilenameIndex()
+    start = time.perf_counter()
+    for offset in range(0, count, 10000):
+        index.add_many(paths[offset:offset + 10000])
+    print(f"{count} 条路径，构建 {time.perf_counter() - start:.1f} s，倒排项 {len(index._postings)}")
+
+    for query in QUERIES:
+        timings = []
+        for _ in range(20):
+            begin = time.perf_counter()
+            results = index.search(query, limit=500)
+            timings.append(time.perf_counter() - begin)
+        timings.sort()
+        print(f"  {query:<10} 结果 {len(results):4d}  中位 {timings[10] * 1000:6.2f} ms  "
+              f"最慢 {timings[-1] * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
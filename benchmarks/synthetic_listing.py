@@ -0,0 +1,22 @@
+"""基准测试使用的合成目录列表数据"""
+
+DIRECTORY = "admin/bench"
+EXTENSIONS = ("jpg", "png", "mp4", "mkv", "mp3", "flac", "pdf", "docx", "zip", "txt", "dat", "")
+
+
+def make_raw_files(count: int) -> list:
+    """生成与 /api/file/files 返回格式一致的条目"""
+    files = []
+    for i in range(count):
+        ext = EXTENSIONS[i % len(EXTENSIONS)]
+        is_dir = i % 50 == 0
+        name = f"folder_{i}" if is_dir else (f"file_{i}.{ext}" if ext else f"file_{i}")
+        files.append({
+            "Filename": name,
+            "RelPath": f"{DIRECTORY}/{name}",
+            "IsDir": is_dir,
+            "IsPublic": i % 7 == 0,
+            "Size": 0 if is_dir else (i * 7919) % (8 * 1024 ** 3),
+            "UpdatedAt": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}T{i % 24:02d}:{i % 60:02d}:18.056Z"
+        })
+    return files
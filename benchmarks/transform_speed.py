@@ -0,0 +1,97 @@
+"""
+目录列表转换速度对比
+
+- 原实现：逐条转换（每次调用重建类型映射、导入 datetime、循环除法）
+- transform_files：批量转换为字典列表，结果与原实现一致
+- FileEntries.from_raw：批量构建紧凑的列存储，显示字符串延迟格式化
+
+用法：
+    python benchmarks/transform_speed.py [条目数 ...]
+"""
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.file_entries import FileEntries, transform_files
+from synthetic_listing import DIRECTORY, make_raw_files
+
+
+def legacy_format_file_size(size_bytes):
+    if size_bytes == 0:
+        return "0 B"
+    size_names = ["B", "KB", "MB", "GB", "TB"]
+    i = 0
+    while size_bytes >= 1024 and i < len(size_names) - 1:
+        size_bytes /= 1024.0
+        i += 1
+    return f"{size_bytes:.1f} {size_names[i]}"
+
+
+def legacy_format_date(date_string):
+    try:
+        from datetime import datetime
+        dt = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+        return dt.strftime("%Y-%m-%d %H:%M")
+    except:
+        return date_string
+
+
+def legacy_get_file_type(filename, is_dir):
+    if is_dir:
+        return "文件夹"
+    ext = filename.lower().split('.')[-1] if '.' in filename else ""
+    type_mapping = {
+        "doc": "文档", "docx": "文档", "pdf": "文档", "txt": "文档",
+        "xls": "文档", "xlsx": "文档", "ppt": "文档", "pptx": "文档",
+        "jpg": "图片", "jpeg": "图片", "png": "图片", "gif": "图片",
+        "bmp": "图片", "svg": "图片", "webp": "图片",
+        "mp4": "视频", "avi": "视频", "mov": "视频", "wmv": "视频",
+        "flv": "视频", "mkv": "视频", "webm": "视频",
+        "mp3": "音频", "wav": "音频", "flac": "音频", "aac": "音频",
+        "ogg": "音频", "wma": "音频",
+        "zip": "压缩包", "rar": "压缩包", "7z": "压缩包", "tar": "压缩包",
+        "gz": "压缩包"
+    }
+    return type_mapping.get(ext, "其他")
+
+
+def legacy_transform(file_data):
+    return {
+        "name": file_data.get("Filename", ""),
+        "relPath": file_data.get("RelPath", ""),
+        "isDir": file_data.get("IsDir", False),
+        "isPublic": file_data.get("IsPublic", False),
+        "size": legacy_format_file_size(file_data.get("Size", 0)),
+        "sizeBytes": file_data.get("Size", 0),
+        "updatedAt": legacy_format_date(file_data.get("UpdatedAt", "")),
+        "rawUpdatedAt": file_data.get("UpdatedAt", ""),
+        "selected": False,
+        "type": legacy_get_file_type(file_data.get("Filename", ""), file_data.get("IsDir", False))
+    }
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(counts):
+    print(f"{'条目数':>10} {'原实现':>10} {'批量字典':>10} {'加速':>6} {'列存储':>10} {'加速':>6}")
+    for count in counts:
+        raw_files = make_raw_files(count)
+        legacy, legacy_time = timed(lambda: [legacy_transform(f) for f in raw_files])
+        batched, batched_time = timed(lambda: transform_files(raw_files))
+        if batched != legacy:
+            raise SystemExit("批量转换结果与原实现不一致")
+        del legacy, batched
+        _, entries_time = timed(lambda: FileEntries.from_raw(raw_files, DIRECTORY))
+        print(f"{count:>10} {legacy_time:>9.2f}s {batched_time:>9.2f}s {legacy_time / batched_time:>5.1f}x "
+              f"{entries_time:>9.2f}s {legacy_time / entries_time:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
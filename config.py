@@ -3,6 +3,17 @@ from pathlib import Path
 
 class Config:
     """应用程序配置类"""
+
+    # 可通过环境变量或 .env 调整的性能相关配置项
+    _TUNABLE_KEYS = (
+        "HTTP_POOL_SIZE", "HTTP_KEEP_ALIVE", "HTTP_CONNECT_TIMEOUT", "HTTP_READ_TIMEOUT",
+        "WORKER_THREADS", "LISTING_CACHE_TTL", "LISTING_CACHE_SIZE", "LISTING_STREAM_BATCH",
+        "JSON_BACKEND", "CACHE_DIR", "METADATA_CACHE_MB",
+        "CRAWL_ENABLED", "CRAWL_CONCURRENCY", "CRAWL_RATE", "CRAWL_MAX_AGE",
+        "DUPLICATE_WORKERS", "TYPEFILES_CACHE_TTL", "TYPEFILES_CACHE_ROWS",
+        "TYPEFILES_MEMORY_MB", "THUMBNAIL_CACHE_MB", "THUMBNAIL_DISK_CACHE_MB",
+        "THUMBNAIL_WORKERS", "LOCAL_THUMBNAILS", "LOCAL_THUMBNAIL_WORKERS",
+    )
     
     def __init__(self):
         self._load_config()
@@ -13,6 +24,30 @@ class Config:
         self.file_base_path = ""
         self.api_base_url = ""
         self.ffmpeg_path = ""           # 新增默认值
+        self.http_pool_size = 10        # 每个主机的最大连接数
+        self.http_keep_alive = True     # 是否复用 TCP 连接
+        self.http_connect_timeout = 5.0  # 建立连接超时(秒)
+        self.http_read_timeout = 30.0   # 读取响应超时(秒)
+        self.worker_threads = 4         # 后台任务线程数
+        self.listing_cache_ttl = 30.0   # 目录列表缓存免验证时间(秒)
+        self.listing_cache_size = 64    # 目录列表缓存的最大目录数
+        self.listing_stream_batch = 500  # 流式加载目录时每批条目数，0 表示不流式加载
+        self.json_backend = "auto"      # JSON 解码后端: auto / msgspec / orjson / json
+        self.cache_dir = ""             # 本地缓存目录，为空时使用 $XDG_CACHE_HOME/nas_qt
+        self.metadata_cache_mb = 64     # 本地元数据缓存上限(MB)，0 表示不使用
+        self.crawl_enabled = False      # 登录后是否在后台遍历整个目录树
+        self.crawl_concurrency = 2      # 后台遍历同时进行的请求数
+        self.crawl_rate = 4.0           # 后台遍历每秒最多发出的请求数，0 表示不限制
+        self.crawl_max_age = 3600.0     # 后台遍历时目录列表的有效期(秒)，过期才重新请求
+        self.duplicate_workers = 4      # 查找重复文件时同时读取的文件数
+        self.typefiles_cache_ttl = 60.0  # 分类文件列表免验证时间(秒)
+        self.typefiles_cache_rows = 4000  # 所有分类合计保留的最多条目数
+        self.typefiles_memory_mb = 16   # 每个分类列表常驻内存的条目上限(MB)
+        self.thumbnail_cache_mb = 32    # 缩略图内存缓存上限(MB)
+        self.thumbnail_disk_cache_mb = 512  # 缩略图磁盘缓存上限(MB)，0 表示不使用
+        self.thumbnail_workers = 4      # 同时加载的缩略图数
+        self.local_thumbnails = True    # FILE_BASE_PATH 在本机可读时是否直接从本地文件生成图片缩略图
+        self.local_thumbnail_workers = 0  # 本地生成缩略图的进程数，0 表示与 CPU 核数相同
         
         # 尝试从环境变量加载
         env_file_path = os.getenv("FILE_BASE_PATH")
@@ -26,6 +61,11 @@ class Config:
         env_ffmpeg_path = os.getenv("FFMPEG_PATH")
         if env_ffmpeg_path:
             self.ffmpeg_path = env_ffmpeg_path
+
+        for key in self._TUNABLE_KEYS:
+            env_value = os.getenv(key)
+            if env_value:
+                self._set_option(key, env_value)
         
         # 尝试从 .env 文件加载
         env_file = Path(".env")
@@ -45,9 +85,65 @@ class Config:
                                 self.api_base_url = value
                             elif key == "FFMPEG_PATH":        
                                 self.ffmpeg_path = value
+                            elif key in self._TUNABLE_KEYS:
+                                self._set_option(key, value)
             except Exception as e:
                 print(f"读取.env文件失败: {e}")
     
+    def _set_option(self, key: str, value: str):
+        """解析连接池、线程池等可调配置项"""
+        try:
+            if key == "HTTP_POOL_SIZE":
+                self.http_pool_size = max(1, int(value))
+            elif key == "HTTP_KEEP_ALIVE":
+                self.http_keep_alive = value.lower() not in ("0", "false", "no", "off")
+            elif key == "HTTP_CONNECT_TIMEOUT":
+                self.http_connect_timeout = float(value)
+            elif key == "HTTP_READ_TIMEOUT":
+                self.http_read_timeout = float(value)
+            elif key == "WORKER_THREADS":
+                self.worker_threads = max(1, int(value))
+            elif key == "LISTING_CACHE_TTL":
+                self.listing_cache_ttl = max(0.0, float(value))
+            elif key == "LISTING_CACHE_SIZE":
+                self.listing_cache_size = max(1, int(value))
+            elif key == "LISTING_STREAM_BATCH":
+                self.listing_stream_batch = max(0, int(value))
+            elif key == "JSON_BACKEND":
+                self.json_backend = value.lower()
+            elif key == "CACHE_DIR":
+                self.cache_dir = os.path.expanduser(value)
+            elif key == "METADATA_CACHE_MB":
+                self.metadata_cache_mb = max(0.0, float(value))
+            elif key == "CRAWL_ENABLED":
+                self.crawl_enabled = value.lower() in ("1", "true", "yes", "on")
+            elif key == "CRAWL_CONCURRENCY":
+                self.crawl_concurrency = max(1, int(value))
+            elif key == "CRAWL_RATE":
+                self.crawl_rate = max(0.0, float(value))
+            elif key == "CRAWL_MAX_AGE":
+                self.crawl_max_age = max(0.0, float(value))
+            elif key == "DUPLICATE_WORKERS":
+                self.duplicate_workers = max(1, int(value))
+            elif key == "TYPEFILES_CACHE_TTL":
+                self.typefiles_cache_ttl = max(0.0, float(value))
+            elif key == "TYPEFILES_CACHE_ROWS":
+                self.typefiles_cache_rows = max(0, int(value))
+            elif key == "TYPEFILES_MEMORY_MB":
+                self.typefiles_memory_mb = max(1, int(value))
+            elif key == "THUMBNAIL_CACHE_MB":
+                self.thumbnail_cache_mb = max(0, int(value))
+            elif key == "THUMBNAIL_DISK_CACHE_MB":
+                self.thumbnail_disk_cache_mb = max(0, int(value))
+            elif key == "THUMBNAIL_WORKERS":
+                self.thumbnail_workers = max(1, int(value))
+            elif key == "LOCAL_THUMBNAILS":
+                self.local_thumbnails = value.lower() not in ("0", "false", "no", "off")
+            elif key == "LOCAL_THUMBNAIL_WORKERS":
+                self.local_thumbnail_workers = max(0, int(value))
+        except ValueError:
+            print(f"无效的配置项 {key}={value}")
+    
     def get_full_file_path(self, relative_path: str) -> str:
         """
         获取完整的文件路径
@@ -78,6 +174,105 @@ class Config:
     def set_ffmpeg_path(self, path: str):
         """设置 ffmpeg 路径"""
         self.ffmpeg_path = path
+    
+    def get_http_pool_size(self) -> int:
+        """获取每个主机的 HTTP 连接池大小"""
+        return self.http_pool_size
+    
+    def get_http_keep_alive(self) -> bool:
+        """是否启用 HTTP keep-alive"""
+        return self.http_keep_alive
+    
+    def get_http_timeout(self) -> tuple:
+        """获取默认的 (连接超时, 读取超时)"""
+        return (self.http_connect_timeout, self.http_read_timeout)
+    
+    def get_http_transfer_timeout(self) -> tuple:
+        """获取上传、下载整个文件时的 (连接超时, 读取超时)：不限制读取时间，大文件的最终写入可能很慢"""
+        return (self.http_connect_timeout, None)
+    
+    def get_worker_threads(self) -> int:
+        """获取后台任务线程池大小"""
+        return self.worker_threads
+    
+    def get_listing_cache_ttl(self) -> float:
+        """获取目录列表缓存免验证时间（秒）"""
+        return self.listing_cache_ttl
+    
+    def get_listing_cache_size(self) -> int:
+        """获取目录列表缓存的最大目录数"""
+        return self.listing_cache_size
+    
+    def get_listing_stream_batch(self) -> int:
+        """获取流式加载目录时的每批条目数（0 表示不流式加载）"""
+        return self.listing_stream_batch
+    
+    def get_json_backend(self) -> str:
+        """获取 JSON 解码后端名称"""
+        return self.json_backend
+    
+    def get_cache_dir(self) -> str:
+        """获取本地缓存目录（默认遵循 XDG 规范）"""
+        if self.cache_dir:
+            return self.cache_dir
+        base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base, "nas_qt")
+    
+    def get_metadata_cache_bytes(self) -> int:
+        """获取本地元数据缓存的大小上限（字节，0 表示不使用）"""
+        return int(self.metadata_cache_mb * 1024 * 1024)
+    
+    def is_crawl_enabled(self) -> bool:
+        """登录后是否自动开始后台遍历"""
+        return self.crawl_enabled
+    
+    def get_crawl_concurrency(self) -> int:
+        """获取后台遍历同时进行的请求数"""
+        return self.crawl_concurrency
+    
+    def get_crawl_rate(self) -> float:
+        """获取后台遍历每秒最多发出的请求数（0 表示不限制）"""
+        return self.crawl_rate
+    
+    def get_crawl_max_age(self) -> float:
+        """获取后台遍历时目录列表的有效期（秒）"""
+        return self.crawl_max_age
+    
+    def get_duplicate_workers(self) -> int:
+        """获取查找重复文件时同时读取的文件数"""
+        return self.duplicate_workers
+    
+    def get_typefiles_cache_ttl(self) -> float:
+        """获取分类文件列表的免验证时间（秒）"""
+        return self.typefiles_cache_ttl
+    
+    def get_typefiles_cache_rows(self) -> int:
+        """获取所有分类合计保留的最多条目数"""
+        return self.typefiles_cache_rows
+    
+    def get_typefiles_memory_mb(self) -> int:
+        """获取每个分类列表常驻内存的条目上限（MB）"""
+        return self.typefiles_memory_mb
+    
+    def get_thumbnail_cache_mb(self) -> int:
+        """获取缩略图内存缓存上限（MB）"""
+        return self.thumbnail_cache_mb
+    
+    def get_thumbnail_disk_cache_mb(self) -> int:
+        """获取缩略图磁盘缓存上限（MB，0 表示不使用）"""
+        return self.thumbnail_disk_cache_mb
+    
+    def get_thumbnail_workers(self) -> int:
+        """获取同时加载的缩略图数"""
+        return self.thumbnail_workers
+    
+    def get_local_thumbnails(self) -> bool:
+        """获取是否从本地文件生成图片缩略图"""
+        return self.local_thumbnails
+    
+    def get_local_thumbnail_workers(self) -> int:
+        """获取本地生成缩略图的进程数（0 表示与 CPU 核数相同）"""
+        return self.local_thumbnail_workers
 
 # 全局配置实例
 config = Config()
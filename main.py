@@ -8,10 +8,17 @@ from viewmodels.file_vm import FileViewModel
 from viewmodels.usb_monitor import USBMonitor
 from viewmodels.download_vm import DownloadViewModel
 from viewmodels.typefiles_vm import TypeFilesViewModel
-from viewmodels.thumbnail_vm import ThumbnailVM
+from viewmodels.thumbnail_vm import ThumbnailVM, THUMBNAIL_PROVIDER
+from viewmodels.thumbnail_provider import ThumbnailImageProvider
 from viewmodels.copy_vm import CopyViewModel
 from viewmodels.delete_vm import DeleteViewModel
 from viewmodels.dlna2_vm import Dlna2ViewModel
+from viewmodels.dir_tree_vm import DirTreeViewModel
+from viewmodels.search_vm import SearchViewModel
+from viewmodels.crawler_vm import CrawlerViewModel
+from viewmodels.disk_usage_vm import DiskUsageViewModel
+from viewmodels.duplicates_vm import DuplicatesViewModel
+from viewmodels.task_executor import get_executor
 
 
 if __name__ == "__main__":
@@ -38,9 +45,43 @@ if __name__ == "__main__":
     download_vm = DownloadViewModel() 
     typefiles_vm = TypeFilesViewModel()
     thumbnail_vm = ThumbnailVM()
-    copy_vm = CopyViewModel()
+    dir_tree_vm = DirTreeViewModel()
+    copy_vm = CopyViewModel(dir_tree_vm.tree)
     delete_vm = DeleteViewModel()
     dlna2_vm = Dlna2ViewModel()
+    search_vm = SearchViewModel()
+    crawler_vm = CrawlerViewModel()
+    disk_usage_vm = DiskUsageViewModel()
+    duplicates_vm = DuplicatesViewModel(crawler_vm.snapshot)
+
+    # 文件夹的新建、复制、移动、删除成功后直接修补目录树
+    file_vm.folderCreated.connect(dir_tree_vm.add_folder)
+    copy_vm.filesTransferred.connect(dir_tree_vm.transfer_paths)
+    delete_vm.filesDeleted.connect(dir_tree_vm.remove_paths)
+
+    # 删除、复制、移动后使相关目录的列表缓存失效
+    copy_vm.filesTransferred.connect(file_vm.transfer_paths)
+    delete_vm.filesDeleted.connect(file_vm.remove_paths)
+
+    # 删除、移动后更新搜索索引；打开搜索结果时跳转到对应目录
+    delete_vm.filesDeleted.connect(search_vm.remove_paths)
+    copy_vm.filesTransferred.connect(search_vm.transfer_paths)
+    search_vm.directoryRequested.connect(file_vm.navigate_to)
+
+    # 遍历或加载目录后刷新空间占用；删除、移动后移除对应的文件夹
+    crawler_vm.progressChanged.connect(disk_usage_vm.schedule_refresh)
+    file_vm.listingIndexed.connect(disk_usage_vm.schedule_refresh)
+    delete_vm.filesDeleted.connect(disk_usage_vm.remove_paths)
+    copy_vm.filesTransferred.connect(disk_usage_vm.transfer_paths)
+
+    # 重复文件交给删除ViewModel确认并删除，删除成功后从结果中移除
+    duplicates_vm.deleteRequested.connect(delete_vm.set_selected_files)
+    duplicates_vm.deleteRequested.connect(delete_vm.delete_selected_files)
+    delete_vm.filesDeleted.connect(duplicates_vm.remove_paths)
+
+    # 缩略图通过 image://thumb/ 直接以解码后的 QImage 提供给 QML
+    thumbnail_provider = ThumbnailImageProvider(thumbnail_vm)
+    engine.addImageProvider(THUMBNAIL_PROVIDER, thumbnail_provider)
 
     engine.rootContext().setContextProperty("loginVM", login_vm)
     engine.rootContext().setContextProperty("themeManager", theme_manager)
@@ -52,6 +93,17 @@ if __name__ == "__main__":
     engine.rootContext().setContextProperty("copyVM", copy_vm)
     engine.rootContext().setContextProperty("deleteVM", delete_vm)
     engine.rootContext().setContextProperty("dlna2VM", dlna2_vm)
+    engine.rootContext().setContextProperty("dirTreeVM", dir_tree_vm)
+    engine.rootContext().setContextProperty("searchVM", search_vm)
+    engine.rootContext().setContextProperty("crawlerVM", crawler_vm)
+    engine.rootContext().setContextProperty("diskUsageVM", disk_usage_vm)
+    engine.rootContext().setContextProperty("duplicatesVM", duplicates_vm)
+
+    # 退出时取消后台任务（下载、上传等）并等待工作线程结束
+    app.aboutToQuit.connect(crawler_vm.shutdown)
+    app.aboutToQuit.connect(duplicates_vm.shutdown)
+    app.aboutToQuit.connect(thumbnail_vm.shutdown)
+    app.aboutToQuit.connect(get_executor().shutdown)
 
     # 加载主窗口
     engine.load("ui/MainWindow.qml")
@@ -22,7 +22,7 @@ Item {
         }
     }
 
-    // 当前页面类型：0=文件列表, 1=视频, 2=图片, 3=文档, 4=音频
+    // 当前页面类型：0=文件列表, 1=视频, 2=图片, 3=文档, 4=音频, 5=重复文件, 6=空间占用
     property int currentPageType: 0
 
     // 处理文件打开信号
@@ -96,6 +96,44 @@ Item {
         }
     }
 
+    // 删除需要用户确认：deleteVM 发出 confirmationRequested 后弹出确认对话框
+    Connections {
+        target: deleteVM
+
+        function onConfirmationRequested(fileNames) {
+            showDeleteConfirmDialog(fileNames)
+        }
+
+        function onDeleteFinished(success, message) {
+            if (success) {
+                showMessage("删除成功", message, "success")
+            } else {
+                showMessage("删除失败", message, "error")
+            }
+        }
+    }
+
+    // 显示删除确认对话框，确认后调用 deleteVM.confirm_delete
+    function showDeleteConfirmDialog(fileNames) {
+        var dialogComponent = Qt.createComponent("components/DeleteConfirmDialog.qml")
+        if (dialogComponent.status === Component.Ready) {
+            var dialog = dialogComponent.createObject(mainPage, {
+                "fileNames": fileNames
+            })
+            dialog.confirmed.connect(function() {
+                deleteVM.confirm_delete()
+                dialog.destroy()
+            })
+            dialog.dialogCancelled.connect(function() {
+                deleteVM.cancel_delete()
+                dialog.destroy()
+            })
+            dialog.open()
+        } else {
+            console.log("删除确认对话框创建失败:", dialogComponent.errorString())
+        }
+    }
+
     // 消息提示组件
     function showMessage(title, message, type) {
         // 创建消息提示
@@ -170,6 +208,9 @@ Item {
             case 4: // 音频
                 typefilesVM.fetchTypeFiles("audio", 1, 30)
                 break
+            case 6: // 空间占用
+                diskUsageVM.refresh()
+                break
         }
     }
 
@@ -233,6 +274,8 @@ Item {
                         case 2: return "pages/PhotoPage.qml"
                         case 3: return "pages/DocumentPage.qml"
                         case 4: return "pages/AudioPage.qml"
+                        case 5: return "pages/DuplicatesPage.qml"
+                        case 6: return "pages/DiskUsagePage.qml"
                         default: return "components/FileListArea.qml"
                     }
                 }
@@ -30,6 +30,9 @@ ApplicationWindow {
             onItemChanged: {
                 if (item && item.loginSuccess) {
                     item.loginSuccess.connect(function() {
+                        // 切换用户时先清空搜索索引
+                        searchVM.set_username(loginVM.get_username())
+
                         // 设置 token 和用户名
                         fileVM.set_token(loginVM.get_token())
                         fileVM.set_username(loginVM.get_username())
@@ -42,9 +45,11 @@ ApplicationWindow {
                         
                         // 为类型文件ViewModel设置token
                         typefilesVM.set_token(loginVM.get_token())
+                        typefilesVM.set_username(loginVM.get_username())
                         
                         // 为缩略图ViewModel设置token
                         thumbnailVM.set_token(loginVM.get_token())
+                        thumbnailVM.set_username(loginVM.get_username())
                         
                         // 为复制ViewModel设置token
                         copyVM.set_token(loginVM.get_token())
@@ -54,6 +59,21 @@ ApplicationWindow {
 
                         // 为DLNA2ViewModel设置token
                         dlna2VM.set_token(loginVM.get_token())
+
+                        // 为目录树ViewModel设置token并加载目录树
+                        dirTreeVM.set_token(loginVM.get_token())
+                        dirTreeVM.set_username(loginVM.get_username())
+                        dirTreeVM.load_tree()
+
+                        // 为后台遍历ViewModel设置token（CRAWL_ENABLED 时开始遍历）
+                        diskUsageVM.set_username(loginVM.get_username())
+                        crawlerVM.set_token(loginVM.get_token())
+                        crawlerVM.set_username(loginVM.get_username())
+                        crawlerVM.start_if_enabled()
+
+                        // 为重复文件ViewModel设置token
+                        duplicatesVM.set_token(loginVM.get_token())
+                        duplicatesVM.set_username(loginVM.get_username())
                         
                         // 加载文件列表（使用用户名作为目录）
                         fileVM.load_file_list("")
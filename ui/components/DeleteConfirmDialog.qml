@@ -0,0 +1,100 @@
+import QtQuick 6.5
+import QtQuick.Controls 2.15
+import QtQuick.Layouts 1.15
+
+// 删除确认对话框（响应 deleteVM.confirmationRequested）
+Dialog {
+    id: deleteConfirmDialog
+    modal: true
+    anchors.centerIn: parent
+    width: 380
+    height: 320
+    z: 1000
+
+    property var fileNames: []
+    signal confirmed()
+    signal dialogCancelled()
+
+    // 点击遮罩或按 Esc 关闭时也视为取消
+    onRejected: dialogCancelled()
+
+    background: Rectangle {
+        radius: 8
+        color: themeManager.surfaceColor
+        border.color: themeManager.dividerColor
+        border.width: 1
+    }
+
+    ColumnLayout {
+        anchors.fill: parent
+        anchors.margins: 16
+        spacing: 12
+
+        // 标题和图标
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 8
+
+            Text {
+                text: "⚠️"
+                font.pixelSize: 20
+            }
+
+            Text {
+                text: "确认删除 " + deleteConfirmDialog.fileNames.length + " 个文件？"
+                font.pixelSize: 16
+                font.weight: Font.Bold
+                color: themeManager.textPrimaryColor
+                Layout.fillWidth: true
+            }
+        }
+
+        Text {
+            text: "删除后无法恢复。"
+            font.pixelSize: 13
+            color: themeManager.textSecondaryColor
+        }
+
+        // 待删除的文件名
+        ListView {
+            id: nameList
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            clip: true
+            model: deleteConfirmDialog.fileNames
+
+            delegate: Text {
+                width: nameList.width
+                text: modelData
+                font.pixelSize: 13
+                color: themeManager.textPrimaryColor
+                elide: Text.ElideMiddle
+            }
+
+            ScrollBar.vertical: ScrollBar {}
+        }
+
+        // 按钮
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 12
+
+            Button {
+                text: "取消"
+                Layout.fillWidth: true
+                Layout.preferredHeight: 36
+                onClicked: deleteConfirmDialog.reject()
+            }
+
+            Button {
+                text: "删除"
+                Layout.fillWidth: true
+                Layout.preferredHeight: 36
+                onClicked: {
+                    deleteConfirmDialog.confirmed()
+                    deleteConfirmDialog.close()
+                }
+            }
+        }
+    }
+}
@@ -0,0 +1,189 @@
+import QtQuick 6.5
+import QtQuick.Controls 2.15
+import QtQuick.Layouts 1.15
+
+// 服务器上的文件夹选择对话框（复制/移动的目标目录）
+// 面包屑、子文件夹列表和路径补全都直接查询 dirTreeVM 的本地目录树，不逐级请求服务器
+Dialog {
+    id: directoryPicker
+    modal: true
+    width: 480
+    height: 460
+    z: 1000
+
+    // 居中定位
+    anchors.centerIn: parent
+
+    property string title: "选择目标文件夹"
+    property string currentPath: ""
+    property var crumbs: []        // [{path, title}]
+    property var folders: []       // [{path, title, hasChildren}]
+    property var completions: []   // 输入路径时的补全候选
+    signal directoryChosen(string path)
+    signal dialogCancelled()
+
+    function refresh() {
+        crumbs = dirTreeVM.breadcrumbs(currentPath)
+        folders = dirTreeVM.children(currentPath)
+    }
+
+    onCurrentPathChanged: {
+        refresh()
+        if (pathInput.text !== currentPath) {
+            pathInput.text = currentPath
+        }
+    }
+
+    Component.onCompleted: refresh()
+
+    // 目录树加载完成或被修补后重新查询
+    Connections {
+        target: dirTreeVM
+        function onTreeChanged() {
+            directoryPicker.refresh()
+        }
+    }
+
+    background: Rectangle {
+        radius: 12
+        color: themeManager.surfaceColor || "#FFFFFF"
+        border.color: themeManager.dividerColor || "#BDBDBD"
+        border.width: 1
+    }
+
+    ColumnLayout {
+        anchors.fill: parent
+        anchors.margins: 16
+        spacing: 12
+
+        // 标题
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 8
+
+            Text {
+                text: "📁"
+                font.pixelSize: 20
+            }
+
+            Text {
+                text: directoryPicker.title
+                font.pixelSize: 18
+                font.weight: Font.Bold
+                color: themeManager.textPrimaryColor || "#212121"
+                Layout.fillWidth: true
+            }
+        }
+
+        // 面包屑：点击跳到对应的上级文件夹
+        Flow {
+            Layout.fillWidth: true
+            spacing: 2
+
+            Button {
+                text: "主页"
+                flat: true
+                font.pixelSize: 12
+                onClicked: directoryPicker.currentPath = ""
+            }
+
+            Repeater {
+                model: directoryPicker.crumbs
+                delegate: Button {
+                    text: "› " + modelData.title
+                    flat: true
+                    font.pixelSize: 12
+                    onClicked: directoryPicker.currentPath = modelData.path
+                }
+            }
+        }
+
+        // 路径输入：输入时列出补全候选，Tab 补全第一个候选，回车跳转
+        TextField {
+            id: pathInput
+            Layout.fillWidth: true
+            placeholderText: "输入路径，如 admin/photos"
+            font.pixelSize: 13
+            selectByMouse: true
+
+            onTextEdited: {
+                directoryPicker.completions = text !== "" ? dirTreeVM.complete(text) : []
+            }
+
+            Keys.onTabPressed: {
+                if (directoryPicker.completions.length > 0) {
+                    text = directoryPicker.completions[0] + "/"
+                    directoryPicker.completions = dirTreeVM.complete(text)
+                }
+            }
+
+            onAccepted: {
+                var path = text.replace(/\/+$/, "")
+                if (path === "" || dirTreeVM.contains(path)) {
+                    directoryPicker.completions = []
+                    directoryPicker.currentPath = path
+                }
+            }
+        }
+
+        // 子文件夹列表（输入路径时显示补全候选）
+        ListView {
+            id: folderList
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            clip: true
+            model: directoryPicker.completions.length > 0 ? directoryPicker.completions : directoryPicker.folders
+
+            delegate: ItemDelegate {
+                width: folderList.width
+                font.pixelSize: 13
+                text: typeof modelData === "string"
+                    ? modelData
+                    : "📁 " + modelData.title + (modelData.hasChildren ? "  ›" : "")
+                onClicked: {
+                    directoryPicker.completions = []
+                    directoryPicker.currentPath = typeof modelData === "string" ? modelData : modelData.path
+                }
+            }
+
+            ScrollBar.vertical: ScrollBar {}
+        }
+
+        // 目录树加载状态
+        Text {
+            Layout.fillWidth: true
+            text: dirTreeVM.is_loading ? "正在加载目录树…" : dirTreeVM.error_message
+            visible: text !== ""
+            font.pixelSize: 12
+            color: dirTreeVM.error_message !== "" ? "#FF4444" : (themeManager.textSecondaryColor || "#757575")
+            wrapMode: Text.WordWrap
+        }
+
+        // 按钮
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 12
+
+            Button {
+                text: "取消"
+                Layout.fillWidth: true
+                Layout.preferredHeight: 36
+                onClicked: {
+                    directoryPicker.dialogCancelled()
+                    directoryPicker.close()
+                }
+            }
+
+            Button {
+                text: directoryPicker.currentPath !== "" ? "选择 " + directoryPicker.currentPath : "选择"
+                Layout.fillWidth: true
+                Layout.preferredHeight: 36
+                enabled: directoryPicker.currentPath !== ""
+                onClicked: {
+                    directoryPicker.directoryChosen(directoryPicker.currentPath)
+                    directoryPicker.close()
+                }
+            }
+        }
+    }
+}
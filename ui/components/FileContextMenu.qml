@@ -4,6 +4,7 @@ import QtQuick.Controls 2.15
 Menu {
     id: fileContextMenu
     property int contextIndex: -1
+    signal transferRequested(string operation, int index)  // 复制 (copy) 或移动 (move)，由 FileListArea 选择目标文件夹
     
     MenuItem {
         text: "打开"
@@ -17,16 +18,18 @@ Menu {
     MenuItem {
         text: "复制"
         onTriggered: {
-            // TODO: 实现复制功能
-            console.log("复制文件:", fileContextMenu.contextIndex)
+            if (fileContextMenu.contextIndex >= 0) {
+                fileContextMenu.transferRequested("copy", fileContextMenu.contextIndex)
+            }
         }
     }
 
     MenuItem {
         text: "移动"
         onTriggered: {
-            // TODO: 实现移动功能
-            console.log("移动文件:", fileContextMenu.contextIndex)
+            if (fileContextMenu.contextIndex >= 0) {
+                fileContextMenu.transferRequested("move", fileContextMenu.contextIndex)
+            }
         }
     }
     
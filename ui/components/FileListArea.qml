@@ -9,6 +9,72 @@ Rectangle {
     // 引用右键菜单组件
     FileContextMenu {
         id: contextMenu
+        onTransferRequested: function(operation, index) {
+            fileListArea.pickTransferTarget(operation, fileVM.context_files(index))
+        }
+    }
+
+    // 复制/移动：在目录树中选择目标文件夹后交给 copyVM
+    function pickTransferTarget(operation, files) {
+        if (!files || files.length === 0) {
+            return
+        }
+        var pickerComponent = Qt.createComponent("DirectoryPicker.qml")
+        if (pickerComponent.status !== Component.Ready) {
+            console.log("目标文件夹对话框创建失败:", pickerComponent.errorString())
+            return
+        }
+        var picker = pickerComponent.createObject(fileListArea, {
+            "title": (operation === "move" ? "移动 " : "复制 ") + files.length + " 项到",
+            "currentPath": fileVM.current_directory
+        })
+        picker.directoryChosen.connect(function(path) {
+            copyVM.set_selected_files(files)
+            if (operation === "move") {
+                copyVM.move_files(path)
+            } else {
+                copyVM.copy_files(path)
+            }
+        })
+        picker.closed.connect(function() {
+            picker.destroy()
+        })
+        picker.open()
+    }
+
+    Connections {
+        target: copyVM
+        function onTargetPickerRequested() {
+            var pickerComponent = Qt.createComponent("DirectoryPicker.qml")
+            if (pickerComponent.status !== Component.Ready) {
+                return
+            }
+            var picker = pickerComponent.createObject(fileListArea, {
+                "currentPath": copyVM.target_directory
+            })
+            picker.directoryChosen.connect(function(path) {
+                copyVM.set_target_directory(path)
+            })
+            picker.closed.connect(function() {
+                picker.destroy()
+            })
+            picker.open()
+        }
+        function onCopyFinished(success, message) {
+            if (success) {
+                fileVM.refresh_file_list()
+                return
+            }
+            var messageComponent = Qt.createComponent("MessageDialog.qml")
+            if (messageComponent.status === Component.Ready) {
+                var messageDialog = messageComponent.createObject(fileListArea, {
+                    "title": "操作失败",
+                    "message": message,
+                    "type": "error"
+                })
+                messageDialog.open()
+            }
+        }
     }
 
     ColumnLayout {
@@ -139,7 +205,7 @@ Rectangle {
             Rectangle {
                 anchors.fill: parent
                 color: themeManager.backgroundColor
-                visible: fileVM.file_list.length === 0
+                visible: fileListView.count === 0
 
                 ColumnLayout {
                     anchors.centerIn: parent
@@ -183,17 +249,17 @@ Rectangle {
             ListView {
                 id: fileListView
                 anchors.fill: parent
-                model: fileVM.file_list
+                model: fileVM.file_model
                 spacing: 1
-                visible: fileVM.file_list.length > 0
+                visible: count > 0
 
                 delegate: Rectangle {
                     width: fileListView.width
                     height: 50
                     color: mouseArea.containsMouse ? themeManager.hoverColor : 
-                           (modelData.selected ? themeManager.primaryColor + "20" : themeManager.surfaceColor)
-                    border.color: modelData.selected ? themeManager.primaryColor : "transparent"
-                    border.width: modelData.selected ? 2 : 0
+                           (model.selected ? themeManager.primaryColor + "20" : themeManager.surfaceColor)
+                    border.color: model.selected ? themeManager.primaryColor : "transparent"
+                    border.width: model.selected ? 2 : 0
 
                     RowLayout {
                         anchors.fill: parent
@@ -204,11 +270,11 @@ Rectangle {
                         CheckBox {
                             Layout.preferredWidth: 24
                             Layout.preferredHeight: 24
-                            checked: modelData.selected
+                            checked: model.selected
                             
                             onCheckedChanged: {
                                 // 只有当复选框状态与文件选择状态不一致时才调用
-                                if (checked !== modelData.selected) {
+                                if (checked !== model.selected) {
                                     fileVM.toggle_file_selection(index, checked)
                                 }
                             }
@@ -216,7 +282,7 @@ Rectangle {
 
                         // 文件图标
                         Text {
-                            text: getFileTypeIcon(modelData.type)
+                            text: getFileTypeIcon(model.type)
                             font.pixelSize: 18
                             color: themeManager.textSecondaryColor
                             Layout.preferredWidth: 24
@@ -227,7 +293,7 @@ Rectangle {
 
                         // 文件名
                         Text {
-                            text: modelData.name
+                            text: model.name
                             font.pixelSize: 14
                             color: themeManager.textPrimaryColor
                             Layout.preferredWidth: 200
@@ -236,7 +302,7 @@ Rectangle {
 
                         // 文件类型
                         Text {
-                            text: modelData.type
+                            text: model.type
                             font.pixelSize: 12
                             color: themeManager.textSecondaryColor
                             Layout.preferredWidth: 80
@@ -244,7 +310,7 @@ Rectangle {
 
                         // 文件大小
                         Text {
-                            text: modelData.size
+                            text: model.size
                             font.pixelSize: 12
                             color: themeManager.textSecondaryColor
                             Layout.preferredWidth: 80
@@ -252,7 +318,7 @@ Rectangle {
 
                         // 修改日期
                         Text {
-                            text: modelData.updatedAt
+                            text: model.updatedAt
                             font.pixelSize: 12
                             color: themeManager.textSecondaryColor
                             Layout.preferredWidth: 100
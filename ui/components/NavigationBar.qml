@@ -58,7 +58,7 @@ Rectangle {
             spacing: 8
 
             Repeater {
-                model: ["视频", "图片", "文档","音频"]
+                model: ["视频", "图片", "文档","音频", "重复文件", "空间占用"]
                 
                 Button {
                     text: modelData
@@ -86,7 +86,7 @@ Rectangle {
                         console.log("切换到:", modelData)
                         
                         // 根据按钮类型切换页面
-                        var pageType = index + 1 // 1=视频, 2=图片, 3=文档, 4=音频
+                        var pageType = index + 1 // 1=视频, 2=图片, 3=文档, 4=音频, 5=重复文件, 6=空间占用
                         pageTypeChanged(pageType)
                         
                         // 延时50ms输出，确保Python已更新lastError
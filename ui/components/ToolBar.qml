@@ -69,23 +69,143 @@ Rectangle {
                 }
             }
 
-            // 当前路径显示
+            // 当前路径：面包屑（点击跳到上级文件夹）；点击空白处可输入路径，按本地目录树补全
             Rectangle {
+                id: pathBar
                 Layout.fillWidth: true
                 Layout.preferredHeight: 32
                 radius: 16
                 color: themeManager.backgroundColor
-                border.color: themeManager.dividerColor
+                border.color: editing ? themeManager.primaryColor : themeManager.dividerColor
                 border.width: 1
 
-                Text {
+                property bool editing: false
+                // dirTreeVM.version 变化（目录树加载或被修补）时重新查询
+                property var crumbs: dirTreeVM && fileVM && dirTreeVM.version >= 0
+                                     ? dirTreeVM.breadcrumbs(fileVM.current_directory) : []
+                property var completions: []
+
+                function startEditing() {
+                    pathField.text = fileVM ? fileVM.current_directory : ""
+                    editing = true
+                    pathField.forceActiveFocus()
+                    pathField.selectAll()
+                }
+
+                function finishEditing(path) {
+                    editing = false
+                    completions = []
+                    if (path !== undefined && fileVM) {
+                        fileVM.navigate_to(path.replace(/\/+$/, ""))
+                    }
+                }
+
+                MouseArea {
                     anchors.fill: parent
-                    anchors.margins: 8
-                    text: fileVM ? (fileVM.current_directory || "主页") : "加载中..."
+                    visible: !pathBar.editing
+                    cursorShape: Qt.IBeamCursor
+                    onClicked: pathBar.startEditing()
+                }
+
+                Row {
+                    anchors.fill: parent
+                    anchors.leftMargin: 8
+                    anchors.rightMargin: 8
+                    spacing: 2
+                    clip: true
+                    visible: !pathBar.editing
+
+                    Text {
+                        text: "主页"
+                        height: parent.height
+                        font.pixelSize: 12
+                        color: themeManager.primaryColor
+                        verticalAlignment: Text.AlignVCenter
+                        visible: pathBar.crumbs.length > 0
+
+                        MouseArea {
+                            anchors.fill: parent
+                            cursorShape: Qt.PointingHandCursor
+                            onClicked: fileVM.navigate_to("")
+                        }
+                    }
+
+                    Repeater {
+                        model: pathBar.crumbs
+                        delegate: Text {
+                            text: " › " + modelData.title
+                            height: parent.height
+                            font.pixelSize: 12
+                            color: index === pathBar.crumbs.length - 1 ? themeManager.textPrimaryColor : themeManager.primaryColor
+                            verticalAlignment: Text.AlignVCenter
+
+                            MouseArea {
+                                anchors.fill: parent
+                                cursorShape: Qt.PointingHandCursor
+                                onClicked: fileVM.navigate_to(modelData.path)
+                            }
+                        }
+                    }
+
+                    // 目录树中还没有当前目录（尚未加载）时直接显示路径
+                    Text {
+                        text: fileVM ? (fileVM.current_directory || "主页") : "加载中..."
+                        height: parent.height
+                        font.pixelSize: 12
+                        color: themeManager.textPrimaryColor
+                        verticalAlignment: Text.AlignVCenter
+                        visible: pathBar.crumbs.length === 0
+                    }
+                }
+
+                TextField {
+                    id: pathField
+                    anchors.fill: parent
+                    anchors.leftMargin: 4
+                    anchors.rightMargin: 4
+                    visible: pathBar.editing
                     font.pixelSize: 12
-                    color: themeManager.textPrimaryColor
-                    verticalAlignment: Text.AlignVCenter
-                    elide: Text.ElideLeft
+                    selectByMouse: true
+                    background: null
+
+                    onTextEdited: pathBar.completions = text !== "" ? dirTreeVM.complete(text) : []
+                    onAccepted: pathBar.finishEditing(text)
+                    Keys.onEscapePressed: pathBar.finishEditing()
+                    Keys.onTabPressed: {
+                        if (pathBar.completions.length > 0) {
+                            text = pathBar.completions[0] + "/"
+                            pathBar.completions = dirTreeVM.complete(text)
+                        }
+                    }
+                    onActiveFocusChanged: {
+                        if (!activeFocus && pathBar.editing) {
+                            pathBar.finishEditing()
+                        }
+                    }
+                }
+
+                // 路径补全候选
+                Popup {
+                    y: pathBar.height + 2
+                    width: pathBar.width
+                    height: Math.min(completionList.contentHeight + 8, 240)
+                    padding: 4
+                    visible: pathBar.editing && pathBar.completions.length > 0
+                    closePolicy: Popup.NoAutoClose
+
+                    ListView {
+                        id: completionList
+                        anchors.fill: parent
+                        clip: true
+                        model: pathBar.completions
+                        delegate: ItemDelegate {
+                            width: completionList.width
+                            text: modelData
+                            font.pixelSize: 12
+                            focusPolicy: Qt.NoFocus
+                            onClicked: pathBar.finishEditing(modelData)
+                        }
+                    }
                 }
             }
         }
@@ -215,6 +335,98 @@ Rectangle {
             Item {
                 Layout.fillWidth: true
             }
+
+            // 文件名搜索（输入停止后才查询本地索引）
+            TextField {
+                id: searchField
+                Layout.preferredWidth: 220
+                Layout.preferredHeight: 36
+                placeholderText: "搜索文件名"
+                font.pixelSize: 12
+                selectByMouse: true
+                visible: searchVM !== null && searchVM !== undefined
+
+                background: Rectangle {
+                    radius: 18
+                    color: themeManager.backgroundColor
+                    border.color: searchField.activeFocus ? themeManager.primaryColor : themeManager.dividerColor
+                    border.width: 1
+                }
+
+                onTextChanged: {
+                    searchVM.set_query(text)
+                    if (text.trim().length > 0) {
+                        searchPopup.open()
+                    } else {
+                        searchPopup.close()
+                    }
+                }
+                Keys.onEscapePressed: {
+                    text = ""
+                    searchPopup.close()
+                }
+
+                Popup {
+                    id: searchPopup
+                    y: searchField.height + 4
+                    width: 360
+                    height: Math.min(360, Math.max(48, searchResultsView.contentHeight + 16))
+                    x: searchField.width - width
+                    padding: 8
+                    closePolicy: Popup.CloseOnPressOutside
+
+                    background: Rectangle {
+                        radius: 8
+                        color: themeManager.surfaceColor
+                        border.color: themeManager.dividerColor
+                        border.width: 1
+                    }
+
+                    Text {
+                        anchors.centerIn: parent
+                        visible: searchResultsView.count === 0
+                        text: searchVM && searchVM.is_searching ? "搜索中..." : "没有匹配的文件"
+                        font.pixelSize: 12
+                        color: themeManager.textSecondaryColor
+                    }
+
+                    ListView {
+                        id: searchResultsView
+                        anchors.fill: parent
+                        clip: true
+                        model: searchVM ? searchVM.results_model : null
+                        ScrollBar.vertical: ScrollBar {}
+
+                        delegate: ItemDelegate {
+                            width: searchResultsView.width
+                            height: 40
+
+                            contentItem: Column {
+                                spacing: 2
+                                Text {
+                                    width: parent.width
+                                    text: (model.isDir ? "📁 " : "") + model.name
+                                    font.pixelSize: 12
+                                    color: themeManager.textPrimaryColor
+                                    elide: Text.ElideRight
+                                }
+                                Text {
+                                    width: parent.width
+                                    text: model.parentPath
+                                    font.pixelSize: 10
+                                    color: themeManager.textSecondaryColor
+                                    elide: Text.ElideLeft
+                                }
+                            }
+
+                            onClicked: {
+                                searchVM.open_result(index)
+                                searchPopup.close()
+                            }
+                        }
+                    }
+                }
+            }
         }
     }
 } 
\ No newline at end of file
@@ -43,7 +43,7 @@ Rectangle {
                 Button {
                     text: "刷新"
                     onClicked: {
-                        typefilesVM.fetchTypeFiles("audio", 1, 30)
+                        typefilesVM.refresh("audio")
                     }
                 }
             }
@@ -127,10 +127,13 @@ Rectangle {
                 anchors.bottom: parent.bottom
                 anchors.margins: 8
                 
-                model: typefilesVM ? typefilesVM.files : []
+                model: typefilesVM ? typefilesVM.model_for("audio") : null
                 
                 delegate: Rectangle {
                     width: audioList.width
+                    
+                    // 接近末尾时加载下一页（已预取时立即追加）
+                    Component.onCompleted: typefilesVM.ensure_loaded("audio", index)
                     height: 60
                     color: mouseArea.containsMouse ? themeManager.hoverColor : "transparent"
                     radius: 4
@@ -149,7 +152,7 @@ Rectangle {
                             
                             Text {
                                 anchors.centerIn: parent
-                                text: getAudioIcon(modelData ? modelData.name : "")
+                                text: getAudioIcon(model.name)
                                 font.pixelSize: 18
                                 color: themeManager.primaryColor
                             }
@@ -161,7 +164,7 @@ Rectangle {
                             spacing: 4
                             
                             Text {
-                                text: modelData ? modelData.name : ""
+                                text: model.name
                                 font.pixelSize: 14
                                 font.weight: Font.Medium
                                 color: themeManager.textPrimaryColor
@@ -169,7 +172,7 @@ Rectangle {
                             }
                             
                             Text {
-                                text: getAudioFormat(modelData ? modelData.name : "")
+                                text: getAudioFormat(model.name)
                                 font.pixelSize: 12
                                 color: themeManager.textSecondaryColor
                             }
@@ -177,7 +180,7 @@ Rectangle {
                         
                         // 文件大小
                         Text {
-                            text: formatFileSize(modelData ? modelData.size : 0)
+                            text: formatFileSize(model.size)
                             font.pixelSize: 12
                             color: themeManager.textSecondaryColor
                             Layout.preferredWidth: 80
@@ -185,7 +188,7 @@ Rectangle {
                         
                         // 时长（音频特有）
                         Text {
-                            text: getAudioDuration(modelData ? modelData.size : 0)
+                            text: getAudioDuration(model.size)
                             font.pixelSize: 12
                             color: themeManager.textSecondaryColor
                             Layout.preferredWidth: 80
@@ -193,7 +196,7 @@ Rectangle {
                         
                         // 修改时间
                         Text {
-                            text: formatDate(modelData ? modelData.updatedAt : "")
+                            text: formatDate(model.updatedAt)
                             font.pixelSize: 12
                             color: themeManager.textSecondaryColor
                             Layout.preferredWidth: 130
@@ -233,10 +236,10 @@ Rectangle {
                                 }
                                 
                                 onClicked: {
-                                    console.log("播放音频:", modelData.relPath)
-                                    if (modelData && modelData.relPath) {
+                                    console.log("播放音频:", model.relPath)
+                                    if (model.relPath) {
                                         // 调用系统音频播放器
-                                        // fileVM.open_file_with_system(modelData.relPath)
+                                        // fileVM.open_file_with_system(model.relPath)
                                     }
                                 }
                             }
@@ -262,10 +265,10 @@ Rectangle {
                                 }
                                 
                                 onClicked: {
-                                    console.log("下载音频:", modelData.relPath)
-                                    if (modelData && modelData.relPath) {
+                                    console.log("下载音频:", model.relPath)
+                                    if (model.relPath) {
                                         // 调用下载功能
-                                        // downloadVM.download_file(modelData.relPath)
+                                        // downloadVM.download_file(model.relPath)
                                     }
                                 }
                             }
@@ -280,14 +283,14 @@ Rectangle {
                         hoverEnabled: true
                         
                         onClicked: {
-                            console.log("点击音频:", modelData.name)
+                            console.log("点击音频:", model.name)
                         }
                         
                         onDoubleClicked: {
-                            console.log("双击播放音频:", modelData.relPath)
-                            if (modelData && modelData.relPath) {
+                            console.log("双击播放音频:", model.relPath)
+                            if (model.relPath) {
                                 // 调用系统音频播放器
-                                // fileVM.open_file_with_system(modelData.relPath)
+                                // fileVM.open_file_with_system(model.relPath)
                             }
                         }
                     }
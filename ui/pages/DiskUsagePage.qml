@@ -0,0 +1,108 @@
+import QtQuick 6.5
+import QtQuick.Controls 2.15
+import QtQuick.Layouts 1.15
+
+// 空间占用页面：当前文件夹的组成以矩形树图显示，点击文件夹查看其组成
+Rectangle {
+    id: diskUsagePage
+    color: themeManager.backgroundColor
+
+    ColumnLayout {
+        anchors.fill: parent
+        spacing: 16
+
+        // 标题栏
+        Rectangle {
+            Layout.fillWidth: true
+            Layout.preferredHeight: 50
+            color: themeManager.surfaceColor
+
+            RowLayout {
+                anchors.fill: parent
+                anchors.margins: 16
+                spacing: 8
+
+                Button {
+                    text: "↑"
+                    enabled: diskUsageVM.root !== ""
+                    onClicked: diskUsageVM.go_up()
+                }
+
+                Text {
+                    text: diskUsageVM.root !== "" ? diskUsageVM.root : "全部"
+                    font.pixelSize: 18
+                    font.weight: Font.Medium
+                    color: themeManager.textPrimaryColor
+                    elide: Text.ElideMiddle
+                    Layout.fillWidth: true
+                }
+
+                // 合计；还有文件夹未获取过列表时合计只是下限
+                Text {
+                    text: diskUsageVM.total_size_text + "，" + diskUsageVM.file_count + " 个文件"
+                          + (diskUsageVM.is_complete ? "" : "（还有 " + diskUsageVM.unlisted_count + " 个文件夹未统计）")
+                    font.pixelSize: 12
+                    color: themeManager.textSecondaryColor
+                }
+
+                Button {
+                    text: "刷新"
+                    onClicked: diskUsageVM.refresh()
+                }
+            }
+        }
+
+        // 矩形树图
+        Rectangle {
+            id: treemap
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            Layout.leftMargin: 16
+            Layout.rightMargin: 16
+            Layout.bottomMargin: 16
+            color: themeManager.surfaceColor
+            radius: 8
+            clip: true
+
+            Repeater {
+                model: diskUsageVM.model
+
+                delegate: Rectangle {
+                    x: model.x * treemap.width
+                    y: model.y * treemap.height
+                    width: model.w * treemap.width
+                    height: model.h * treemap.height
+                    color: model.isDir ? themeManager.primaryColor + (model.complete ? "60" : "30") : themeManager.dividerColor
+                    border.color: themeManager.surfaceColor
+                    border.width: 1
+
+                    Text {
+                        anchors.fill: parent
+                        anchors.margins: 4
+                        visible: parent.width > 60 && parent.height > 32
+                        text: model.name + "\n" + model.sizeText
+                        font.pixelSize: 12
+                        color: themeManager.textPrimaryColor
+                        elide: Text.ElideRight
+                        wrapMode: Text.Wrap
+                    }
+
+                    MouseArea {
+                        anchors.fill: parent
+                        enabled: model.isDir
+                        cursorShape: model.isDir ? Qt.PointingHandCursor : Qt.ArrowCursor
+                        onClicked: diskUsageVM.open_directory(model.relPath)
+                    }
+                }
+            }
+
+            Text {
+                anchors.centerIn: parent
+                visible: diskUsageVM.total_size === 0
+                text: "还没有统计数据，浏览文件夹或开启后台遍历后显示"
+                font.pixelSize: 14
+                color: themeManager.textSecondaryColor
+            }
+        }
+    }
+}
@@ -43,7 +43,7 @@ Rectangle {
                 Button {
                     text: "刷新"
                     onClicked: {
-                        typefilesVM.fetchTypeFiles("document", 1, 30)
+                        typefilesVM.refresh("document")
                     }
                 }
             }
@@ -118,10 +118,13 @@ Rectangle {
                 anchors.bottom: parent.bottom
                 anchors.margins: 8
                 
-                model: typefilesVM ? typefilesVM.files : []
+                model: typefilesVM ? typefilesVM.model_for("document") : null
                 
                 delegate: Rectangle {
                     width: documentList.width
+                    
+                    // 接近末尾时加载下一页（已预取时立即追加）
+                    Component.onCompleted: typefilesVM.ensure_loaded("document", index)
                     height: 50
                     color: mouseArea.containsMouse ? themeManager.hoverColor : "transparent"
                     radius: 4
@@ -140,7 +143,7 @@ Rectangle {
                             
                             Text {
                                 anchors.centerIn: parent
-                                text: getDocumentIcon(modelData ? modelData.name : "")
+                                text: getDocumentIcon(model.name)
                                 font.pixelSize: 16
                                 color: themeManager.primaryColor
                             }
@@ -148,7 +151,7 @@ Rectangle {
                         
                         // 文件名
                         Text {
-                            text: modelData ? modelData.name : ""
+                            text: model.name
                             font.pixelSize: 14
                             color: themeManager.textPrimaryColor
                             elide: Text.ElideRight
@@ -157,7 +160,7 @@ Rectangle {
                         
                         // 文件大小
                         Text {
-                            text: formatFileSize(modelData ? modelData.size : 0)
+                            text: formatFileSize(model.size)
                             font.pixelSize: 12
                             color: themeManager.textSecondaryColor
                             Layout.preferredWidth: 80
@@ -165,7 +168,7 @@ Rectangle {
                         
                         // 修改时间
                         Text {
-                            text: formatDate(modelData ? modelData.updatedAt : "")
+                            text: formatDate(model.updatedAt)
                             font.pixelSize: 12
                             color: themeManager.textSecondaryColor
                             Layout.preferredWidth: 130
@@ -195,10 +198,10 @@ Rectangle {
                                 }
                                 
                                 onClicked: {
-                                    console.log("打开文档:", modelData.relPath)
-                                    if (modelData && modelData.relPath) {
+                                    console.log("打开文档:", model.relPath)
+                                    if (model.relPath) {
                                         // 调用系统默认程序打开文档
-                                        // fileVM.open_file_with_system(modelData.relPath)
+                                        // fileVM.open_file_with_system(model.relPath)
                                     }
                                 }
                             }
@@ -224,10 +227,10 @@ Rectangle {
                                 }
                                 
                                 onClicked: {
-                                    console.log("下载文档:", modelData.relPath)
-                                    if (modelData && modelData.relPath) {
+                                    console.log("下载文档:", model.relPath)
+                                    if (model.relPath) {
                                         // 调用下载功能
-                                        // downloadVM.download_file(modelData.relPath)
+                                        // downloadVM.download_file(model.relPath)
                                     }
                                 }
                             }
@@ -242,14 +245,14 @@ Rectangle {
                         hoverEnabled: true
                         
                         onClicked: {
-                            console.log("点击文档:", modelData.name)
+                            console.log("点击文档:", model.name)
                         }
                         
                         onDoubleClicked: {
-                            console.log("双击打开文档:", modelData.relPath)
-                            if (modelData && modelData.relPath) {
+                            console.log("双击打开文档:", model.relPath)
+                            if (model.relPath) {
                                 // 调用系统默认程序打开文档
-                                // fileVM.open_file_with_system(modelData.relPath)
+                                // fileVM.open_file_with_system(model.relPath)
                             }
                         }
                     }
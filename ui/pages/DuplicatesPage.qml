@@ -0,0 +1,207 @@
+import QtQuick 6.5
+import QtQuick.Controls 2.15
+import QtQuick.Layouts 1.15
+
+// 重复文件页面：在后台遍历的快照上查找重复文件，勾选后交给 deleteVM 确认删除
+Rectangle {
+    id: duplicatesPage
+    color: themeManager.backgroundColor
+
+    ColumnLayout {
+        anchors.fill: parent
+        spacing: 16
+
+        // 标题栏
+        Rectangle {
+            Layout.fillWidth: true
+            Layout.preferredHeight: 50
+            color: themeManager.surfaceColor
+
+            RowLayout {
+                anchors.fill: parent
+                anchors.margins: 16
+                spacing: 8
+
+                Text {
+                    text: "重复文件"
+                    font.pixelSize: 18
+                    font.weight: Font.Medium
+                    color: themeManager.textPrimaryColor
+                }
+
+                // 查找进度
+                Text {
+                    text: duplicatesVM.is_running
+                        ? "正在比较 " + duplicatesVM.hashed_count + " / " + duplicatesVM.total_to_hash
+                          + "，已读取 " + duplicatesVM.bytes_read_text
+                        : (duplicatesVM.group_count > 0
+                           ? duplicatesVM.group_count + " 组重复文件，读取 " + duplicatesVM.bytes_read_text
+                           : "")
+                    font.pixelSize: 12
+                    color: themeManager.textSecondaryColor
+                    Layout.leftMargin: 8
+                }
+
+                Item { Layout.fillWidth: true }
+
+                Button {
+                    text: duplicatesVM.is_running ? "停止" : "开始查找"
+                    onClicked: {
+                        if (duplicatesVM.is_running) {
+                            duplicatesVM.stop()
+                        } else {
+                            duplicatesVM.start()
+                        }
+                    }
+                }
+            }
+        }
+
+        // 错误信息
+        Text {
+            Layout.fillWidth: true
+            Layout.leftMargin: 16
+            text: duplicatesVM.error_message
+            visible: text !== ""
+            font.pixelSize: 13
+            color: "#FF4444"
+            wrapMode: Text.WordWrap
+        }
+
+        // 重复文件列表（同组文件相邻，组首行显示分组标题）
+        Rectangle {
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            color: themeManager.surfaceColor
+            radius: 8
+
+            ListView {
+                id: duplicatesList
+                anchors.fill: parent
+                anchors.margins: 8
+                clip: true
+                model: duplicatesVM.model
+
+                delegate: Column {
+                    width: duplicatesList.width
+
+                    // 分组标题
+                    Text {
+                        visible: model.firstInGroup
+                        height: visible ? 32 : 0
+                        leftPadding: 8
+                        verticalAlignment: Text.AlignBottom
+                        text: model.groupCount + " 个相同文件，每个 " + model.sizeText
+                        font.pixelSize: 13
+                        font.weight: Font.Medium
+                        color: themeManager.textPrimaryColor
+                    }
+
+                    Rectangle {
+                        width: parent.width
+                        height: 40
+                        color: rowMouseArea.containsMouse ? themeManager.hoverColor : "transparent"
+                        radius: 4
+
+                        RowLayout {
+                            anchors.fill: parent
+                            anchors.leftMargin: 8
+                            anchors.rightMargin: 8
+                            spacing: 8
+
+                            CheckBox {
+                                checked: model.selected
+                                onClicked: {
+                                    duplicatesVM.toggle_selection(index)
+                                    // 点击会解除绑定，恢复为跟随模型
+                                    checked = Qt.binding(function() { return model.selected })
+                                }
+                            }
+
+                            Text {
+                                text: model.name
+                                font.pixelSize: 14
+                                color: themeManager.textPrimaryColor
+                                elide: Text.ElideMiddle
+                                Layout.preferredWidth: 260
+                            }
+
+                            Text {
+                                text: model.parentPath
+                                font.pixelSize: 12
+                                color: themeManager.textSecondaryColor
+                                elide: Text.ElideMiddle
+                                Layout.fillWidth: true
+                            }
+                        }
+
+                        MouseArea {
+                            id: rowMouseArea
+                            anchors.fill: parent
+                            hoverEnabled: true
+                            acceptedButtons: Qt.NoButton
+                        }
+                    }
+                }
+
+                ScrollBar.vertical: ScrollBar {}
+            }
+
+            Text {
+                anchors.centerIn: parent
+                visible: duplicatesList.count === 0 && !duplicatesVM.is_running
+                text: "没有找到重复文件"
+                font.pixelSize: 14
+                color: themeManager.textSecondaryColor
+            }
+        }
+
+        // 底部操作栏
+        Rectangle {
+            Layout.fillWidth: true
+            Layout.preferredHeight: 50
+            color: themeManager.surfaceColor
+
+            RowLayout {
+                anchors.fill: parent
+                anchors.margins: 16
+                spacing: 8
+
+                Text {
+                    text: "已勾选 " + duplicatesVM.selected_count + " 个文件，可释放 " + duplicatesVM.selected_size_text
+                    font.pixelSize: 13
+                    color: themeManager.textPrimaryColor
+                }
+
+                // 勾选了某组的全部文件时提醒
+                Text {
+                    visible: duplicatesVM.deletes_all_copies
+                    text: "⚠️ 有的文件所有副本都被勾选"
+                    font.pixelSize: 13
+                    color: "#FF4444"
+                }
+
+                Item { Layout.fillWidth: true }
+
+                Button {
+                    text: "保留每组第一个"
+                    enabled: duplicatesList.count > 0
+                    onClicked: duplicatesVM.select_duplicates()
+                }
+
+                Button {
+                    text: "取消勾选"
+                    enabled: duplicatesVM.selected_count > 0
+                    onClicked: duplicatesVM.clear_selection()
+                }
+
+                // 由 deleteVM 请求确认（MainPage 弹出确认对话框）
+                Button {
+                    text: "删除勾选"
+                    enabled: duplicatesVM.selected_count > 0 && !deleteVM.is_deleting
+                    onClicked: duplicatesVM.delete_selected()
+                }
+            }
+        }
+    }
+}
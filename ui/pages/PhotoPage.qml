@@ -21,44 +21,6 @@ Rectangle {
         }
     }
 
-    // 连接缩略图信号
-    Connections {
-        target: thumbnailVM
-        
-        function onThumbnailReady(filePath, imageUrl) {
-            //   console.log("onThumbnailReady 收到缩略图:", filePath, "imageUrl=", imageUrl)
-            // 更新对应的缩略图
-            Qt.callLater(function() {
-                updateThumbnail(filePath, imageUrl)
-            })
-        }
-        
-        function onThumbnailFailed(filePath, error) {
-            // console.log("图片缩略图获取失败:", filePath, error)
-            // 可以设置默认缩略图
-            // setDefaultThumbnail(filePath)
-        }
-    }
-
-    // 更新缩略图
-    function updateThumbnail(filePath, imageUrl) {
-        // console.log("updateThumbnail 被调用，filePath =", filePath, "imageUrl =", imageUrl)
-        // console.log("photoGrid.count =", photoGrid.count)
-
-        for (let i = 0; i < photoGrid.count; i++) {
-            let item = photoGrid.itemAtIndex(i)
-            // console.log("检查 index =", i, "item =", item, item ? item.filePath : "null")
-
-            if (item && item.filePath === filePath) {
-                // console.log("updateThumbnail: 为 filePath =", filePath, "赋值 thumbnailSource =", imageUrl)
-                item.thumbnailSource = imageUrl
-                break
-            }
-        }
-    }
-
-
-
     ColumnLayout {
         anchors.fill: parent
         spacing: 16
@@ -81,116 +43,264 @@ Rectangle {
                 }
                 
                 Item { Layout.fillWidth: true }
+
+                // 缩略图缓存统计
+                Text {
+                    text: thumbnailVM ? "缩略图缓存 命中 " + thumbnailVM.cache_hits + " / 磁盘 " + thumbnailVM.disk_hits
+                                        + " / 本地 " + thumbnailVM.local_generated + " / 下载 " + thumbnailVM.downloads
+                                        + " / 淘汰 " + thumbnailVM.cache_evictions + "  " + thumbnailVM.cache_size_text
+                                        + "  排队 " + thumbnailVM.queue_depth
+                                        + " / 首张 " + Math.round(thumbnailVM.first_thumbnail_ms) + " ms"
+                                        + "  合并 任务 " + thumbnailVM.coalesced_tasks + "/" + thumbnailVM.shared_tasks
+                                        + " / 请求 " + thumbnailVM.coalesced_requests
+                                        + " / 缩略图 " + thumbnailVM.coalesced_loads : ""
+                    font.pixelSize: 11
+                    color: themeManager.textSecondaryColor
+                }
+
+                // 时间线：按日/月/年分组
+                ComboBox {
+                    id: timelineMode
+                    Layout.preferredWidth: 100
+                    model: [
+                        { text: "平铺", mode: "" },
+                        { text: "按日", mode: "day" },
+                        { text: "按月", mode: "month" },
+                        { text: "按年", mode: "year" }
+                    ]
+                    textRole: "text"
+                    onActivated: photoGrid.model.set_timeline_mode(model[currentIndex].mode)
+                }
+
+                // 跳转到日期（如 2021-03）：尚未加载到时继续加载，完成后由 onTimelineSeekFinished 定位
+                TextField {
+                    id: seekField
+                    Layout.preferredWidth: 120
+                    placeholderText: "跳转 2021-03"
+                    font.pixelSize: 12
+                    selectByMouse: true
+                    visible: photoGrid.model && photoGrid.model.timeline_mode !== ""
+                    onAccepted: typefilesVM.seek_timeline("photo", text)
+                }
+
+                // 跳转进度或结果
+                Text {
+                    text: typefilesVM ? typefilesVM.seekStatus : ""
+                    visible: seekField.visible && text !== ""
+                    font.pixelSize: 11
+                    color: themeManager.textSecondaryColor
+                }
+
+                Connections {
+                    target: typefilesVM
+                    function onTimelineSeekFinished(fileType, key, row) {
+                        if (fileType === "photo" && row >= 0) {
+                            photoGrid.positionViewAtIndex(row, GridView.Beginning)
+                        }
+                    }
+                }
                 
                 // 刷新按钮
                 Button {
                     text: "刷新"
                     onClicked: {
-                        typefilesVM.fetchTypeFiles("photo", 1, 30)
+                        typefilesVM.refresh("photo")
                     }
                 }
             }
         }
 
-        // 图片网格
-        ScrollView {
+        RowLayout {
             Layout.fillWidth: true
             Layout.fillHeight: true
+            spacing: 0
+
+            Item {
+                Layout.fillWidth: true
+                Layout.fillHeight: true
+
+                // 图片网格
+                ScrollView {
+                    anchors.fill: parent
             
-            GridView {
-                id: photoGrid
-                anchors.fill: parent
-                cellWidth: 220
-                cellHeight: 200
+                    GridView {
+                        id: photoGrid
+                        anchors.fill: parent
+                        cellWidth: 220
+                        cellHeight: 200
                 
-                model: typefilesVM ? typefilesVM.files : []
+                        model: typefilesVM ? typefilesVM.model_for("photo") : null
+                        // 多创建一屏委托，下一屏的缩略图提前排队（预取级）
+                        cacheBuffer: height
+
+                        // 告知 ThumbnailVM 可见范围，可见单元格的缩略图优先加载
+                        function updateViewport() {
+                            if (!thumbnailVM || count === 0)
+                                return
+                            var columns = Math.max(1, Math.floor(width / cellWidth))
+                            var firstRow = Math.floor((contentY - originY) / cellHeight)
+                            var lastRow = Math.ceil((contentY - originY + height) / cellHeight) - 1
+                            thumbnailVM.set_viewport("photo", Math.max(0, firstRow * columns),
+                                                     Math.min(count - 1, (lastRow + 1) * columns - 1))
+                        }
+                        onContentYChanged: updateViewport()
+                        onHeightChanged: updateViewport()
+                        onWidthChanged: updateViewport()
+                        onCountChanged: updateViewport()
                 
-                delegate: Rectangle {
-                    width: 200
-                    height: 180
-                    radius: 8
-                    color: themeManager.surfaceColor
-                    border.color: themeManager.dividerColor
-                    border.width: 1
+                        delegate: Rectangle {
+                            width: 200
+                            height: 180
+                            radius: 8
+                            color: themeManager.surfaceColor
+                            border.color: themeManager.dividerColor
+                            border.width: 1
                     
-                    property string filePath: modelData ? modelData.relPath : ""
-                    property string thumbnailSource: ""
+                            property string filePath: model.relPath
+                            // 缩略图由 image://thumb/ 提供（ThumbnailVM 缓存中解码好的图片）；被释放的行 relPath 为空，不加载
+                            property string thumbnailSource: filePath
+                                ? "image://thumb/" + encodeURIComponent(filePath) + "?w=200&h=150&t=" + encodeURIComponent(model.updatedAt)
+                                + "&v=photo&i=" + index
+                                : ""
                     
-                    // 缩略图
-                    Image {
-                        id: thumbnailImage
-                        anchors.top: parent.top
-                        anchors.left: parent.left
-                        anchors.right: parent.right
-                        anchors.bottom: fileNameText.top
-                        anchors.margins: 8
-                        anchors.bottomMargin: 4
+                            // 缩略图
+                            Image {
+                                id: thumbnailImage
+                                anchors.top: parent.top
+                                anchors.left: parent.left
+                                anchors.right: parent.right
+                                anchors.bottom: fileNameText.top
+                                anchors.margins: 8
+                                anchors.bottomMargin: 4
                         
-                        source: parent.thumbnailSource
-                        fillMode: Image.PreserveAspectCrop
-                        asynchronous: true
-                        cache: true
+                                source: parent.thumbnailSource
+                                fillMode: Image.PreserveAspectCrop
+                                asynchronous: true
+                                sourceSize: Qt.size(200, 150)
+                                // 缩略图由 ThumbnailVM 按内存预算缓存，不再额外缓存
+                                cache: false
                         
-                        // 默认图片图标
-                        Rectangle {
-                            anchors.fill: parent
-                            color: themeManager.backgroundColor
-                            visible: !parent.source || parent.status === Image.Error
+                                // 默认图片图标
+                                Rectangle {
+                                    anchors.fill: parent
+                                    color: themeManager.backgroundColor
+                                    visible: parent.status !== Image.Ready
                             
-                            Text {
-                                anchors.centerIn: parent
-                                text: "🖼️"
-                                font.pixelSize: 32
-                                color: themeManager.textSecondaryColor
+                                    Text {
+                                        anchors.centerIn: parent
+                                        text: "🖼️"
+                                        font.pixelSize: 32
+                                        color: themeManager.textSecondaryColor
+                                    }
+                                }
                             }
-                        }
-                    }
                     
-                    // 文件名
-                    Text {
-                        id: fileNameText
-                        anchors.left: parent.left
-                        anchors.right: parent.right
-                        anchors.bottom: parent.bottom
-                        anchors.margins: 8
+                            // 分组的第一张照片上显示分组标题
+                            Rectangle {
+                                anchors.top: parent.top
+                                anchors.left: parent.left
+                                anchors.margins: 12
+                                width: sectionText.implicitWidth + 12
+                                height: sectionText.implicitHeight + 6
+                                radius: 4
+                                color: themeManager.primaryColor
+                                visible: model.sectionStart
+
+                                Text {
+                                    id: sectionText
+                                    anchors.centerIn: parent
+                                    text: model.section
+                                    font.pixelSize: 11
+                                    color: "white"
+                                }
+                            }
+                    
+                            // 文件名
+                            Text {
+                                id: fileNameText
+                                anchors.left: parent.left
+                                anchors.right: parent.right
+                                anchors.bottom: parent.bottom
+                                anchors.margins: 8
                         
-                        text: modelData ? modelData.name : ""
-                        font.pixelSize: 12
-                        color: themeManager.textPrimaryColor
-                        elide: Text.ElideRight
-                        horizontalAlignment: Text.AlignHCenter
-                    }
+                                text: model.name
+                                font.pixelSize: 12
+                                color: themeManager.textPrimaryColor
+                                elide: Text.ElideRight
+                                horizontalAlignment: Text.AlignHCenter
+                            }
                     
-                    // 点击事件
-                    MouseArea {
-                        anchors.fill: parent
-                        cursorShape: Qt.PointingHandCursor
+                            // 点击事件
+                            MouseArea {
+                                anchors.fill: parent
+                                cursorShape: Qt.PointingHandCursor
                         
-                        onClicked: {
-                            console.log("点击图片文件:", modelData.name)
-                            // 这里可以添加查看大图的逻辑
-                        }
+                                onClicked: {
+                                    console.log("点击图片文件:", model.name)
+                                    // 这里可以添加查看大图的逻辑
+                                }
                         
-                        onDoubleClicked: {
-                            console.log("双击查看图片:", modelData.relPath)
-                            // 双击查看大图
-                            if (modelData && modelData.relPath) {
-                                // 调用系统图片查看器
-                                // 这里可以调用 fileVM.open_file_with_system(modelData.relPath)
+                                onDoubleClicked: {
+                                    console.log("双击查看图片:", model.relPath)
+                                    // 双击查看大图
+                                    if (model.relPath) {
+                                        // 调用系统图片查看器
+                                        // 这里可以调用 fileVM.open_file_with_system(model.relPath)
+                                    }
+                                }
                             }
-                        }
-                    }
                     
-                    // 组件加载完成后请求缩略图
-                    Component.onCompleted: {
-                        // console.log("delegate completed", filePath, "thumbnailSource=", thumbnailSource)
-                        if (modelData && modelData.relPath && thumbnailVM) {
-                            thumbnailVM.requestThumbnail(modelData.relPath, 200, 150)
+                            // 组件加载完成后检查是否需要加载下一页
+                            Component.onCompleted: {
+                                // 接近末尾时加载下一页（已预取时立即追加）
+                                typefilesVM.ensure_loaded("photo", index)
+                            }
                         }
-                        // console.log("delegate completed", filePath, "thumbnailSource=", thumbnailSource)
                     }
                 }
+
+                // 吸顶标题：最上面一行照片所在的分组
+                Rectangle {
+                    anchors.top: parent.top
+                    anchors.left: parent.left
+                    anchors.right: parent.right
+                    height: 32
+                    color: themeManager.surfaceColor
+                    opacity: 0.95
+                    visible: stickyText.text !== ""
+
+                    Text {
+                        id: stickyText
+                        anchors.verticalCenter: parent.verticalCenter
+                        anchors.left: parent.left
+                        anchors.leftMargin: 12
+                        text: photoGrid.model && photoGrid.model.timeline_mode !== ""
+                              ? photoGrid.model.section_label(photoGrid.indexAt(photoGrid.contentX + 1, photoGrid.contentY + 1))
+                              : ""
+                        font.pixelSize: 14
+                        font.weight: Font.Medium
+                        color: themeManager.textPrimaryColor
+                    }
+                }
+            }
+
+            // 分组列表：点击跳转到分组的第一张照片
+            ListView {
+                id: sectionList
+                Layout.preferredWidth: 140
+                Layout.fillHeight: true
+                clip: true
+                visible: photoGrid.model && photoGrid.model.timeline_mode !== ""
+                model: visible ? photoGrid.model.sections : []
+
+                delegate: ItemDelegate {
+                    width: sectionList.width
+                    height: 28
+                    text: modelData.label + "  " + modelData.count
+                    font.pixelSize: 12
+                    onClicked: photoGrid.positionViewAtIndex(modelData.row, GridView.Beginning)
+                }
             }
         }
     }
-} 
\ No newline at end of file
+}
@@ -21,43 +21,6 @@ Rectangle {
         }
     }
 
-    // 连接缩略图信号
-    Connections {
-        target: thumbnailVM
-        
-        function onThumbnailReady(filePath, imageUrl) {
-            //   console.log("onThumbnailReady 收到缩略图:", filePath, "imageUrl=", imageUrl)
-            // 更新对应的缩略图
-                Qt.callLater(function() {
-                updateThumbnail(filePath, imageUrl)
-            })
-        }
-        
-        function onThumbnailFailed(filePath, error) {
-            
-            // 可以设置默认缩略图
-            // setDefaultThumbnail(filePath)
-        }
-    }
-
-    // 更新缩略图
-    function updateThumbnail(filePath, imageUrl) {
-        // console.log("updateThumbnail 被调用，filePath =", filePath, "imageUrl =", imageUrl)
-        // console.log("videoGrid.count =", videoGrid.count)
-
-        for (let i = 0; i < videoGrid.count; i++) {
-            let item = videoGrid.itemAtIndex(i)
-            // console.log("检查 index =", i, "item =", item, item ? item.filePath : "null")
-
-            if (item && item.filePath === filePath) {
-                // console.log("updateThumbnail: 为 filePath =", filePath, "赋值 thumbnailSource =", imageUrl)
-                item.thumbnailSource = imageUrl
-                break
-            }
-        }
-    }
-
-
     ColumnLayout {
         anchors.fill: parent
         spacing: 16
@@ -85,7 +48,7 @@ Rectangle {
                 Button {
                     text: "刷新"
                     onClicked: {
-                        typefilesVM.fetchTypeFiles("video", 1, 30)
+                        typefilesVM.refresh("video")
                     }
                 }
             }
@@ -102,7 +65,24 @@ Rectangle {
                 cellWidth: 220
                 cellHeight: 200
                 
-                model: typefilesVM ? typefilesVM.files : []
+                model: typefilesVM ? typefilesVM.model_for("video") : null
+                // 多创建一屏委托，下一屏的缩略图提前排队（预取级）
+                cacheBuffer: height
+
+                // 告知 ThumbnailVM 可见范围，可见单元格的缩略图优先加载
+                function updateViewport() {
+                    if (!thumbnailVM || count === 0)
+                        return
+                    var columns = Math.max(1, Math.floor(width / cellWidth))
+                    var firstRow = Math.floor((contentY - originY) / cellHeight)
+                    var lastRow = Math.ceil((contentY - originY + height) / cellHeight) - 1
+                    thumbnailVM.set_viewport("video", Math.max(0, firstRow * columns),
+                                             Math.min(count - 1, (lastRow + 1) * columns - 1))
+                }
+                onContentYChanged: updateViewport()
+                onHeightChanged: updateViewport()
+                onWidthChanged: updateViewport()
+                onCountChanged: updateViewport()
                 
                 delegate: Rectangle {
                     width: 200
@@ -112,10 +92,12 @@ Rectangle {
                     border.color: themeManager.dividerColor
                     border.width: 1
                     
-                    property string filePath: modelData ? modelData.relPath : ""
-                    property string thumbnailSource: ""
-
-                    
+                    property string filePath: model.relPath
+                    // 缩略图由 image://thumb/ 提供（ThumbnailVM 缓存中解码好的图片）；被释放的行 relPath 为空，不加载
+                    property string thumbnailSource: filePath
+                        ? "image://thumb/" + encodeURIComponent(filePath) + "?w=200&h=150&t=" + encodeURIComponent(model.updatedAt)
+                        + "&v=video&i=" + index
+                        : ""
                     
                     // 缩略图
                     Image {
@@ -130,13 +112,15 @@ Rectangle {
                         source: parent.thumbnailSource
                         fillMode: Image.PreserveAspectCrop
                         asynchronous: true
-                        cache: true
+                        sourceSize: Qt.size(200, 150)
+                        // 缩略图由 ThumbnailVM 按内存预算缓存，不再额外缓存
+                        cache: false
                         
                         // 默认视频图标
                         Rectangle {
                             anchors.fill: parent
                             color: themeManager.backgroundColor
-                            visible: !parent.source || parent.status === Image.Error
+                            visible: parent.status !== Image.Ready
                             
                             Text {
                                 anchors.centerIn: parent
@@ -155,7 +139,7 @@ Rectangle {
                         anchors.bottom: parent.bottom
                         anchors.margins: 8
                         
-                        text: modelData ? modelData.name : ""
+                        text: model.name
                         font.pixelSize: 12
                         color: themeManager.textPrimaryColor
                         elide: Text.ElideRight
@@ -168,16 +152,16 @@ Rectangle {
                         cursorShape: Qt.PointingHandCursor
                         
                         onClicked: {
-                            console.log("点击视频文件:", modelData.name)
+                            console.log("点击视频文件:", model.name)
                             // 这里可以添加播放视频的逻辑
                         }
                         
                         onDoubleClicked: {
-                            console.log("双击播放视频:", modelData.relPath)
+                            console.log("双击播放视频:", model.relPath)
                             // 双击播放视频
-                            if (modelData && modelData.relPath) {
+                            if (model.relPath) {
                                 // 调用系统播放器播放视频
-                                var relPath = modelData.relPath
+                                var relPath = model.relPath
                                 if (relPath.startsWith("storage/")) {
                                     relPath = relPath.slice(8)
                                 }
@@ -186,12 +170,10 @@ Rectangle {
                         }
                     }
                     
-                    // 组件加载完成后请求缩略图
+                    // 组件加载完成后检查是否需要加载下一页
                     Component.onCompleted: {
-                        // console.log("delegate completed", filePath, "thumbnailSource=", thumbnailSource)
-                        if (modelData && modelData.relPath && thumbnailVM) {
-                            thumbnailVM.requestThumbnail(modelData.relPath, 200, 150)
-                        }
+                        // 接近末尾时加载下一页（已预取时立即追加）
+                        typefilesVM.ensure_loaded("video", index)
                     }
                 }
             }
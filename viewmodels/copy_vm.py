@@ -6,9 +6,18 @@ import os
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+from api.dir_tree import DirTreeIndex
+from viewmodels.task_executor import get_executor
+from typing import Callable, Optional
+
 
 class CopyViewModel(QObject):
-    """文件复制/移动ViewModel，专门处理文件复制和移动相关功能"""
+    """
+    文件复制/移动ViewModel，专门处理文件复制和移动相关功能
+
+    目标目录在 QML 的 DirectoryPicker 中从本地目录树（DirTreeViewModel）选择；
+    开始操作前用目录树检查目标文件夹是否存在，不必等服务器拒绝。
+    """
     
     # 信号定义
     copyProgressChanged = Signal(int)  # 复制进度信号
@@ -16,10 +25,15 @@ class CopyViewModel(QObject):
     copyStarted = Signal(str)  # 复制开始信号 (operation_type)
     copyCancelled = Signal()  # 复制取消信号
     targetDirectoryChanged = Signal(str)  # 目标目录改变信号
+    targetPickerRequested = Signal()  # 请求 QML 打开目标文件夹选择对话框
+    filesTransferred = Signal(str, list, str)  # 复制/移动成功信号 (operation_type, file_paths, target_directory)
     
-    def __init__(self):
+    def __init__(self, dir_tree: Optional[Callable[[], DirTreeIndex]] = None):
         super().__init__()
         self._copy_api = CopyAPI()
+        self._dir_tree = dir_tree  # 返回当前目录树（DirTreeViewModel.tree），用于检查目标目录
+        self._executor = get_executor()
+        self._current_task = None  # 当前复制/移动任务
         self._copy_progress = 0
         self._is_copying = False
         self._current_operation = ""  # "copy" 或 "move"
@@ -55,8 +69,7 @@ class CopyViewModel(QObject):
         if target_directory:
             self.set_target_directory(target_directory)
         
-        if not self._target_directory:
-            self.copyFinished.emit(False, "请指定目标目录")
+        if not self._check_target("copy"):
             return
         
         self._start_operation("copy")
@@ -71,12 +84,30 @@ class CopyViewModel(QObject):
         if target_directory:
             self.set_target_directory(target_directory)
         
-        if not self._target_directory:
-            self.copyFinished.emit(False, "请指定目标目录")
+        if not self._check_target("move"):
             return
         
         self._start_operation("move")
     
+    def _check_target(self, operation_type: str) -> bool:
+        """用本地目录树检查目标目录：不存在、或把文件夹复制/移动到自身之下时直接报错"""
+        target = self._target_directory
+        if not target:
+            self.copyFinished.emit(False, "请指定目标目录")
+            return False
+        tree = self._dir_tree() if self._dir_tree is not None else None
+        # 目录树尚未加载时交给服务器判断
+        if tree is not None and not tree.is_empty() and target not in tree:
+            self.copyFinished.emit(False, f"目标文件夹不存在: {target}")
+            return False
+        operation_name = "复制" if operation_type == "copy" else "移动"
+        for file_item in self._selected_files:
+            path = file_item.get("relPath", "") if isinstance(file_item, dict) else str(file_item)
+            if path and (target == path or target.startswith(path + "/")):
+                self.copyFinished.emit(False, f"不能把文件夹{operation_name}到它自身之下: {path}")
+                return False
+        return True
+
     def _start_operation(self, operation_type: str):
         """开始复制或移动操作"""
         self._is_copying = True
@@ -101,18 +132,30 @@ class CopyViewModel(QObject):
             self._is_copying = False
             return
         
-        # 调用API执行操作
-        result = self._copy_api.copy_files(
+        # 在后台线程中调用API执行操作
+        target_directory = self._target_directory
+        task = self._executor.submit(
+            self._copy_api.copy_files,
             files=file_paths,
-            to_dir=self._target_directory,
+            to_dir=target_directory,
             action=operation_type
         )
+        task.finished.connect(lambda result, t=task: self._on_operation_result(t, operation_type, file_paths, target_directory, result))
+        task.failed.connect(lambda error, t=task: self._on_operation_result(t, operation_type, file_paths, target_directory, {"success": False, "error": error}))
+        self._current_task = task
+    
+    def _on_operation_result(self, task, operation_type: str, file_paths: list, target_directory: str, result: dict):
+        """处理复制或移动结果（GUI 线程）"""
+        if task is not self._current_task:
+            return
+        self._current_task = None
         
         if result["success"]:
             self._copy_progress = 100
             self.copyProgressChanged.emit(100)
             operation_name = "复制" if operation_type == "copy" else "移动"
             self.copyFinished.emit(True, f"文件{operation_name}成功")
+            self.filesTransferred.emit(operation_type, file_paths, target_directory)
         else:
             error_msg = result.get("error", "操作失败")
             operation_name = "复制" if operation_type == "copy" else "移动"
@@ -124,30 +167,17 @@ class CopyViewModel(QObject):
     
     @Slot()
     def select_target_directory(self):
-        """选择目标目录"""
-        from PySide6.QtWidgets import QFileDialog, QApplication
-        
-        # 获取当前应用实例
-        app = QApplication.instance()
-        if not app:
-            self.copyFinished.emit(False, "无法获取应用程序实例")
-            return
-        
-        # 打开目录选择对话框
-        directory = QFileDialog.getExistingDirectory(
-            None,
-            "选择目标目录",
-            "",
-            QFileDialog.ShowDirsOnly
-        )
-        
-        if directory:
-            self.set_target_directory(directory)
+        """选择目标目录：目标在服务器上，由 QML 打开 DirectoryPicker（查询本地目录树），选择后调用 set_target_directory"""
+        self.targetPickerRequested.emit()
     
     @Slot()
     def cancel_operation(self):
         """取消当前操作"""
         if self._is_copying:
+            if self._current_task is not None:
+                # 已发出的服务器端操作无法撤回，这里只丢弃其结果
+                self._current_task.cancel()
+                self._current_task = None
             self._is_copying = False
             self._current_operation = ""
             self.copyCancelled.emit()
@@ -0,0 +1,199 @@
+from PySide6.QtCore import QObject, Signal, Slot, Property
+import time
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config import config
+from api.file_api import FileAPI
+from api.disk_usage import get_disk_usage
+from api.metadata_store import KIND_CRAWL, get_metadata_store, metadata_scope
+from api.namespace_crawler import NamespaceCrawler, NamespaceSnapshot
+from api.search_index import get_search_index
+from viewmodels.task_executor import TaskExecutor, get_executor
+
+
+class CrawlerViewModel(QObject):
+    """
+    后台遍历ViewModel
+
+    在独立的单线程执行器中遍历整个目录树（NamespaceCrawler），不占用界面使用的线程池；
+    共享执行器中有任务进行时暂停。遍历到的目录写入本地元数据缓存，并收录到搜索索引和空间占用统计，
+    完成后的快照（snapshot）供空间占用统计和重复文件检测使用。
+    """
+
+    progressChanged = Signal()
+    runningChanged = Signal()
+    snapshotChanged = Signal()  # 一次遍历完成，snapshot 已更新
+
+    def __init__(self):
+        super().__init__()
+        self._api = FileAPI()
+        self._executor = TaskExecutor(max_workers=1, parent=self)
+        self._foreground = get_executor()
+        self._metadata_store = get_metadata_store()  # 本地元数据缓存，未启用时为 None
+        self._search_index = get_search_index()
+        self._disk_usage = get_disk_usage()
+        self._username = ""
+        self._crawler = None
+        self._crawl_task = None
+        self._snapshot = NamespaceSnapshot()
+        self._progress = {}
+        self._last_complete = 0.0
+
+    @Slot(str)
+    def set_token(self, token: str):
+        """设置认证 token"""
+        self._api.set_token(token)
+
+    @Slot(str)
+    def set_username(self, username: str):
+        """设置当前登录的用户名；切换用户后停止遍历并丢弃旧快照"""
+        if username == self._username:
+            return
+        self.stop()
+        self._username = username
+        self._snapshot = NamespaceSnapshot()
+        self._progress = {}
+        self._last_complete = 0.0
+        if self._metadata_store is not None:
+            state = self._metadata_store.get_json(metadata_scope(username), KIND_CRAWL, "") or {}
+            self._last_complete = state.get("finished_at") or 0.0
+        self.progressChanged.emit()
+        self.snapshotChanged.emit()
+
+    @Slot()
+    def start_if_enabled(self):
+        """配置了 CRAWL_ENABLED 时开始遍历（登录后调用）"""
+        if config.is_crawl_enabled():
+            self.start()
+
+    @Slot()
+    def start(self):
+        """从根目录开始遍历；已在遍历时忽略"""
+        if self._crawl_task is not None:
+            return
+        scope = metadata_scope(self._username)
+        crawler = NamespaceCrawler(
+            self._api, scope, self._metadata_store,
+            concurrency=config.get_crawl_concurrency(),
+            rate=config.get_crawl_rate(),
+            max_age=config.get_crawl_max_age(),
+            foreground_busy=lambda: self._foreground.active_count() > 0,
+            on_directory=self._on_directory,
+        )
+        task = self._executor.submit_task(self._run_crawl, crawler)
+        task.partial.connect(lambda stats, t=task: self._on_progress(t, stats))
+        task.finished.connect(lambda snapshot, t=task: self._on_crawl_finished(t, snapshot))
+        task.failed.connect(lambda error, t=task: self._on_crawl_failed(t, error))
+        self._crawler = crawler
+        self._crawl_task = task
+        self.runningChanged.emit()
+
+    def _run_crawl(self, future, crawler: NamespaceCrawler) -> NamespaceSnapshot:
+        """在遍历线程中执行"""
+        return crawler.crawl("", future.token, future.report_partial)
+
+    def _on_directory(self, directory: str, files):
+        """遍历到一个目录（遍历线程）：更新搜索索引和空间占用统计"""
+        self._search_index.sync_directory(directory, files)
+        self._disk_usage.update_directory(directory, files)
+
+    @Slot()
+    def pause(self):
+        if self._crawler is not None:
+            self._crawler.pause()
+            self.runningChanged.emit()
+
+    @Slot()
+    def resume(self):
+        if self._crawler is not None:
+            self._crawler.resume()
+            self.runningChanged.emit()
+
+    @Slot()
+    def stop(self):
+        """停止遍历；已遍历的目录保存在本地缓存中，下次遍历不再重复请求"""
+        if self._crawl_task is None:
+            return
+        self._crawl_task.cancel()
+        self._crawl_task = None
+        self._crawler = None
+        self.runningChanged.emit()
+
+    @Slot()
+    def shutdown(self):
+        """退出程序时取消遍历并等待遍历线程结束"""
+        self.stop()
+        self._executor.shutdown()
+
+    def _on_progress(self, task, stats: dict):
+        if task is not self._crawl_task:
+            return
+        self._progress = stats
+        self.progressChanged.emit()
+
+    def _on_crawl_finished(self, task, snapshot: NamespaceSnapshot):
+        if task is not self._crawl_task:
+            return
+        self._crawl_task = None
+        self._progress = dict(self._crawler.stats)
+        self._crawler = None
+        self._snapshot = snapshot
+        self._last_complete = time.time()
+        print(f"后台遍历完成: {self._progress['directories']} 个目录, {self._progress['files']} 个条目, "
+              f"请求 {self._progress['fetched']} 次, 未变化 {self._progress['not_modified']}, "
+              f"使用缓存 {self._progress['cached']}, 失败 {self._progress['errors']}")
+        self.runningChanged.emit()
+        self.progressChanged.emit()
+        self.snapshotChanged.emit()
+
+    def _on_crawl_failed(self, task, error: str):
+        if task is not self._crawl_task:
+            return
+        self._crawl_task = None
+        self._crawler = None
+        print(f"后台遍历失败: {error}")
+        self.runningChanged.emit()
+
+    def snapshot(self) -> NamespaceSnapshot:
+        """最近一次完成的遍历结果"""
+        return self._snapshot
+
+    # 属性定义
+    @Property(bool, notify=runningChanged)
+    def is_running(self):
+        return self._crawl_task is not None
+
+    @Property(bool, notify=runningChanged)
+    def is_paused(self):
+        return self._crawler is not None and self._crawler.is_paused
+
+    @Property(bool, notify=progressChanged)
+    def is_waiting(self):
+        """因手动暂停或界面有请求进行中而等待"""
+        return bool(self._progress.get("paused"))
+
+    @Property(int, notify=progressChanged)
+    def directory_count(self):
+        return self._progress.get("directories", 0)
+
+    @Property(int, notify=progressChanged)
+    def file_count(self):
+        return self._progress.get("files", 0)
+
+    @Property(int, notify=progressChanged)
+    def pending_count(self):
+        """已发现但尚未遍历的目录数"""
+        return self._progress.get("pending", 0)
+
+    @Property(int, notify=progressChanged)
+    def error_count(self):
+        return self._progress.get("errors", 0)
+
+    @Property(float, notify=progressChanged)
+    def last_complete(self):
+        """上次完整遍历结束的时间（Unix 时间戳，0 表示从未完成）"""
+        return self._last_complete
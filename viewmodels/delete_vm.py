@@ -6,6 +6,8 @@ import os
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+from viewmodels.task_executor import get_executor
+
 
 class DeleteViewModel(QObject):
     """文件删除ViewModel，专门处理文件删除相关功能"""
@@ -16,10 +18,13 @@ class DeleteViewModel(QObject):
     deleteStarted = Signal(str)  # 删除开始信号 (operation_info)
     deleteCancelled = Signal()  # 删除取消信号
     confirmationRequested = Signal(list)  # 删除确认请求信号 (files_to_delete)
+    filesDeleted = Signal(list)  # 删除成功信号 (file_paths)
     
     def __init__(self):
         super().__init__()
         self._delete_api = DeleteAPI()
+        self._executor = get_executor()
+        self._current_task = None  # 当前删除任务
         self._delete_progress = 0
         self._is_deleting = False
         self._current_operation_info = ""
@@ -98,13 +103,24 @@ class DeleteViewModel(QObject):
         self.deleteProgressChanged.emit(0)
         self.deleteStarted.emit(self._current_operation_info)
         
-        # 调用API执行删除操作
-        result = self._delete_api.delete_files(files=self._files_to_delete)
+        # 在后台线程中调用API执行删除操作
+        files_to_delete = list(self._files_to_delete)
+        task = self._executor.submit(self._delete_api.delete_files, files=files_to_delete)
+        task.finished.connect(lambda result, t=task: self._on_delete_result(t, files_to_delete, result))
+        task.failed.connect(lambda error, t=task: self._on_delete_result(t, files_to_delete, {"success": False, "error": error}))
+        self._current_task = task
+    
+    def _on_delete_result(self, task, files_to_delete: list, result: dict):
+        """处理删除结果（GUI 线程）"""
+        if task is not self._current_task:
+            return
+        self._current_task = None
         
         if result["success"]:
             self._delete_progress = 100
             self.deleteProgressChanged.emit(100)
-            self.deleteFinished.emit(True, f"成功删除 {len(self._files_to_delete)} 个文件")
+            self.deleteFinished.emit(True, f"成功删除 {len(files_to_delete)} 个文件")
+            self.filesDeleted.emit(files_to_delete)
         else:
             error_msg = result.get("error", "删除失败")
             self.deleteFinished.emit(False, f"删除文件失败: {error_msg}")
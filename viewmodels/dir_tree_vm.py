@@ -0,0 +1,202 @@
+from PySide6.QtCore import QObject, Signal, Slot, Property
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.dirtree_api import DirTreeAPI
+from api.dir_tree import DirTreeIndex, iter_dir_paths
+from api.metadata_store import KIND_DIRTREE, get_metadata_store, metadata_scope
+from api.search_index import get_search_index
+from viewmodels.task_executor import get_executor
+
+
+class DirTreeViewModel(QObject):
+    """
+    目录树ViewModel
+
+    登录后获取一次 /api/getdirtree，路径补全、面包屑跳转和复制/移动的
+    目标目录选择都直接查询本地索引，不再逐级请求 /api/file/files。
+    新建、复制、移动、删除成功后由其他 ViewModel 通知，直接修补索引。
+    """
+
+    treeChanged = Signal()  # 目录树内容变化
+    loadingChanged = Signal()
+    errorChanged = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self._api = DirTreeAPI()
+        self._executor = get_executor()
+        self._metadata_store = get_metadata_store()  # 本地元数据缓存，未启用时为 None
+        self._search_index = get_search_index()
+        self._tree = DirTreeIndex()
+        self._version = 0  # 替换或修补目录树时递增
+        self._load_task = None
+        self._persisted_task = None  # 正在读取本地缓存中的目录树
+        self._username = ""
+        self._is_loading = False
+        self._error_message = ""
+
+    @Slot(str)
+    def set_token(self, token: str):
+        """设置认证 token"""
+        self._api.set_token(token)
+
+    @Slot(str)
+    def set_username(self, username: str):
+        """设置当前登录的用户名；切换用户后丢弃旧的目录树"""
+        if username == self._username:
+            return
+        self._username = username
+        if self._load_task is not None:
+            self._load_task.cancel()
+            self._load_task = None
+        if self._persisted_task is not None:
+            self._persisted_task.cancel()
+            self._persisted_task = None
+        self._set_tree(DirTreeIndex())
+
+    @Slot()
+    def load_tree(self):
+        """获取目录树；本地缓存中有上次的目录树时先使用缓存"""
+        scope = metadata_scope(self._username)
+        if self._tree.is_empty() and self._metadata_store is not None and self._persisted_task is None:
+            persisted = self._executor.submit(self._read_persisted_tree, scope)
+            persisted.finished.connect(lambda tree, t=persisted: self._on_persisted_tree(t, tree))
+            persisted.failed.connect(lambda error, t=persisted: self._on_persisted_tree(t, None))
+            self._persisted_task = persisted
+        task = self._executor.submit_shared(("dirtree", scope), self._fetch_tree, scope)
+        if task is None:
+            return
+        task.finished.connect(lambda result, t=task: self._on_tree_loaded(t, result))
+        task.failed.connect(lambda error, t=task: self._on_tree_loaded(t, {"success": False, "error": error}))
+        self._load_task = task
+        self._set_loading(True)
+
+    def _read_persisted_tree(self, scope: str):
+        """在工作线程中读取本地元数据缓存中的目录树并建立索引，没有缓存时返回 None"""
+        dirs = self._metadata_store.get_json(scope, KIND_DIRTREE, "")
+        if dirs is None:
+            return None
+        self._search_index.add_many(iter_dir_paths(dirs))
+        return DirTreeIndex(dirs)
+
+    def _on_persisted_tree(self, task, tree):
+        """缓存的目录树读取完成（GUI 线程）；服务器的目录树已经到达时丢弃"""
+        if task is not self._persisted_task:
+            return
+        self._persisted_task = None
+        if tree is not None and self._tree.is_empty():
+            self._set_tree(tree)
+
+    def _fetch_tree(self, scope: str) -> dict:
+        """在工作线程中获取目录树并写入本地元数据缓存"""
+        result = self._api.get_dir_tree()
+        if result["success"]:
+            dirs = (result["data"] or {}).get("dirs") or []
+            if self._metadata_store is not None:
+                self._metadata_store.put_json(scope, KIND_DIRTREE, "", dirs)
+            self._search_index.add_many(iter_dir_paths(dirs))
+            result["tree"] = DirTreeIndex(dirs)
+        return result
+
+    def _on_tree_loaded(self, task, result: dict):
+        """处理目录树加载结果（GUI 线程）"""
+        if task is not self._load_task:
+            return
+        self._load_task = None
+        if result["success"]:
+            if self._persisted_task is not None:
+                self._persisted_task.cancel()  # 服务器结果优先
+                self._persisted_task = None
+            self._error_message = ""
+            self._set_tree(result["tree"])
+        else:
+            self._error_message = result.get("error") or "获取目录树失败"
+            print(f"获取目录树失败: {self._error_message}")
+        self.errorChanged.emit()
+        self._set_loading(False)
+
+    def _set_tree(self, tree: DirTreeIndex):
+        self._tree = tree
+        self._notify_tree_changed()
+
+    def _notify_tree_changed(self):
+        self._version += 1
+        self.treeChanged.emit()
+
+    def _set_loading(self, loading: bool):
+        if self._is_loading != loading:
+            self._is_loading = loading
+            self.loadingChanged.emit()
+
+    def tree(self) -> DirTreeIndex:
+        return self._tree
+
+    # ---- 查询（供 QML 使用） ----
+
+    @Slot(str, result=list)
+    def children(self, path: str):
+        """列出 path 下的子文件夹：[{path, title, hasChildren}]"""
+        return [
+            {"path": node.path, "title": node.title, "hasChildren": node.has_children}
+            for node in self._tree.children(path)
+        ]
+
+    @Slot(str, result=list)
+    def breadcrumbs(self, path: str):
+        """从顶层到 path 的各级文件夹：[{path, title}]"""
+        return [{"path": node.path, "title": node.title} for node in self._tree.ancestors(path)]
+
+    @Slot(str, result=list)
+    def complete(self, text: str):
+        """路径补全候选"""
+        return self._tree.complete(text)
+
+    @Slot(str, result=bool)
+    def contains(self, path: str):
+        """path 是否为已知的文件夹"""
+        return path in self._tree
+
+    # ---- 修补（由其他 ViewModel 在操作成功后调用） ----
+
+    @Slot(str)
+    def add_folder(self, path: str):
+        """新建文件夹成功"""
+        if self._tree.add(path):
+            self._notify_tree_changed()
+
+    @Slot(list)
+    def remove_paths(self, paths: list):
+        """删除成功；不是文件夹的路径会被忽略"""
+        changed = False
+        for path in paths:
+            changed = self._tree.remove(path) or changed
+        if changed:
+            self._notify_tree_changed()
+
+    @Slot(str, list, str)
+    def transfer_paths(self, operation: str, paths: list, to_dir: str):
+        """复制 (copy) 或移动 (move) 成功"""
+        transfer = self._tree.move if operation == "move" else self._tree.copy
+        changed = False
+        for path in paths:
+            changed = transfer(path, to_dir) or changed
+        if changed:
+            self._notify_tree_changed()
+
+    # 属性定义
+    @Property(int, notify=treeChanged)
+    def version(self):
+        """目录树版本，QML 绑定可据此重新查询"""
+        return self._version
+
+    @Property(bool, notify=loadingChanged)
+    def is_loading(self):
+        return self._is_loading
+
+    @Property(str, notify=errorChanged)
+    def error_message(self):
+        return self._error_message
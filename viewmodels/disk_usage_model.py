@@ -0,0 +1,72 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal, Slot, Property
+from typing import Dict, List, Optional
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.file_entries import format_size
+
+
+class DiskUsageModel(QAbstractListModel):
+    """
+    空间占用模型（矩形树图 / 旭日图）
+
+    每行是当前目录的一个组成部分：子文件夹，或"当前目录中的文件"合并成的一项。
+    x、y、w、h 为矩形树图中的位置（0~1 的比例，乘以视图宽高即可），
+    fraction 为占当前目录的比例，可直接用作旭日图的角度。
+    """
+
+    countChanged = Signal()
+
+    ROLE_NAMES = ("name", "relPath", "size", "sizeText", "fileCount", "fraction",
+                  "isDir", "complete", "x", "y", "w", "h")
+    _ROLES = {Qt.UserRole + 1 + i: name for i, name in enumerate(ROLE_NAMES)}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items: List[Dict] = []
+
+    # ---- QAbstractListModel 接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+        item = self._items[index.row()]
+        name = self._ROLES.get(role, "name" if role == Qt.DisplayRole else None)
+        if name == "sizeText":
+            return format_size(item["size"])
+        return item.get(name) if name else None
+
+    def roleNames(self):
+        return {role: name.encode("utf-8") for role, name in self._ROLES.items()}
+
+    # ---- 内容更新 ----
+
+    def set_items(self, items: List[Dict]):
+        """替换全部内容（items 中的键与 ROLE_NAMES 对应）"""
+        self.beginResetModel()
+        self._items = items
+        self.endResetModel()
+        self.countChanged.emit()
+
+    def item_at(self, row: int) -> Optional[Dict]:
+        if not 0 <= row < len(self._items):
+            return None
+        return self._items[row]
+
+    @Slot(int, result='QVariantMap')
+    def get(self, row: int):
+        """供 QML 读取整行数据"""
+        item = self.item_at(row)
+        return dict(item, sizeText=format_size(item["size"])) if item else {}
+
+    @Property(int, notify=countChanged)
+    def count(self):
+        return len(self._items)
@@ -0,0 +1,156 @@
+from PySide6.QtCore import QObject, QTimer, Signal, Slot, Property
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.disk_usage import get_disk_usage, squarify
+from api.file_entries import format_size
+from viewmodels.disk_usage_model import DiskUsageModel
+
+REFRESH_INTERVAL_MS = 300  # 统计变化后最多这么久刷新一次模型
+MAX_ITEMS = 100  # 超出的小文件夹合并为"其他"一项
+FILES_ITEM = "__files__"  # 当前目录中的文件合并成的一项
+OTHER_ITEM = "__other__"
+
+
+class DiskUsageViewModel(QObject):
+    """
+    空间占用ViewModel
+
+    统计数据（get_disk_usage）由后台遍历和目录加载时增量更新，
+    这里只在数据版本变化时为当前目录重新生成模型，不重新汇总。
+    """
+
+    rootChanged = Signal()
+    usageChanged = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self._tree = get_disk_usage()
+        self._model = DiskUsageModel(self)
+        self._root = ""
+        self._username = ""
+        self._shown_version = -1
+        self._total_size = 0
+        self._file_count = 0
+        self._unlisted = 0
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    @Slot(str)
+    def set_username(self, username: str):
+        """切换用户后清空统计"""
+        if username != self._username:
+            self._username = username
+            self._tree.clear()
+            self._root = ""
+            self.rootChanged.emit()
+            self.refresh()
+
+    @Slot()
+    def schedule_refresh(self):
+        """统计可能有变化（遍历进度、目录加载），合并后刷新"""
+        if self._tree.version != self._shown_version and not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    @Slot()
+    def refresh(self):
+        """按当前统计重新生成当前目录的模型"""
+        self._shown_version = self._tree.version
+        usage = self._tree.usage(self._root)
+        breakdown = self._tree.breakdown(self._root)
+        if usage is None or breakdown is None:
+            self._total_size, self._file_count, self._unlisted = 0, 0, 0
+            self._model.set_items([])
+            self.usageChanged.emit()
+            return
+        self._total_size, self._file_count, self._unlisted = usage
+        (own_bytes, own_files), children = breakdown
+
+        items = [self._make_item(path.rpartition("/")[2], path, size, files, True, unlisted == 0)
+                 for path, size, files, unlisted in children[:MAX_ITEMS]]
+        rest = children[MAX_ITEMS:]
+        if rest:
+            items.append(self._make_item(f"其他 {len(rest)} 个文件夹", OTHER_ITEM,
+                                         sum(item[1] for item in rest), sum(item[2] for item in rest),
+                                         False, all(item[3] == 0 for item in rest)))
+        if own_files:
+            items.append(self._make_item("当前目录中的文件", FILES_ITEM, own_bytes, own_files, False, True))
+        items.sort(key=lambda item: item["size"], reverse=True)
+
+        rects = squarify([item["size"] for item in items])
+        for item, (x, y, w, h) in zip(items, rects):
+            item.update(x=x, y=y, w=w, h=h)
+        self._model.set_items(items)
+        self.usageChanged.emit()
+
+    def _make_item(self, name: str, path: str, size: int, files: int, is_dir: bool, complete: bool) -> dict:
+        return {"name": name, "relPath": path, "size": size, "fileCount": files,
+                "fraction": size / self._total_size if self._total_size else 0.0,
+                "isDir": is_dir, "complete": complete}
+
+    @Slot(str)
+    def open_directory(self, path: str):
+        """查看某个文件夹的组成"""
+        if path in (FILES_ITEM, OTHER_ITEM) or path == self._root:
+            return
+        self._root = path
+        self.rootChanged.emit()
+        self.refresh()
+
+    @Slot()
+    def go_up(self):
+        if self._root:
+            self.open_directory(self._root.rpartition("/")[0])
+
+    @Slot(list)
+    def remove_paths(self, paths: list):
+        """删除成功后移除其中的文件夹；文件的大小在所在目录重新加载时更新"""
+        changed = False
+        for path in paths:
+            changed = self._tree.remove(path) or changed
+        if changed:
+            self.schedule_refresh()
+
+    @Slot(str, list, str)
+    def transfer_paths(self, operation: str, paths: list, to_dir: str):
+        """移动成功后移除旧位置；新位置在目标目录重新加载时统计"""
+        if operation == "move":
+            self.remove_paths(paths)
+
+    # 属性定义
+    @Property(QObject, constant=True)
+    def model(self):
+        """当前目录的组成（QAbstractListModel）"""
+        return self._model
+
+    @Property(str, notify=rootChanged)
+    def root(self):
+        return self._root
+
+    @Property(float, notify=usageChanged)
+    def total_size(self):
+        return float(self._total_size)
+
+    @Property(str, notify=usageChanged)
+    def total_size_text(self):
+        return format_size(self._total_size)
+
+    @Property(int, notify=usageChanged)
+    def file_count(self):
+        return self._file_count
+
+    @Property(bool, notify=usageChanged)
+    def is_complete(self):
+        """当前目录下的所有文件夹都已获取过列表，合计为准确值"""
+        return self._unlisted == 0
+
+    @Property(int, notify=usageChanged)
+    def unlisted_count(self):
+        """当前目录下尚未获取列表的文件夹数"""
+        return self._unlisted
@@ -6,6 +6,8 @@ import os
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+from viewmodels.task_executor import get_executor
+
 
 class DownloadViewModel(QObject):
     """文件下载ViewModel，处理文件下载相关功能"""
@@ -19,6 +21,8 @@ class DownloadViewModel(QObject):
     def __init__(self):
         super().__init__()
         self._download_api = DownloadAPI()
+        self._executor = get_executor()
+        self._current_task = None  # 当前下载任务
         self._download_progress = 0
         self._is_downloading = False
         self._current_download_file = ""
@@ -52,6 +56,10 @@ class DownloadViewModel(QObject):
             self.downloadFinished.emit(False, "文件路径不能为空")
             return
         
+        if self._is_downloading:
+            self.downloadFinished.emit(False, "已有文件正在下载，请稍后再试")
+            return
+        
         filename = os.path.basename(relpath)
         
         # 如果没有提供保存路径，使用默认路径
@@ -61,7 +69,7 @@ class DownloadViewModel(QObject):
         self._perform_download(relpath, save_path)
 
     def _perform_download(self, relpath: str, save_path: str):
-        """执行实际的下载操作"""
+        """在后台线程中执行实际的下载操作"""
         self._is_downloading = True
         self._download_progress = 0
         self._current_download_file = os.path.basename(relpath)
@@ -72,7 +80,29 @@ class DownloadViewModel(QObject):
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
         
         # 调用下载API
-        result = self._download_api.download_file(relpath, save_path)
+        task = self._executor.submit_task(
+            lambda t: self._download_api.download_file(
+                relpath, save_path,
+                cancel_token=t.token,
+                progress_callback=t.report_progress
+            )
+        )
+        task.progress.connect(self._on_download_progress)
+        task.finished.connect(lambda result, t=task: self._on_download_result(t, result, save_path))
+        task.failed.connect(lambda error, t=task: self._on_download_result(t, {"success": False, "error": error}, save_path))
+        self._current_task = task
+    
+    def _on_download_progress(self, progress: int):
+        """处理下载进度（GUI 线程）"""
+        if self._is_downloading:
+            self._download_progress = progress
+            self.downloadProgressChanged.emit(progress)
+    
+    def _on_download_result(self, task, result: dict, save_path: str):
+        """处理下载结果（GUI 线程）"""
+        if task is not self._current_task:
+            return
+        self._current_task = None
         
         if result["success"]:
             self._download_progress = 100
@@ -157,6 +187,10 @@ class DownloadViewModel(QObject):
     def cancel_current_download(self):
         """取消当前下载"""
         if self._is_downloading:
+            if self._current_task is not None:
+                # 取消令牌会关闭连接并删除未完成的文件
+                self._current_task.cancel()
+                self._current_task = None
             self._is_downloading = False
             self._current_download_file = ""
             self.downloadCancelled.emit()
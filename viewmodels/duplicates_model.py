@@ -0,0 +1,147 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal, Slot, Property
+from typing import Dict, List, Tuple
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.file_entries import TYPE_NAMES, file_type_code, format_size
+
+
+class DuplicatesModel(QAbstractListModel):
+    """
+    重复文件模型
+
+    每行是一个文件，同组的文件相邻排列（group 相同）；firstInGroup 用于 QML 显示分组标题。
+    selected 表示勾选为待删除，默认每组保留第一个文件、勾选其余文件。
+    """
+
+    countChanged = Signal()
+    selectionChanged = Signal()
+
+    ROLE_NAMES = ("name", "relPath", "parentPath", "size", "sizeText", "type",
+                  "group", "groupCount", "firstInGroup", "selected")
+    _ROLES = {Qt.UserRole + 1 + i: name for i, name in enumerate(ROLE_NAMES)}
+    _SELECTED_ROLE = Qt.UserRole + 1 + ROLE_NAMES.index("selected")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Tuple[str, int, int, int]] = []  # (路径, 大小, 组号, 组内序号)
+        self._group_counts: List[int] = []
+        self._selected: List[bool] = []
+
+    # ---- QAbstractListModel 接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        row = index.row()
+        path, size, group, position = self._rows[row]
+        name = self._ROLES.get(role, "name" if role == Qt.DisplayRole else None)
+        if name == "name":
+            return path.rpartition("/")[2]
+        if name == "relPath":
+            return path
+        if name == "parentPath":
+            return path.rpartition("/")[0]
+        if name == "size":
+            return float(size)
+        if name == "sizeText":
+            return format_size(size)
+        if name == "type":
+            return TYPE_NAMES[file_type_code(path.rpartition("/")[2], False)]
+        if name == "group":
+            return group
+        if name == "groupCount":
+            return self._group_counts[group]
+        if name == "firstInGroup":
+            return position == 0
+        if name == "selected":
+            return self._selected[row]
+        return None
+
+    def roleNames(self):
+        return {role: name.encode("utf-8") for role, name in self._ROLES.items()}
+
+    # ---- 内容更新 ----
+
+    def set_groups(self, groups: List[Tuple[int, List[str]]]):
+        """替换为新的查找结果 [(大小, [路径...])]，每组默认勾选除第一个以外的文件"""
+        self.beginResetModel()
+        self._rows = [(path, size, group, position)
+                      for group, (size, paths) in enumerate(groups)
+                      for position, path in enumerate(paths)]
+        self._group_counts = [len(paths) for _, paths in groups]
+        self._selected = [position > 0 for _, _, _, position in self._rows]
+        self.endResetModel()
+        self.countChanged.emit()
+        self.selectionChanged.emit()
+
+    def remove_paths(self, paths: List[str]):
+        """删除成功后移除对应的行；只剩一个文件的组整组移除"""
+        removed = set(paths)
+        if not any(path in removed for path, _, _, _ in self._rows):
+            return
+        groups: Dict[int, Tuple[int, List[str]]] = {}
+        for path, size, group, _ in self._rows:
+            if path not in removed:
+                groups.setdefault(group, (size, []))[1].append(path)
+        selected = {path for (path, _, _, _), chosen in zip(self._rows, self._selected) if chosen}
+        self.set_groups([group for _, group in sorted(groups.items()) if len(group[1]) > 1])
+        self._selected = [path in selected for path, _, _, _ in self._rows]
+        self.selectionChanged.emit()
+
+    def clear(self):
+        self.set_groups([])
+
+    # ---- 勾选 ----
+
+    @Slot(int)
+    def toggle(self, row: int):
+        if not 0 <= row < len(self._rows):
+            return
+        self._selected[row] = not self._selected[row]
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [self._SELECTED_ROLE])
+        self.selectionChanged.emit()
+
+    @Slot()
+    def select_duplicates(self):
+        """每组保留第一个文件，勾选其余文件"""
+        self._select([position > 0 for _, _, _, position in self._rows])
+
+    @Slot()
+    def clear_selection(self):
+        self._select([False] * len(self._rows))
+
+    def _select(self, selected: List[bool]):
+        self._selected = selected
+        if self._rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1), [self._SELECTED_ROLE])
+        self.selectionChanged.emit()
+
+    def selected_files(self) -> List[Dict]:
+        """勾选的文件，格式与 DeleteViewModel.set_selected_files 一致"""
+        return [{"relPath": path, "name": path.rpartition("/")[2]}
+                for (path, _, _, _), chosen in zip(self._rows, self._selected) if chosen]
+
+    def selected_size(self) -> int:
+        return sum(size for (_, size, _, _), chosen in zip(self._rows, self._selected) if chosen)
+
+    def whole_group_selected(self) -> bool:
+        """是否有某组的所有文件都被勾选（删除后将不留任何副本）"""
+        remaining = list(self._group_counts)
+        for (_, _, group, _), chosen in zip(self._rows, self._selected):
+            if chosen:
+                remaining[group] -= 1
+        return any(count == 0 for count in remaining)
+
+    @Property(int, notify=countChanged)
+    def count(self):
+        return len(self._rows)
@@ -0,0 +1,213 @@
+from PySide6.QtCore import QObject, Signal, Slot, Property
+from typing import Callable, Optional
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from config import config
+from api.download_api import DownloadAPI
+from api.duplicate_finder import DuplicateFinder
+from api.file_entries import format_size
+from api.metadata_store import get_metadata_store, metadata_scope
+from api.namespace_crawler import NamespaceSnapshot
+from viewmodels.duplicates_model import DuplicatesModel
+from viewmodels.task_executor import TaskExecutor
+
+
+class DuplicatesViewModel(QObject):
+    """
+    重复文件ViewModel
+
+    在后台遍历得到的快照（snapshot_provider）上查找重复文件，查找在独立的单线程执行器中进行。
+    勾选的文件通过 deleteRequested 交给 DeleteViewModel 确认并删除。
+    """
+
+    runningChanged = Signal()
+    progressChanged = Signal()
+    selectionChanged = Signal()
+    errorChanged = Signal()
+    deleteRequested = Signal(list)  # 请求删除勾选的文件 ([{relPath, name}])
+
+    def __init__(self, snapshot_provider: Optional[Callable[[], NamespaceSnapshot]] = None):
+        super().__init__()
+        self._api = DownloadAPI()
+        self._executor = TaskExecutor(max_workers=1, parent=self)
+        self._metadata_store = get_metadata_store()  # 本地元数据缓存，未启用时为 None
+        self._snapshot_provider = snapshot_provider or NamespaceSnapshot
+        self._model = DuplicatesModel(self)
+        self._model.selectionChanged.connect(self.selectionChanged)
+        self._username = ""
+        self._finder = None
+        self._find_task = None
+        self._progress = {}
+        self._error_message = ""
+
+    @Slot(str)
+    def set_token(self, token: str):
+        """设置认证 token"""
+        self._api.set_token(token)
+
+    @Slot(str)
+    def set_username(self, username: str):
+        """切换用户后停止查找并清空结果"""
+        if username == self._username:
+            return
+        self.stop()
+        self._username = username
+        self._progress = {}
+        self._model.clear()
+        self.progressChanged.emit()
+
+    @Slot()
+    def start(self):
+        """在最近一次完整遍历的快照上查找重复文件"""
+        if self._find_task is not None:
+            return
+        snapshot = self._snapshot_provider()
+        if not len(snapshot):
+            self._set_error("还没有完整的文件列表，请先完成一次后台遍历")
+            return
+        self._set_error("")
+        files = [(entries.rel_path(row), entries.size(row), entries.mtime(row))
+                 for entries, row in snapshot.iter_files()]
+        finder = DuplicateFinder(self._api, metadata_scope(self._username), self._metadata_store,
+                                 workers=config.get_duplicate_workers())
+        task = self._executor.submit_task(self._run_finder, finder, files)
+        task.partial.connect(lambda stats, t=task: self._on_progress(t, stats))
+        task.finished.connect(lambda groups, t=task: self._on_finished(t, groups))
+        task.failed.connect(lambda error, t=task: self._on_failed(t, error))
+        self._finder = finder
+        self._find_task = task
+        self._model.clear()
+        self.runningChanged.emit()
+
+    def _run_finder(self, future, finder: DuplicateFinder, files: list) -> list:
+        """在查找线程中执行"""
+        return finder.find(files, future.token, future.report_partial)
+
+    @Slot()
+    def stop(self):
+        """停止查找；已算出的摘要保存在本地缓存中，下次查找不再重复下载"""
+        if self._find_task is None:
+            return
+        self._find_task.cancel()
+        self._find_task = None
+        self._finder = None
+        self.runningChanged.emit()
+
+    @Slot()
+    def shutdown(self):
+        """退出程序时取消查找并等待查找线程结束"""
+        self.stop()
+        self._executor.shutdown()
+
+    def _on_progress(self, task, stats: dict):
+        if task is not self._find_task:
+            return
+        self._progress = stats
+        self.progressChanged.emit()
+
+    def _on_finished(self, task, groups: list):
+        if task is not self._find_task:
+            return
+        self._find_task = None
+        self._progress = dict(self._finder.stats)
+        self._finder = None
+        self._model.set_groups(groups)
+        print(f"重复文件查找完成: {len(groups)} 组, 读取 {format_size(self._progress['bytes_read'])} / "
+              f"共 {format_size(self._progress['bytes_listed'])}, 使用缓存 {self._progress['cached']}, "
+              f"失败 {self._progress['errors']}")
+        self.runningChanged.emit()
+        self.progressChanged.emit()
+
+    def _on_failed(self, task, error: str):
+        if task is not self._find_task:
+            return
+        self._find_task = None
+        self._finder = None
+        self._set_error(f"查找重复文件失败: {error}")
+        self.runningChanged.emit()
+
+    def _set_error(self, message: str):
+        if message != self._error_message:
+            self._error_message = message
+            self.errorChanged.emit()
+
+    # ---- 勾选与删除 ----
+
+    @Slot(int)
+    def toggle_selection(self, row: int):
+        self._model.toggle(row)
+
+    @Slot()
+    def select_duplicates(self):
+        """每组保留一个文件，勾选其余文件"""
+        self._model.select_duplicates()
+
+    @Slot()
+    def clear_selection(self):
+        self._model.clear_selection()
+
+    @Slot()
+    def delete_selected(self):
+        """把勾选的文件交给 DeleteViewModel（由其请求确认）"""
+        files = self._model.selected_files()
+        if files:
+            self.deleteRequested.emit(files)
+
+    @Slot(list)
+    def remove_paths(self, paths: list):
+        """删除成功后从结果中移除"""
+        self._model.remove_paths(paths)
+
+    # 属性定义
+    @Property(QObject, constant=True)
+    def model(self):
+        """重复文件模型（QAbstractListModel）"""
+        return self._model
+
+    @Property(bool, notify=runningChanged)
+    def is_running(self):
+        return self._find_task is not None
+
+    @Property(int, notify=progressChanged)
+    def candidate_count(self):
+        """大小与其他文件相同、需要读取内容比较的文件数"""
+        return self._progress.get("candidates", 0)
+
+    @Property(int, notify=progressChanged)
+    def hashed_count(self):
+        return self._progress.get("hashed", 0)
+
+    @Property(int, notify=progressChanged)
+    def total_to_hash(self):
+        return self._progress.get("to_hash", 0)
+
+    @Property(str, notify=progressChanged)
+    def bytes_read_text(self):
+        """已下载的字节数（通常只占全部文件大小的很小一部分）"""
+        return format_size(self._progress.get("bytes_read", 0))
+
+    @Property(int, notify=progressChanged)
+    def group_count(self):
+        return self._progress.get("groups", 0)
+
+    @Property(int, notify=selectionChanged)
+    def selected_count(self):
+        return len(self._model.selected_files())
+
+    @Property(str, notify=selectionChanged)
+    def selected_size_text(self):
+        """勾选的文件删除后可释放的空间"""
+        return format_size(self._model.selected_size())
+
+    @Property(bool, notify=selectionChanged)
+    def deletes_all_copies(self):
+        """勾选中包含某组的全部文件，删除后将不留副本"""
+        return self._model.whole_group_selected()
+
+    @Property(str, notify=errorChanged)
+    def error_message(self):
+        return self._error_message
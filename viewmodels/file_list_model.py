@@ -0,0 +1,253 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal, Slot, Property
+from typing import Dict, List, Optional
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.file_entries import FileEntries
+
+
+class FileListModel(QAbstractListModel):
+    """
+    文件列表模型
+
+    以命名角色向 QML 暴露文件条目，选择状态的变化只通知受影响的行，
+    重新验证后的列表通过增量的插入/删除/更新通知应用，避免整表重建。
+    条目保存在紧凑的 FileEntries 中，大小和日期字符串只在 QML 读取
+    可见行时才格式化。
+    """
+
+    countChanged = Signal()
+    selectionChanged = Signal()
+
+    # 角色名与 FileAPI.transform_file_data 的字段一一对应
+    ROLE_NAMES = (
+        "name", "relPath", "isDir", "isPublic", "size", "sizeBytes",
+        "updatedAt", "rawUpdatedAt", "selected", "type",
+    )
+    _ROLES = {Qt.UserRole + 1 + i: name for i, name in enumerate(ROLE_NAMES)}
+    _ROLE_BY_NAME = {name: role for role, name in _ROLES.items()}
+    SelectedRole = _ROLE_BY_NAME["selected"]
+
+    # 各角色对应的 FileEntries 访问方法
+    _ROLE_GETTERS = {
+        _ROLE_BY_NAME["name"]: FileEntries.name,
+        _ROLE_BY_NAME["relPath"]: FileEntries.rel_path,
+        _ROLE_BY_NAME["isDir"]: FileEntries.is_dir,
+        _ROLE_BY_NAME["isPublic"]: FileEntries.is_public,
+        _ROLE_BY_NAME["size"]: FileEntries.display_size,
+        _ROLE_BY_NAME["sizeBytes"]: FileEntries.size,
+        _ROLE_BY_NAME["updatedAt"]: FileEntries.display_date,
+        _ROLE_BY_NAME["rawUpdatedAt"]: FileEntries.raw_date,
+        _ROLE_BY_NAME["type"]: FileEntries.type_name,
+        Qt.DisplayRole: FileEntries.name,
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._files = FileEntries()
+        self._selected_rows = set()
+
+    # ---- QAbstractListModel 接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._files)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._files):
+            return None
+        row = index.row()
+        if role == self.SelectedRole:
+            return row in self._selected_rows
+        getter = self._ROLE_GETTERS.get(role)
+        if getter is None:
+            return None
+        return getter(self._files, row)
+
+    def roleNames(self):
+        return {role: name.encode("utf-8") for role, name in self._ROLES.items()}
+
+    # ---- 内容更新 ----
+
+    def set_files(self, files: FileEntries):
+        """整体替换内容（切换目录时使用），选择状态清空"""
+        old_count = len(self._files)
+        had_selection = bool(self._selected_rows)
+        self.beginResetModel()
+        self._files = files.copy()  # 模型会原地修改，不能与缓存共享
+        self._selected_rows = set()
+        self.endResetModel()
+        if old_count != len(self._files):
+            self.countChanged.emit()
+        if had_selection:
+            self.selectionChanged.emit()
+
+    def append_files(self, files: FileEntries):
+        """在末尾追加条目（流式加载时逐批使用）"""
+        if not len(files):
+            return
+        first = len(self._files)
+        self.beginInsertRows(QModelIndex(), first, first + len(files) - 1)
+        self._files.extend(files)
+        self.endInsertRows()
+        self.countChanged.emit()
+        if self._selected_rows:
+            self.selectionChanged.emit()
+
+    def update_files(self, files: FileEntries):
+        """
+        按 relPath 增量应用新列表（同一目录重新验证后使用）
+
+        删除消失的行、插入新增的行、只对内容变化的行发出 dataChanged，
+        保留选中状态；若已有条目的相对顺序变化则退化为整体重置。
+        """
+        new_keys = [files.rel_path(i) for i in range(len(files))]
+        new_key_set = set(new_keys)
+        if len(new_key_set) != len(new_keys):
+            self._reset_keep_selection(files)
+            return
+
+        old_count = len(self._files)
+        old_selected = len(self._selected_rows)
+
+        # 1. 删除新列表中不存在的行（从后往前，连续的行合并为一次通知）
+        row = len(self._files) - 1
+        while row >= 0:
+            if self._files.rel_path(row) in new_key_set:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and self._files.rel_path(row) not in new_key_set:
+                row -= 1
+            first = row + 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._files.delete_rows(first, last)
+            removed = last - first + 1
+            self._selected_rows = {
+                r if r < first else r - removed
+                for r in self._selected_rows if not first <= r <= last
+            }
+            self.endRemoveRows()
+
+        # 剩余条目的相对顺序必须与新列表一致，否则无法只靠插入完成
+        new_position = {key: i for i, key in enumerate(new_keys)}
+        positions = [new_position[self._files.rel_path(i)] for i in range(len(self._files))]
+        if any(a > b for a, b in zip(positions, positions[1:])):
+            self._reset_keep_selection(files)
+            return
+
+        # 2. 插入新增的行，并更新内容变化的行
+        for i, key in enumerate(new_keys):
+            if i < len(self._files) and self._files.rel_path(i) == key:
+                if self._files.row_key(i) != files.row_key(i):
+                    self._files.replace_row(i, files, i)
+                    index = self.index(i)
+                    self.dataChanged.emit(index, index)
+                continue
+            self.beginInsertRows(QModelIndex(), i, i)
+            self._files.insert_row(i, files, i)
+            self._selected_rows = {r if r < i else r + 1 for r in self._selected_rows}
+            self.endInsertRows()
+
+        if old_count != len(self._files):
+            self.countChanged.emit()
+        # 行数或选中数变化都会影响“全选/部分选中”的判断
+        if old_selected != len(self._selected_rows) or (old_count != len(self._files) and self._selected_rows):
+            self.selectionChanged.emit()
+
+    def _reset_keep_selection(self, files: FileEntries):
+        selected_keys = {self._files.rel_path(row) for row in self._selected_rows}
+        old_count = len(self._files)
+        self.beginResetModel()
+        self._files = files.copy()
+        self._selected_rows = set()
+        self.endResetModel()
+        self._restore_selection(selected_keys)
+        if old_count != len(self._files):
+            self.countChanged.emit()
+
+    def _restore_selection(self, selected_keys: set):
+        before = len(self._selected_rows)
+        self._selected_rows = {
+            row for row in range(len(self._files)) if self._files.rel_path(row) in selected_keys
+        }
+        if before or self._selected_rows:
+            self.selectionChanged.emit()
+
+    # ---- 选择状态 ----
+
+    def set_selected(self, row: int, selected: bool) -> bool:
+        """设置单行选择状态，只通知该行；返回状态是否发生变化"""
+        if not 0 <= row < len(self._files):
+            return False
+        if (row in self._selected_rows) == selected:
+            return False
+        if selected:
+            self._selected_rows.add(row)
+        else:
+            self._selected_rows.discard(row)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [self.SelectedRole])
+        self.selectionChanged.emit()
+        return True
+
+    def select_only(self, row: int):
+        """只选中指定行，仅通知之前选中的行和该行"""
+        if not 0 <= row < len(self._files):
+            return
+        for other in list(self._selected_rows):
+            if other != row:
+                self._selected_rows.discard(other)
+                index = self.index(other)
+                self.dataChanged.emit(index, index, [self.SelectedRole])
+        if row not in self._selected_rows:
+            self._selected_rows.add(row)
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [self.SelectedRole])
+        self.selectionChanged.emit()
+
+    def select_all(self, selected: bool) -> bool:
+        """全选/取消全选，只发出一次覆盖全部行的通知"""
+        if not self._files:
+            return False
+        target = set(range(len(self._files))) if selected else set()
+        if target == self._selected_rows:
+            return False
+        self._selected_rows = target
+        self.dataChanged.emit(self.index(0), self.index(len(self._files) - 1), [self.SelectedRole])
+        self.selectionChanged.emit()
+        return True
+
+    def is_selected(self, row: int) -> bool:
+        return row in self._selected_rows
+
+    def selected_count(self) -> int:
+        return len(self._selected_rows)
+
+    def selected_files(self) -> List[Dict]:
+        """按行顺序返回选中的文件条目（含 selected 字段）"""
+        return [dict(self._files.to_dict(row), selected=True) for row in sorted(self._selected_rows)]
+
+    def file_at(self, row: int) -> Optional[Dict]:
+        if 0 <= row < len(self._files):
+            return self._files.to_dict(row)
+        return None
+
+    def files(self) -> FileEntries:
+        return self._files
+
+    @Slot(int, result='QVariantMap')
+    def get(self, row: int):
+        """供 QML 读取整行数据"""
+        file_item = self.file_at(row)
+        if file_item is None:
+            return {}
+        return dict(file_item, selected=row in self._selected_rows)
+
+    @Property(int, notify=countChanged)
+    def count(self):
+        return len(self._files)
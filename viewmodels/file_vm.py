@@ -11,21 +11,44 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from config import config
+from viewmodels.task_executor import get_executor
+from api.listing_cache import ListingCache
+from api.metadata_store import KIND_FILES, get_metadata_store, metadata_scope
+from api.search_index import get_search_index
+from api.disk_usage import get_disk_usage
+from api.file_entries import FileEntries
+from viewmodels.file_list_model import FileListModel
 
 class FileViewModel(QObject):
-    fileListChanged = Signal()
+    fileListChanged = Signal()  # 当前目录变化
+    selectionChanged = Signal()  # 选择状态变化
+    uploadStateChanged = Signal()  # 上传状态/进度变化
     loadingChanged = Signal()
     errorChanged = Signal()
     fileOpened = Signal(str)  # 文件打开信号
     directoryChanged = Signal(str)  # 目录改变信号
     contextMenuRequested = Signal(int, int, int)  # 右键菜单信号 (x, y, index)
     createFolderFinished = Signal(bool, str)  # 创建文件夹完成信号 (success, message)
+    folderCreated = Signal(str)  # 文件夹创建成功信号 (relPath)
     creatingFolderChanged = Signal()  # 创建文件夹状态变化信号
     showCreateFolderDialogRequested = Signal()  # 显示创建文件夹对话框信号
+    listingIndexed = Signal()  # 目录列表已收录到搜索索引和空间占用统计（在工作线程中发出）
     
     def __init__(self):
         super().__init__()
         self._file_api = FileAPI()
+        self._executor = get_executor()
+        self._list_task = None  # 当前的文件列表加载任务
+        self._list_directory = None  # 当前加载任务对应的目录
+        self._list_partial_shown = False  # 流式加载是否已显示了部分条目
+        self._listing_cache = ListingCache(
+            ttl=config.get_listing_cache_ttl(),
+            max_entries=config.get_listing_cache_size()
+        )
+        self._metadata_store = get_metadata_store()  # 本地元数据缓存，未启用时为 None
+        self._search_index = get_search_index()
+        self._disk_usage = get_disk_usage()
+        self._create_folder_task = None  # 当前的创建文件夹任务
         self._upload_vm = UploadViewModel()  # 新增上传ViewModel实例
         
         # 连接上传ViewModel的信号
@@ -34,7 +57,8 @@ class FileViewModel(QObject):
         self._upload_vm.uploadStarted.connect(self._on_upload_started)
         self._upload_vm.uploadCancelled.connect(self._on_upload_cancelled)
         
-        self._file_list = []
+        self._file_model = FileListModel(self)
+        self._file_model.selectionChanged.connect(self.selectionChanged)
         self._current_directory = ""
         self._current_username = ""  # 当前登录的用户名
         self._is_loading = False
@@ -44,6 +68,7 @@ class FileViewModel(QObject):
     @Slot(str)
     def set_token(self, token: str):
         """设置认证 token"""
+        self._listing_cache.clear()  # 切换用户后缓存不再有效
         self._file_api.set_token(token)
         self._upload_vm.set_token(token)  # 同时设置上传ViewModel的token
     
@@ -54,87 +79,278 @@ class FileViewModel(QObject):
     
     @Slot(str)
     def load_file_list(self, directory: str = ""):
-        """加载文件列表"""
-        self._is_loading = True
-        self._error_message = ""
-        self.loadingChanged.emit()
-        self.errorChanged.emit()
-        
+        """加载文件列表（网络请求在后台线程执行）"""
+        self._load_directory(directory, force_revalidate=False)
+    
+    def _load_directory(self, directory: str, force_revalidate: bool, persisted_checked: bool = False):
+        """
+        加载目录：命中缓存时立即显示缓存内容，缓存过期或强制刷新时
+        再在后台重新验证，只有内容确实变化才重建列表。
+        内存缓存未命中时先在后台读取本地元数据缓存（persisted_checked 表示已读取过）
+        """
         # 如果没有指定目录，使用用户名作为默认目录
         if not directory and self._current_username:
             directory = self._current_username
         
-        # 调用 API 获取文件列表
-        result = self._file_api.get_file_list(directory)
+        # 新的导航请求使上一次未完成的加载失效
+        if self._list_task is not None and self._list_directory != directory:
+            self._list_task.cancel()
+            self._list_task = None
+        
+        entry = self._listing_cache.get(directory)
+        if entry is None and self._metadata_store is not None and not persisted_checked:
+            self._load_persisted_listing(directory, force_revalidate)
+            return
+        if entry is not None:
+            if directory != self._current_directory:
+                self._show_file_list(directory, entry.files)
+            if self._is_loading or self._error_message:
+                self._is_loading = False
+                self._error_message = ""
+                self.loadingChanged.emit()
+                self.errorChanged.emit()
+            if self._listing_cache.is_fresh(entry) and not force_revalidate:
+                return
+            etag, content_hash = entry.etag, entry.content_hash
+        else:
+            self._is_loading = True
+            self._error_message = ""
+            self.loadingChanged.emit()
+            self.errorChanged.emit()
+            etag, content_hash = None, None
+        
+        scope = metadata_scope(self._current_username)
+        stream_batch = config.get_listing_stream_batch()
+        if entry is None and stream_batch > 0:
+            # 没有缓存时边下载边显示，首屏不必等待完整响应
+            task = self._executor.submit_shared_task(
+                ("files", directory), self._stream_file_list, directory, stream_batch, scope
+            )
+        else:
+            task = self._executor.submit_shared(
+                ("files", directory), self._fetch_file_list, directory, etag, content_hash, scope
+            )
+        if task is None:
+            # 同一目录的加载仍在进行中，直接等待其结果
+            return
+        self._list_directory = directory
+        self._list_partial_shown = False
+        task.partial.connect(lambda files, t=task: self._on_file_list_partial(t, directory, files))
+        task.finished.connect(lambda result, t=task: self._on_file_list_loaded(t, directory, result))
+        task.failed.connect(lambda error, t=task: self._on_file_list_loaded(t, directory, {"success": False, "error": error}))
+        self._list_task = task
+    
+    def _load_persisted_listing(self, directory: str, force_revalidate: bool):
+        """
+        在工作线程中读取本地元数据缓存；读取完成后作为需要重新验证的缓存条目继续加载。
+        读取任务作为当前的加载任务，导航到其他目录时一同失效
+        """
+        task = self._executor.submit(self._read_persisted_listing,
+                                     metadata_scope(self._current_username), directory)
+        task.finished.connect(
+            lambda stored, t=task: self._on_persisted_listing(t, directory, force_revalidate, stored))
+        task.failed.connect(
+            lambda error, t=task: self._on_persisted_listing(t, directory, force_revalidate, None))
+        self._list_directory = directory
+        self._list_task = task
+    
+    def _read_persisted_listing(self, scope: str, directory: str):
+        """读取并解析本地元数据缓存中的目录列表，同时收录到搜索索引（工作线程）"""
+        stored = self._metadata_store.get_listing(scope, directory)
+        if stored is not None:
+            self._index_listing(directory, stored[0])
+        return stored
+    
+    def _on_persisted_listing(self, task, directory: str, force_revalidate: bool, stored):
+        """本地元数据缓存读取完成（GUI 线程）"""
+        if task is not self._list_task:
+            return
+        self._list_task = None
+        if stored is not None and self._listing_cache.get(directory) is None:
+            files, etag, content_hash = stored
+            self._listing_cache.put(directory, files, etag, content_hash, fresh=False)
+        self._load_directory(directory, force_revalidate, persisted_checked=True)
+    
+    def _index_listing(self, directory: str, files: FileEntries):
+        """把目录列表收录到搜索索引和空间占用统计（工作线程）"""
+        self._search_index.sync_directory(directory, files)
+        self._disk_usage.update_directory(directory, files)
+        self.listingIndexed.emit()
+    
+    def _persist_listing(self, scope: str, directory: str, result: dict):
+        """在工作线程中把新获取的目录列表写入本地元数据缓存、搜索索引和空间占用统计"""
+        self._index_listing(directory, result["files"])
+        if self._metadata_store is not None:
+            self._metadata_store.put_listing(
+                scope, directory, result["files"], result.get("etag"), result.get("content_hash")
+            )
+    
+    def _fetch_file_list(self, directory: str, etag=None, content_hash=None, scope: str = "") -> dict:
+        """在工作线程中获取文件列表并构建紧凑的条目存储；内容未变化时跳过构建"""
+        result = self._file_api.get_file_list(directory, etag=etag)
         
         if result["success"]:
-            self._current_directory = directory
-            self._upload_vm.set_current_directory(directory)  # 同步设置上传目录
-            files_data = result["data"].get("files", []) if result["data"] else []
-            
-            # 转换文件数据格式
-            self._file_list = []
-            if files_data:
-                for file_data in files_data:
-                    if file_data:  # 确保file_data不为None
-                        transformed_file = self._file_api.transform_file_data(file_data)
-                        self._file_list.append(transformed_file)
+            # 服务器不支持 ETag 时，用响应内容的哈希判断是否变化
+            if result.get("not_modified") or (content_hash and result.get("content_hash") == content_hash):
+                result["not_modified"] = True
+                return result
             
+            files_data = result["data"].get("files", []) if result["data"] else []
+            result["files"] = FileEntries.from_raw(files_data or [], directory)
+            self._persist_listing(scope, directory, result)
+        return result
+    
+    def _stream_file_list(self, future, directory: str, batch_size: int, scope: str = "") -> dict:
+        """在工作线程中流式获取文件列表，每解析出一批条目就上报给 GUI 线程"""
+        entries = FileEntries(directory)
+        
+        def on_batch(batch):
+            part = FileEntries.from_raw(batch, directory)
+            entries.extend(part)
+            future.report_partial(part)
+        
+        result = self._file_api.get_file_list_streaming(
+            directory, on_batch=on_batch, batch_size=batch_size, cancel_token=future.token
+        )
+        if result["success"]:
+            result["files"] = entries
+            self._persist_listing(scope, directory, result)
+        return result
+    
+    def _on_file_list_partial(self, task, directory: str, files: FileEntries):
+        """流式加载的一批条目到达（GUI 线程）：第一批替换列表，之后追加"""
+        if task is not self._list_task:
+            return
+        if not self._list_partial_shown:
+            self._list_partial_shown = True
+            self._show_file_list(directory, files)
+            self._is_loading = False
+            self.loadingChanged.emit()
+        else:
+            self._file_model.append_files(files)
+    
+    def _on_file_list_loaded(self, task, directory: str, result: dict):
+        """处理文件列表加载结果（GUI 线程）"""
+        if task is not self._list_task:
+            return
+        self._list_task = None
+        streamed = self._list_partial_shown
+        self._list_partial_shown = False
+        showing_cached = not streamed and not self._is_loading and directory == self._current_directory
+        
+        if result["success"]:
+            if result.get("not_modified"):
+                entry = self._listing_cache.get(directory)
+                if entry is not None:
+                    entry.touch()
+                    entry.etag = result.get("etag") or entry.etag
+            else:
+                files = result.get("files") or FileEntries(directory)
+                self._listing_cache.put(directory, files, result.get("etag"), result.get("content_hash"))
+                if not streamed:
+                    # 流式加载时各批条目已经追加到模型中
+                    self._show_file_list(directory, files, keep_selection=showing_cached)
             self._error_message = ""
+        elif showing_cached:
+            # 后台验证失败时保留已显示的缓存内容
+            print(f"目录 {directory} 重新验证失败: {result.get('error')}")
         else:
             self._error_message = result.get("error", "获取文件列表失败")
-            self._file_list = []
-        
-        # 确保_file_list永远不会是None
-        if self._file_list is None:
-            self._file_list = []
+            self._file_model.set_files(FileEntries())
         
         self._is_loading = False
-        self.fileListChanged.emit()
         self.loadingChanged.emit()
         self.errorChanged.emit()
     
+    def _show_file_list(self, directory: str, files: FileEntries, keep_selection: bool = False):
+        """
+        显示目录内容；选择状态只保存在模型中，不写回缓存。
+        同一目录重新验证后增量更新模型，切换目录时整体重置。
+        """
+        if keep_selection and directory == self._current_directory:
+            self._file_model.update_files(files)
+            return
+        self._current_directory = directory
+        self._upload_vm.set_current_directory(directory)  # 同步设置上传目录
+        self._file_model.set_files(files)
+        self.fileListChanged.emit()
+    
+    @Slot(str)
+    def navigate_to(self, directory: str):
+        """跳转到指定目录（搜索结果、面包屑等）"""
+        self.load_file_list(directory)
+        self.directoryChanged.emit(directory)
+    
+    @Slot(list)
+    def remove_paths(self, paths: list):
+        """删除成功：所在目录（以及被删除的文件夹本身）的缓存失效"""
+        self._invalidate_listings(paths + [path.rpartition("/")[0] for path in paths])
+
+    @Slot(str, list, str)
+    def transfer_paths(self, operation: str, paths: list, to_dir: str):
+        """复制 (copy) 或移动 (move) 成功：目标目录的缓存失效，移动时源目录也失效"""
+        directories = [to_dir]
+        if operation == "move":
+            directories += paths + [path.rpartition("/")[0] for path in paths]
+        self._invalidate_listings(directories)
+
+    def _invalidate_listings(self, directories: list):
+        """
+        使目录列表的内存缓存和本地元数据缓存失效；
+        当前目录受影响时在元数据缓存删除后重新加载
+        """
+        directories = set(directories)
+        for directory in directories:
+            self._listing_cache.invalidate(directory)
+        task = self._executor.submit(self._forget_listings, metadata_scope(self._current_username), directories)
+        if self._current_directory in directories:
+            directory = self._current_directory
+            task.finished.connect(lambda _, d=directory: self._reload_if_current(d))
+            task.failed.connect(lambda _, d=directory: self._reload_if_current(d))
+
+    def _forget_listings(self, scope: str, directories: set):
+        """在工作线程中删除本地元数据缓存中的目录列表"""
+        if self._metadata_store is not None:
+            for directory in directories:
+                self._metadata_store.delete(scope, KIND_FILES, directory)
+
+    def _reload_if_current(self, directory: str):
+        if directory == self._current_directory:
+            self._load_directory(directory, force_revalidate=True)
+
     @Slot()
     def refresh_file_list(self):
-        """刷新当前目录的文件列表"""
-        self.load_file_list(self._current_directory)
+        """刷新当前目录的文件列表（强制向服务器重新验证）"""
+        self._load_directory(self._current_directory, force_revalidate=True)
     
     @Slot(int, bool)
     def toggle_file_selection(self, index: int, selected: bool):
-        """切换文件选择状态"""
-        if self._file_list and 0 <= index < len(self._file_list):
-            old_selected = self._file_list[index].get("selected", False)
-            if old_selected != selected:
-                self._file_list[index]["selected"] = selected
-                self.fileListChanged.emit()
+        """切换文件选择状态（只通知该行）"""
+        self._file_model.set_selected(index, selected)
     
     @Slot(bool)
     def select_all_files(self, selected: bool):
         """全选/取消全选文件"""
-        if self._file_list:
-            changed = False
-            for file_item in self._file_list:
-                if file_item.get("selected", False) != selected:
-                    file_item["selected"] = selected
-                    changed = True
-            
-            if changed:
-                self.fileListChanged.emit()
+        self._file_model.select_all(selected)
     
     @Slot(result=list)  # 显式声明返回类型为 list
     def get_selected_files(self):
         """获取选中的文件列表"""
-        if not self._file_list:
-            return []
-            
-        return [file_item for file_item in self._file_list if file_item.get("selected", False)]
-    
+        return self._file_model.selected_files()
+    
+    @Slot(int, result=list)
+    def context_files(self, index: int):
+        """右键菜单操作的文件：该行已选中时为所有选中的文件，否则只有该行"""
+        if self._file_model.is_selected(index):
+            return self._file_model.selected_files()
+        file_item = self._file_model.file_at(index)
+        return [file_item] if file_item is not None else []
+
     @Slot(int)
     def open_file_or_folder(self, index: int):
         """打开文件或进入文件夹（双击）"""
-        if self._file_list and 0 <= index < len(self._file_list):
-            file_item = self._file_list[index]
-            
+        file_item = self._file_model.file_at(index)
+        if file_item is not None:
             if file_item.get("isDir", False):
                 # 如果是文件夹，进入该文件夹
                 new_directory = file_item.get("relPath", "")
@@ -201,22 +417,17 @@ class FileViewModel(QObject):
     @Slot(int, bool)
     def select_file(self, index: int, ctrl_key_pressed: bool = False):
         """选中文件（单击）- 根据Ctrl键状态决定选择行为"""
-        if self._file_list and 0 <= index < len(self._file_list):
-            if ctrl_key_pressed:
-                # 按住Ctrl键：切换当前文件的选中状态，不影响其他文件
-                self._file_list[index]["selected"] = not self._file_list[index].get("selected", False)
-            else:
-                # 没有按Ctrl键：检查当前文件是否已经选中
-                current_selected = self._file_list[index].get("selected", False)
-                if current_selected:
-                    # 如果当前文件已经选中，则取消选中
-                    self._file_list[index]["selected"] = False
-                else:
-                    # 如果当前文件未选中，则取消其他文件的选中状态，只选中当前文件
-                    for i, file_item in enumerate(self._file_list):
-                        self._file_list[i]["selected"] = (i == index)
-            
-            self.fileListChanged.emit()
+        if self._file_model.file_at(index) is None:
+            return
+        current_selected = self._file_model.is_selected(index)
+        if ctrl_key_pressed or current_selected:
+            # 按住Ctrl键：切换当前文件的选中状态，不影响其他文件
+            # 没有按Ctrl键且当前文件已经选中：取消选中
+            self._file_model.set_selected(index, not current_selected)
+        else:
+            # 如果当前文件未选中，则取消其他文件的选中状态，只选中当前文件
+            self._file_model.select_only(index)
+    
     @Slot(str)
     def create_folder(self, folder_name: str):
         """创建文件夹"""
@@ -236,15 +447,27 @@ class FileViewModel(QObject):
         self._is_creating_folder = True
         self.creatingFolderChanged.emit()
         
-        # 调用API创建文件夹
-        result = self._file_api.create_directory(
+        # 在后台线程中调用API创建文件夹
+        task = self._executor.submit(
+            self._file_api.create_directory,
             root_dir="",  # 用户目录
             cur_dir=self._current_directory,
             name=folder_name
         )
+        parent_directory = self._current_directory
+        task.finished.connect(lambda result, t=task: self._on_create_folder_result(t, parent_directory, folder_name, result))
+        task.failed.connect(lambda error, t=task: self._on_create_folder_result(t, parent_directory, folder_name, {"success": False, "error": error}))
+        self._create_folder_task = task
+    
+    def _on_create_folder_result(self, task, parent_directory: str, folder_name: str, result: dict):
+        """处理创建文件夹结果（GUI 线程）"""
+        if task is not self._create_folder_task:
+            return
+        self._create_folder_task = None
         
         if result["success"]:
             self.createFolderFinished.emit(True, f"文件夹 '{folder_name}' 创建成功")
+            self.folderCreated.emit(f"{parent_directory}/{folder_name}" if parent_directory else folder_name)
             # 创建成功后刷新文件列表
             self.refresh_file_list()
         else:
@@ -293,9 +516,10 @@ class FileViewModel(QObject):
     def is_creating_folder(self):
         return self._is_creating_folder
     
-    @Property(list, notify=fileListChanged)
-    def file_list(self):
-        return self._file_list if self._file_list is not None else []
+    @Property(QObject, constant=True)
+    def file_model(self):
+        """文件列表模型（QAbstractListModel）"""
+        return self._file_model
     
     @Property(str, notify=fileListChanged)
     def current_directory(self):
@@ -313,43 +537,39 @@ class FileViewModel(QObject):
     def is_at_home(self):
         return self._current_directory == self._current_username or not self._current_directory
     
-    @Property(bool, notify=fileListChanged)
+    @Property(bool, notify=selectionChanged)
     def all_files_selected(self):
         """是否所有文件都被选中"""
-        if not self._file_list:
-            return False
-        return all(file_item.get("selected", False) for file_item in self._file_list)
+        total = self._file_model.rowCount()
+        return total > 0 and self._file_model.selected_count() == total
     
-    @Property(bool, notify=fileListChanged)
+    @Property(bool, notify=selectionChanged)
     def some_files_selected(self):
         """是否有部分文件被选中"""
-        if not self._file_list:
-            return False
-        selected_count = sum(1 for file_item in self._file_list if file_item.get("selected", False))
-        return 0 < selected_count < len(self._file_list)
+        return 0 < self._file_model.selected_count() < self._file_model.rowCount()
     
     # 上传相关的属性委托给UploadViewModel
-    @Property(int, notify=fileListChanged)
+    @Property(int, notify=uploadStateChanged)
     def upload_progress(self):
         return self._upload_vm.upload_progress
     
-    @Property(bool, notify=fileListChanged)
+    @Property(bool, notify=uploadStateChanged)
     def is_uploading(self):
         return self._upload_vm.is_uploading
     
-    @Property(str, notify=fileListChanged)
+    @Property(str, notify=uploadStateChanged)
     def current_upload_file(self):
         return self._upload_vm.current_upload_file
     
-    @Property(list, notify=fileListChanged)
+    @Property(list, notify=uploadStateChanged)
     def upload_queue(self):
         return self._upload_vm.upload_queue
     
-    @Property(int, notify=fileListChanged)
+    @Property(int, notify=uploadStateChanged)
     def queue_progress(self):
         return self._upload_vm.queue_progress
     
-    @Property(int, notify=fileListChanged)
+    @Property(int, notify=uploadStateChanged)
     def queue_total(self):
         return self._upload_vm.queue_total
     
@@ -360,19 +580,19 @@ class FileViewModel(QObject):
     
     def _on_upload_progress_changed(self, progress: int):
         """处理上传进度变化"""
-        self.fileListChanged.emit()  # 触发属性更新
+        self.uploadStateChanged.emit()  # 触发属性更新
     
     def _on_upload_finished(self, success: bool, message: str):
         """处理上传完成"""
         if success:
             # 上传成功后刷新文件列表
             self.refresh_file_list()
-        self.fileListChanged.emit()  # 触发属性更新
+        self.uploadStateChanged.emit()  # 触发属性更新
     
     def _on_upload_started(self, file_name: str):
         """处理上传开始"""
-        self.fileListChanged.emit()  # 触发属性更新
+        self.uploadStateChanged.emit()  # 触发属性更新
     
     def _on_upload_cancelled(self):
         """处理上传取消"""
-        self.fileListChanged.emit()  # 触发属性更新 
\ No newline at end of file
+        self.uploadStateChanged.emit()  # 触发属性更新 
\ No newline at end of file
@@ -0,0 +1,334 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal, Slot, Property
+from typing import Dict, List, Optional
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.memory_usage import estimate_rows_bytes
+from api.timeline_index import GRANULARITIES, TimelineIndex, format_key
+
+KEEP_ROWS = 200  # 当前显示位置前后这么多条所在的块不会被释放
+
+
+class PagedFilesModel(QAbstractListModel):
+    """
+    分页加载的分类文件模型（稀疏窗口）
+
+    数据按页追加到末尾（rowsInserted），已显示的条目不会因为加载下一页而重建。
+    视图滚动到末尾附近时通过 fetchMore / fetchMoreRequested 请求下一页。
+
+    时间线模式（timeline_mode 为 day/month/year）下按 createdAt 分组：section 为所在分组的标题，
+    sectionStart 表示分组的第一行；分组边界由 TimelineIndex 增量维护，被释放的块也能查到分组。
+
+    行按 block_size 条分块保存，远离当前显示位置的块在超出内存预算时被释放，
+    行数不变，被释放的行显示为空白占位；视图再次显示到这些行时通过 blockNeeded 请求重新加载。
+    """
+
+    countChanged = Signal()
+    hasMoreChanged = Signal()
+    fetchMoreRequested = Signal()
+    blockNeeded = Signal(int)  # 被释放的块需要重新加载（块的起始行）
+    timelineChanged = Signal()
+    sectionsChanged = Signal()
+
+    ROLE_NAMES = ("id", "name", "relPath", "owner", "isPublic", "size",
+                  "type", "createdAt", "updatedAt", "resident",
+                  "section", "sectionStart")
+    _ROLES = {Qt.UserRole + 1 + i: name for i, name in enumerate(ROLE_NAMES)}
+    _SECTION_ROLES = [Qt.UserRole + 1 + ROLE_NAMES.index("section"),
+                      Qt.UserRole + 1 + ROLE_NAMES.index("sectionStart")]
+    _PLACEHOLDERS = {"isPublic": False, "size": 0, "resident": False}  # 未常驻的行，其余角色为空字符串
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._block_size = 30
+        self._blocks: List[Optional[List[Dict]]] = []  # 被释放的块为 None
+        self._block_bytes: List[int] = []
+        self._count = 0
+        self._has_more = False
+        self._resident_bytes = 0
+        self._focus = 0  # 最近一次被视图读取的行
+        self._requested = set()  # 已发出 blockNeeded、尚未重新加载的块
+        self._timeline = TimelineIndex()
+        self._timeline_mode = ""  # "" 为平铺，否则为 day/month/year
+        self._sections = None  # 当前模式的分组列表（QML 用），内容变化后重新生成
+
+    # ---- QAbstractListModel 接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < self._count:
+            return None
+        row = index.row()
+        self._focus = row
+        name = self._ROLES.get(role, "name" if role == Qt.DisplayRole else None)
+        if name is None:
+            return None
+        if name == "section":
+            return self.section_label(row)
+        if name == "sectionStart":
+            return bool(self._timeline_mode) and self._timeline.is_section_start(row, self._timeline_mode)
+        block = self._blocks[row // self._block_size]
+        if block is None:
+            self._request_block(row // self._block_size)
+            return self._PLACEHOLDERS.get(name, "")
+        if row % self._block_size >= len(block):
+            return self._PLACEHOLDERS.get(name, "")
+        file = block[row % self._block_size]
+        if name == "resident":
+            return True
+        return file.get(name)
+
+    def roleNames(self):
+        return {role: name.encode("utf-8") for role, name in self._ROLES.items()}
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not parent.isValid():
+            self.fetchMoreRequested.emit()
+
+    # ---- 内容更新 ----
+
+    def set_block_size(self, block_size: int):
+        """每块的条数（等于第一页的 pagesize，各页的起始位置都是它的整数倍）；会清空内容"""
+        if max(1, block_size) != self._block_size:
+            self._block_size = max(1, block_size)
+            self.set_files([], self._has_more)
+
+    def set_files(self, files: List[Dict], has_more: bool = False):
+        """替换全部内容"""
+        self.beginResetModel()
+        self._blocks = []
+        self._block_bytes = []
+        self._count = 0
+        self._resident_bytes = 0
+        self._requested = set()
+        self._timeline.clear()
+        self._extend(files)
+        self.endResetModel()
+        self.countChanged.emit()
+        self._sections_changed()
+        self.set_has_more(has_more)
+
+    def append_files(self, files: List[Dict], has_more: bool):
+        """在末尾追加一页（起始位置是块大小的整数倍）"""
+        if files:
+            first = self._count
+            self.beginInsertRows(QModelIndex(), first, first + len(files) - 1)
+            self._extend(files)
+            self.endInsertRows()
+            self.countChanged.emit()
+            self._sections_changed()
+        self.set_has_more(has_more)
+
+    def _extend(self, files: List[Dict]):
+        self._timeline.extend(files)
+        size = self._block_size
+        first = 0
+        partial = self._count % size
+        if partial and files:
+            # 上一页不满一块：先补满最后一块，保证第 row 行总在第 row // block_size 块
+            first = min(size - partial, len(files))
+            index = len(self._blocks) - 1
+            block = self._blocks[index]
+            if block is not None:
+                self._resident_bytes -= self._block_bytes[index]
+                self._store_block(index, block + list(files[:first]))
+            self._count += first
+        for start in range(first, len(files), size):
+            self._blocks.append(None)
+            self._block_bytes.append(0)
+            self._store_block(len(self._blocks) - 1, list(files[start:start + size]))
+            self._count += min(size, len(files) - start)
+
+    def fill_block(self, first_row: int, files: List[Dict]):
+        """重新加载被释放的块；行数保持不变，服务器上少了的行留空"""
+        index = first_row // self._block_size
+        self._requested.discard(index)
+        if not 0 <= index < len(self._blocks) or self._blocks[index] is not None:
+            return
+        length = min(self._block_size, self._count - index * self._block_size)
+        self._store_block(index, list(files[:length]))
+        self.dataChanged.emit(self.index(index * self._block_size),
+                              self.index(index * self._block_size + length - 1))
+
+    def _store_block(self, index: int, files: List[Dict]):
+        self._blocks[index] = files
+        self._block_bytes[index] = estimate_rows_bytes(files)
+        self._resident_bytes += self._block_bytes[index]
+
+    def _request_block(self, index: int):
+        if index not in self._requested:
+            self._requested.add(index)
+            self.blockNeeded.emit(index * self._block_size)
+
+    def cancel_block_request(self, first_row: int):
+        """重新加载失败或未发出：视图再次读取这些行时重新发出 blockNeeded"""
+        self._requested.discard(first_row // self._block_size)
+
+    def evict(self, budget_bytes: int) -> int:
+        """
+        常驻数据超出预算时，从离当前显示位置最远的块开始释放（当前位置前后 KEEP_ROWS 条内的块保留）；
+        返回释放的块数
+        """
+        if self._resident_bytes <= budget_bytes:
+            return 0
+        focus = self._focus // self._block_size
+        keep = KEEP_ROWS // self._block_size + 1
+        candidates = sorted((index for index, block in enumerate(self._blocks)
+                             if block is not None and abs(index - focus) > keep),
+                            key=lambda index: abs(index - focus), reverse=True)
+        evicted = 0
+        for index in candidates:
+            if self._resident_bytes <= budget_bytes:
+                break
+            self._release_block(index)
+            evicted += 1
+        return evicted
+
+    def _release_block(self, index: int, notify: bool = True):
+        first = index * self._block_size
+        files = self._blocks[index]
+        self._blocks[index] = None
+        self._resident_bytes -= self._block_bytes[index]
+        self._block_bytes[index] = 0
+        if notify and files:
+            self.dataChanged.emit(self.index(first), self.index(first + len(files) - 1))
+
+    def truncate(self, count: int):
+        """只保留前 count 条（释放内存），之后的条目需要重新加载"""
+        if count >= self._count:
+            return
+        keep = (count + self._block_size - 1) // self._block_size
+        self.beginRemoveRows(QModelIndex(), count, self._count - 1)
+        for index in range(keep, len(self._blocks)):
+            if self._blocks[index] is not None:
+                self._release_block(index, notify=False)
+        del self._blocks[keep:]
+        del self._block_bytes[keep:]
+        last = self._blocks[-1] if keep else None
+        if last is not None and len(last) > count - (keep - 1) * self._block_size:
+            del last[count - (keep - 1) * self._block_size:]
+            self._resident_bytes -= self._block_bytes[keep - 1]
+            self._block_bytes[keep - 1] = estimate_rows_bytes(last)
+            self._resident_bytes += self._block_bytes[keep - 1]
+        self._requested = {index for index in self._requested if index < keep}
+        self._timeline.truncate(count)
+        self._count = count
+        self.endRemoveRows()
+        self.countChanged.emit()
+        self._sections_changed()
+        self.set_has_more(True)
+
+    # ---- 时间线 ----
+
+    @Slot(str)
+    def set_timeline_mode(self, mode: str):
+        """切换时间线模式：""（平铺）、day、month、year"""
+        mode = mode if mode in GRANULARITIES else ""
+        if mode == self._timeline_mode:
+            return
+        self._timeline_mode = mode
+        if self._count:
+            self.dataChanged.emit(self.index(0), self.index(self._count - 1), self._SECTION_ROLES)
+        self.timelineChanged.emit()
+        self._sections_changed()
+
+    @Slot(int, result=str)
+    def section_label(self, row: int) -> str:
+        """第 row 行所在分组的标题（平铺模式下为空），用于吸顶标题"""
+        if not self._timeline_mode or not 0 <= row < self._count:
+            return ""
+        return format_key(self._timeline.section_of(row, self._timeline_mode))
+
+    @Slot(str, result=int)
+    def seek(self, key: str) -> int:
+        """分组 key（"2021" / "2021-03" / "2021-03-14"）在已加载内容中第一次出现的行，-1 表示没有"""
+        return self._timeline.seek(key.strip())
+
+    def section_key(self, row: int, granularity: str) -> str:
+        """第 row 行所属的分组 key（与当前显示模式无关）"""
+        return self._timeline.section_of(row, granularity)
+
+    def covers(self, key: str) -> bool:
+        """已加载的内容是否足以确定分组 key 的位置（key 已出现或已越过 key）"""
+        return self._timeline.covers(key.strip())
+
+    def _sections_changed(self):
+        self._sections = None
+        if self._timeline_mode:
+            self.sectionsChanged.emit()
+
+    @Property(str, notify=timelineChanged)
+    def timeline_mode(self):
+        return self._timeline_mode
+
+    @Property('QVariantList', notify=sectionsChanged)
+    def sections(self):
+        """当前模式的分组 [{key, label, row, count}]，按出现顺序"""
+        if not self._timeline_mode:
+            return []
+        if self._sections is None:
+            self._sections = [{"key": key, "label": format_key(key), "row": row, "count": count}
+                              for key, row, count in self._timeline.sections(self._timeline_mode)]
+        return self._sections
+
+    def set_has_more(self, has_more: bool):
+        if has_more != self._has_more:
+            self._has_more = has_more
+            self.hasMoreChanged.emit()
+
+    # ---- 访问 ----
+
+    def files(self) -> List[Dict]:
+        """常驻的条目（被释放的块不包含在内）"""
+        return [file for block in self._blocks if block is not None for file in block]
+
+    def head(self, count: int) -> List[Dict]:
+        """开头连续常驻的最多 count 条"""
+        result = []
+        for block in self._blocks:
+            if block is None or len(result) >= count:
+                break
+            result.extend(block)
+        return result[:count]
+
+    def resident_count(self) -> int:
+        return sum(len(block) for block in self._blocks if block is not None)
+
+    def resident_bytes(self) -> int:
+        """常驻条目的估算内存占用（字节）"""
+        return self._resident_bytes
+
+    def block_size(self) -> int:
+        return self._block_size
+
+    def file_at(self, row: int) -> Optional[Dict]:
+        if not 0 <= row < self._count:
+            return None
+        block = self._blocks[row // self._block_size]
+        if block is None or row % self._block_size >= len(block):
+            return None
+        return block[row % self._block_size]
+
+    @Slot(int, result='QVariantMap')
+    def get(self, row: int):
+        """供 QML 读取整行数据"""
+        return self.file_at(row) or {}
+
+    @Property(int, notify=countChanged)
+    def count(self):
+        return self._count
+
+    @Property(bool, notify=hasMoreChanged)
+    def has_more(self):
+        """服务器上可能还有未加载的条目"""
+        return self._has_more
@@ -0,0 +1,92 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal, Slot, Property
+from typing import Dict, List, Optional, Tuple
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.file_entries import TYPE_NAMES, file_type_code
+
+
+class SearchResultsModel(QAbstractListModel):
+    """
+    搜索结果模型
+
+    结果按批追加（rowsInserted），QML 列表在搜索进行中即可显示已找到的条目。
+    """
+
+    countChanged = Signal()
+
+    ROLE_NAMES = ("name", "relPath", "parentPath", "isDir", "type")
+    _ROLES = {Qt.UserRole + 1 + i: name for i, name in enumerate(ROLE_NAMES)}
+    _ROLE_BY_NAME = {name: role for role, name in _ROLES.items()}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._results: List[Tuple[str, bool]] = []  # (路径, 是否目录)
+
+    # ---- QAbstractListModel 接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._results)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._results):
+            return None
+        path, is_dir = self._results[index.row()]
+        name = self._ROLES.get(role, "name" if role == Qt.DisplayRole else None)
+        if name == "name":
+            return path.rpartition("/")[2]
+        if name == "relPath":
+            return path
+        if name == "parentPath":
+            return path.rpartition("/")[0]
+        if name == "isDir":
+            return is_dir
+        if name == "type":
+            return TYPE_NAMES[file_type_code(path.rpartition("/")[2], is_dir)]
+        return None
+
+    def roleNames(self):
+        return {role: name.encode("utf-8") for role, name in self._ROLES.items()}
+
+    # ---- 内容更新 ----
+
+    def clear(self):
+        if not self._results:
+            return
+        self.beginResetModel()
+        self._results = []
+        self.endResetModel()
+        self.countChanged.emit()
+
+    def append_results(self, results: List[Tuple[str, bool]]):
+        """在末尾追加一批结果"""
+        if not results:
+            return
+        first = len(self._results)
+        self.beginInsertRows(QModelIndex(), first, first + len(results) - 1)
+        self._results.extend(results)
+        self.endInsertRows()
+        self.countChanged.emit()
+
+    # ---- 访问 ----
+
+    def result_at(self, row: int) -> Optional[Dict]:
+        if not 0 <= row < len(self._results):
+            return None
+        path, is_dir = self._results[row]
+        return {"name": path.rpartition("/")[2], "relPath": path,
+                "parentPath": path.rpartition("/")[0], "isDir": is_dir}
+
+    @Slot(int, result='QVariantMap')
+    def get(self, row: int):
+        """供 QML 读取整行数据"""
+        return self.result_at(row) or {}
+
+    @Property(int, notify=countChanged)
+    def count(self):
+        return len(self._results)
@@ -0,0 +1,176 @@
+from PySide6.QtCore import QObject, QTimer, Signal, Slot, Property
+import time
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.search_index import get_search_index
+from viewmodels.search_results_model import SearchResultsModel
+from viewmodels.task_executor import get_executor
+
+SEARCH_DEBOUNCE_MS = 150  # 输入停止这么久后才开始搜索
+SEARCH_LIMIT = 500  # 最多显示的结果数
+SEARCH_BATCH = 100  # 每批追加到模型的结果数
+
+
+class SearchViewModel(QObject):
+    """
+    文件名搜索ViewModel
+
+    输入经过防抖后在后台线程查询本地索引（get_search_index），
+    结果分批追加到 results_model。索引由目录列表、分类文件和目录树的加载结果填充，
+    不额外请求服务器。
+    """
+
+    queryChanged = Signal()
+    searchingChanged = Signal()
+    searchFinished = Signal(int)  # 搜索完成 (结果数)
+    directoryRequested = Signal(str)  # 打开结果所在的目录
+
+    def __init__(self):
+        super().__init__()
+        self._index = get_search_index()
+        self._executor = get_executor()
+        self._results_model = SearchResultsModel(self)
+        self._query = ""
+        self._username = ""
+        self._search_task = None
+        self._is_searching = False
+        self._search_time_ms = 0.0
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._start_search)
+
+    @Slot(str)
+    def set_username(self, username: str):
+        """切换用户后清空索引和结果"""
+        if username != self._username:
+            self._username = username
+            self._index.clear()
+            self.clear_search()
+
+    @Slot(str)
+    def set_query(self, text: str):
+        """输入框内容变化（每次按键调用），停止输入后才真正搜索"""
+        if text == self._query:
+            return
+        self._query = text
+        self.queryChanged.emit()
+        if not text.strip():
+            self._debounce_timer.stop()
+            self._cancel_search()
+            self._results_model.clear()
+            return
+        self._debounce_timer.start()
+
+    @Slot()
+    def clear_search(self):
+        self._debounce_timer.stop()
+        self._cancel_search()
+        self._results_model.clear()
+        if self._query:
+            self._query = ""
+            self.queryChanged.emit()
+
+    def _cancel_search(self):
+        if self._search_task is not None:
+            self._search_task.cancel()
+            self._search_task = None
+            self._set_searching(False)
+
+    def _start_search(self):
+        self._cancel_search()
+        query = self._query
+        task = self._executor.submit_task(self._run_search, query)
+        shown = []  # 是否已替换为本次搜索的结果
+        task.partial.connect(lambda rows, t=task: self._on_results(t, rows, shown))
+        task.finished.connect(lambda result, t=task: self._on_search_finished(t, result, shown))
+        task.failed.connect(lambda error, t=task: self._on_search_finished(t, {"count": 0, "error": error}, shown))
+        self._search_task = task
+        self._set_searching(True)
+
+    def _run_search(self, future, query: str) -> dict:
+        """在工作线程中查询索引，结果分批上报"""
+        start = time.perf_counter()
+        results = self._index.search(query, limit=SEARCH_LIMIT)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for offset in range(0, len(results), SEARCH_BATCH):
+            future.token.raise_if_cancelled()
+            future.report_partial(results[offset:offset + SEARCH_BATCH])
+        return {"count": len(results), "elapsed_ms": elapsed_ms}
+
+    def _on_results(self, task, rows: list, shown: list):
+        """一批结果到达（GUI 线程）：第一批替换旧结果，之后追加"""
+        if task is not self._search_task:
+            return
+        if not shown:
+            shown.append(True)
+            self._results_model.clear()
+        self._results_model.append_results(rows)
+
+    def _on_search_finished(self, task, result: dict, shown: list):
+        if task is not self._search_task:
+            return
+        self._search_task = None
+        if not shown:
+            # 没有结果
+            self._results_model.clear()
+        if result.get("error"):
+            print(f"搜索失败: {result['error']}")
+        self._search_time_ms = result.get("elapsed_ms", 0.0)
+        self._set_searching(False)
+        self.searchFinished.emit(result.get("count", 0))
+
+    def _set_searching(self, searching: bool):
+        if self._is_searching != searching:
+            self._is_searching = searching
+            self.searchingChanged.emit()
+
+    @Slot(list)
+    def remove_paths(self, paths: list):
+        """删除成功后从索引中移除（文件夹连同其下的路径）"""
+        for path in paths:
+            self._index.remove_tree(path)
+
+    @Slot(str, list, str)
+    def transfer_paths(self, operation: str, paths: list, to_dir: str):
+        """移动成功后移除旧路径；新位置在下次加载该目录时收录"""
+        if operation == "move":
+            self.remove_paths(paths)
+
+    @Slot(int)
+    def open_result(self, row: int):
+        """打开搜索结果：文件夹直接进入，文件则进入其所在目录"""
+        result = self._results_model.result_at(row)
+        if result is None:
+            return
+        directory = result["relPath"] if result["isDir"] else result["parentPath"]
+        self.directoryRequested.emit(directory)
+
+    @Slot(result=int)
+    def indexed_count(self):
+        """索引中的路径数"""
+        return len(self._index)
+
+    # 属性定义
+    @Property(QObject, constant=True)
+    def results_model(self):
+        """搜索结果模型（QAbstractListModel）"""
+        return self._results_model
+
+    @Property(str, notify=queryChanged)
+    def query(self):
+        return self._query
+
+    @Property(bool, notify=searchingChanged)
+    def is_searching(self):
+        return self._is_searching
+
+    @Property(float, notify=searchingChanged)
+    def search_time_ms(self):
+        """上一次查询索引的耗时"""
+        return self._search_time_ms
@@ -0,0 +1,223 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from typing import Any, Callable, Optional
+import threading
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from api.cancellation import CancellationToken, TaskCancelled
+from config import config
+
+
+class TaskFuture(QObject):
+    """
+    后台任务的句柄
+
+    在 GUI 线程创建，结果通过信号排队投递回 GUI 线程：
+    finished(result) / failed(error) / cancelled() 三者只会触发其一，
+    之后总会触发 done()。
+    """
+
+    finished = Signal(object)  # 任务结果
+    failed = Signal(str)  # 错误信息
+    cancelled = Signal()  # 任务已取消
+    progress = Signal(int)  # 进度 (0-100)
+    partial = Signal(object)  # 部分结果（例如流式加载的一批数据）
+    done = Signal()  # 任务结束（无论结果如何）
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.token = CancellationToken()
+        self._lock = threading.Lock()
+        self._is_done = False
+        self._result = None
+        self._error = ""
+
+    def cancel(self):
+        """请求取消任务，正在执行的任务会在下一个检查点停止"""
+        self.token.cancel()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.token.is_cancelled
+
+    @property
+    def is_done(self) -> bool:
+        return self._is_done
+
+    def result(self) -> Any:
+        return self._result
+
+    def error(self) -> str:
+        return self._error
+
+    def report_progress(self, value: int):
+        """在工作线程中上报进度"""
+        if not self.token.is_cancelled:
+            self.progress.emit(int(value))
+
+    def report_partial(self, value: Any):
+        """在工作线程中上报部分结果"""
+        if not self.token.is_cancelled:
+            self.partial.emit(value)
+
+    def _set_result(self, result: Any):
+        with self._lock:
+            self._result = result
+            self._is_done = True
+        if self.token.is_cancelled:
+            self.cancelled.emit()
+        else:
+            self.finished.emit(result)
+        self.done.emit()
+
+    def _set_error(self, error: str):
+        with self._lock:
+            self._error = error
+            self._is_done = True
+        if self.token.is_cancelled:
+            self.cancelled.emit()
+        else:
+            self.failed.emit(error)
+        self.done.emit()
+
+    def _set_cancelled(self):
+        with self._lock:
+            self._is_done = True
+        self.cancelled.emit()
+        self.done.emit()
+
+
+class _TaskRunnable(QRunnable):
+    """在线程池中执行任务函数并把结果写回 TaskFuture"""
+
+    def __init__(self, future: TaskFuture, fn: Callable, args: tuple, kwargs: dict):
+        super().__init__()
+        self.setAutoDelete(True)
+        self._future = future
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+
+    def run(self):
+        future = self._future
+        if future.is_cancelled:
+            future._set_cancelled()
+            return
+        try:
+            result = self._fn(*self._args, **self._kwargs)
+        except TaskCancelled:
+            future._set_cancelled()
+        except Exception as e:
+            print(f"后台任务执行失败: {e}")
+            future._set_error(str(e))
+        else:
+            future._set_result(result)
+
+
+class TaskExecutor(QObject):
+    """
+    有界线程池任务执行器
+
+    ViewModel 通过 submit()/submit_task() 把阻塞的网络调用放到工作线程，
+    然后连接返回的 TaskFuture 信号处理结果，GUI 线程始终不被阻塞。
+    submit_shared() 会把相同 key 的重复提交合并到进行中的任务上。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_workers or config.get_worker_threads())
+        self._active = set()
+        self._shared = {}  # key -> 进行中的 TaskFuture
+        self._shared_submitted = 0
+        self._shared_coalesced = 0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> TaskFuture:
+        """提交任务，fn(*args, **kwargs) 在工作线程中执行"""
+        future = TaskFuture()
+        self._start(future, fn, args, kwargs)
+        return future
+
+    def submit_task(self, fn: Callable, *args, **kwargs) -> TaskFuture:
+        """
+        提交需要取消令牌或进度上报的任务
+
+        fn 的第一个参数是 TaskFuture 本身，可使用 future.token
+        与 future.report_progress() / future.report_partial()。
+        """
+        future = TaskFuture()
+        self._start(future, fn, (future,) + args, kwargs)
+        return future
+
+    def submit_shared(self, key, fn: Callable, *args, **kwargs) -> Optional[TaskFuture]:
+        """
+        提交可合并的任务
+
+        若相同 key 的任务仍在进行中（且未被取消），不再提交新任务并返回 None，
+        调用方已连接在该任务上的处理函数会收到结果；否则提交并返回新的 TaskFuture。
+        """
+        return self._submit_shared(key, self.submit, fn, args, kwargs)
+
+    def submit_shared_task(self, key, fn: Callable, *args, **kwargs) -> Optional[TaskFuture]:
+        """可合并的 submit_task()，fn 的第一个参数是 TaskFuture 本身"""
+        return self._submit_shared(key, self.submit_task, fn, args, kwargs)
+
+    def _submit_shared(self, key, submit: Callable, fn: Callable, args: tuple, kwargs: dict) -> Optional[TaskFuture]:
+        pending = self._shared.get(key)
+        if pending is not None and not pending.is_cancelled:
+            self._shared_coalesced += 1
+            return None
+        future = submit(fn, *args, **kwargs)
+        self._shared[key] = future
+        self._shared_submitted += 1
+        future.done.connect(lambda k=key, f=future: self._on_shared_done(k, f))
+        return future
+
+    def _on_shared_done(self, key, future: TaskFuture):
+        if self._shared.get(key) is future:
+            del self._shared[key]
+
+    def coalescing_stats(self) -> dict:
+        """任务合并计数：submitted 为实际提交数，coalesced 为被合并的重复提交数"""
+        return {
+            "submitted": self._shared_submitted,
+            "coalesced": self._shared_coalesced,
+            "in_flight": len(self._shared)
+        }
+
+    def _start(self, future: TaskFuture, fn: Callable, args: tuple, kwargs: dict):
+        self._active.add(future)
+        future.done.connect(lambda f=future: self._on_task_done(f))
+        self._pool.start(_TaskRunnable(future, fn, args, kwargs))
+
+    def _on_task_done(self, future: TaskFuture):
+        self._active.discard(future)
+
+    def active_count(self) -> int:
+        """尚未结束的任务数"""
+        return len(self._active)
+
+    def cancel_all(self):
+        """取消所有未结束的任务"""
+        for future in list(self._active):
+            future.cancel()
+
+    def shutdown(self, wait_msecs: int = 3000):
+        """取消所有任务并等待工作线程退出"""
+        self._pool.clear()
+        self.cancel_all()
+        self._pool.waitForDone(wait_msecs)
+
+
+_executor: Optional[TaskExecutor] = None
+
+
+def get_executor() -> TaskExecutor:
+    """获取全局共享的任务执行器（需在 GUI 线程中首次调用）"""
+    global _executor
+    if _executor is None:
+        _executor = TaskExecutor()
+    return _executor
@@ -0,0 +1,74 @@
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage
+from PySide6.QtQuick import QQuickAsyncImageProvider, QQuickImageResponse, QQuickTextureFactory
+import threading
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from viewmodels.thumbnail_vm import ThumbnailVM, parse_thumbnail_id
+
+
+class _ThumbnailResponse(QQuickImageResponse):
+    """一次 image://thumb/ 请求，图片由 ThumbnailVM 的调度器取得后发出 finished"""
+
+    def __init__(self):
+        super().__init__()
+        self._image = QImage()
+        self._error = ""
+        self._lock = threading.Lock()
+        self._done = False
+        self.job = None
+
+    def textureFactory(self):
+        return QQuickTextureFactory.textureFactoryForImage(self._image)
+
+    def errorString(self):
+        return self._error
+
+    def cancel(self):
+        """委托在图片到达前被销毁（滚动离开）：排队中的加载直接丢弃"""
+        if self.job is not None:
+            self.job.cancel()
+        self._finish(None, "cancelled")
+
+    def on_loaded(self, result):
+        """在加载线程中调用"""
+        image, error = result if result is not None else (None, "加载失败")
+        self._finish(image, error)
+
+    def _finish(self, image, error: str):
+        # 取消后引擎仍要求发出一次 finished 才会释放响应，但只能发出一次
+        with self._lock:
+            if self._done:
+                return
+            self._done = True
+        if image is not None:
+            self._image = image
+        self._error = error
+        self.finished.emit()
+
+
+class ThumbnailImageProvider(QQuickAsyncImageProvider):
+    """
+    QML 的 image://thumb/<路径>?w=&h=&t=&v=&i= 图片提供者
+
+    直接返回 ThumbnailVM 缓存中解码后的 QImage，不经过 base64 数据 URL。
+    加载由 ThumbnailVM 的调度器按可见范围排优先级（v 为视图名，i 为行号），不占用 GUI 线程。
+    地址中没有尺寸时使用 Image.sourceSize。
+    """
+
+    def __init__(self, thumbnail_vm: ThumbnailVM):
+        super().__init__()
+        self._thumbnail_vm = thumbnail_vm
+
+    def requestImageResponse(self, image_id: str, requested_size: QSize):
+        file_path, width, height, updated_at, view, index = parse_thumbnail_id(image_id)
+        if not (width and height) and requested_size.isValid():
+            width, height = requested_size.width(), requested_size.height()
+        response = _ThumbnailResponse()
+        response.job = self._thumbnail_vm.schedule(view, index, (file_path, width, height, updated_at),
+                                                   response.on_loaded)
+        return response
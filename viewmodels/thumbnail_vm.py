@@ -1,46 +1,294 @@
-from PySide6.QtCore import QObject, Signal, Slot, QUrl
-from PySide6.QtGui import QImage
+from PySide6.QtCore import QObject, Signal, Slot, Property, QTimer, QBuffer, QByteArray, QIODevice, Qt
+from PySide6.QtGui import QImage, QImageReader
 from api.thumbnail_api import ThumbnailAPI
-from typing import Optional
-import base64
+from api.thumbnail_cache import ThumbnailCache
+from api.thumbnail_store import get_thumbnail_store, thumbnail_key
+from api.local_thumbnails import get_local_thumbnailer
+from api.metadata_store import metadata_scope
+from api.single_flight import SingleFlight
+from api.thumbnail_scheduler import ThumbnailJob, ThumbnailScheduler
+from api.file_entries import format_size
+from api.http_session import get_session
+from viewmodels.task_executor import get_executor
+from config import config
+from typing import Callable, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote
+import threading
+
+THUMBNAIL_PROVIDER = "thumb"  # QML 中的 image://thumb/<路径>?w=&h=&t=&v=&i=
+
+
+def thumbnail_url(file_path: str, width: Optional[int], height: Optional[int], updated_at: str = "",
+                  view: str = "", index: int = -1) -> str:
+    """缩略图在 QML 中的地址（由 ThumbnailImageProvider 提供）；view/index 用于按可见范围排优先级"""
+    return (f"image://{THUMBNAIL_PROVIDER}/{quote(file_path, safe='')}"
+            f"?w={width or 0}&h={height or 0}&t={quote(updated_at, safe='')}&v={quote(view, safe='')}&i={index}")
+
+
+def parse_thumbnail_id(image_id: str) -> Tuple[str, int, int, str, str, int]:
+    """image://thumb/ 之后的部分 -> (文件路径, 宽, 高, 修改时间, 视图, 行号)"""
+    path, _, query = image_id.partition("?")
+    params = parse_qs(query)
+
+    def number(name: str, default: int) -> int:
+        try:
+            return int(params.get(name, [str(default)])[0])
+        except ValueError:
+            return default
+
+    return (unquote(path), number("w", 0), number("h", 0), params.get("t", [""])[0],
+            params.get("v", [""])[0], number("i", -1))
+
 
 class ThumbnailVM(QObject):
-    thumbnailReady = Signal(str, str)  # 文件路径, 缩略图数据URL（字符串）
+    """
+    缩略图ViewModel
+
+    缩略图只解码一次：load_image 在工作线程中依次查找内存缓存（解码后的 QImage）、
+    磁盘缓存（原始字节）、本地文件（存储目录挂载在本机时）和服务器，按请求的尺寸解码后放入内存缓存。
+    QML 通过 image://thumb/ 地址（ThumbnailImageProvider）直接取得 QImage，不再经过 base64。
+    这些加载由 ThumbnailScheduler 以 THUMBNAIL_WORKERS 个线程执行，视图滚动时通过 set_viewport
+    告知可见范围，可见的单元格优先，其次是下一屏；滚动离开后被销毁的委托的请求直接丢弃。
+    """
+
+    thumbnailReady = Signal(str, str)  # 文件路径, 缩略图地址（image://thumb/...）
     thumbnailFailed = Signal(str, str)  # 文件路径, 错误信息
+    cacheStatsChanged = Signal()
 
     def __init__(self, api: Optional[ThumbnailAPI] = None):
         super().__init__()
         self._api = api if api is not None else ThumbnailAPI()
+        self._executor = get_executor()
+        # 解码后的缩略图按 (路径, 宽, 高, 修改时间) 缓存，滚动回来时不再重新下载和解码
+        self._cache = ThumbnailCache(config.get_thumbnail_cache_mb() * 1024 * 1024,
+                                     size_of=lambda image: image.sizeInBytes())
+        # 磁盘缓存：重启后已浏览过的缩略图不再请求服务器；未启用时为 None
+        self._store = get_thumbnail_store()
+        # 存储目录挂载在本机时从本地文件生成缩略图；未启用时为 None
+        self._local = get_local_thumbnailer()
+        self._scope = metadata_scope("")
+        self._loads = SingleFlight()  # 同一缩略图同时被多个视图请求时只加载一次
+        self._stats_lock = threading.Lock()
+        self._disk_hits = 0
+        self._local_generated = 0
+        self._downloads = 0
+        # 按可见范围排优先级的有界并发加载（供 ThumbnailImageProvider 使用）
+        self._scheduler = ThumbnailScheduler(lambda request: self.load_image(*request),
+                                             workers=config.get_thumbnail_workers())
+        # 计数在加载线程中更新，定时通知 QML，避免每张图片触发一次属性刷新
+        self._stats_snapshot = None
+        self._stats_timer = QTimer(self)
+        self._stats_timer.setInterval(500)
+        self._stats_timer.timeout.connect(self._emit_stats)
+        self._stats_timer.start()
+
+    @Slot(str)
+    def set_username(self, username: str):
+        """设置当前登录的用户名（磁盘缓存按服务器和用户区分）"""
+        self._scope = metadata_scope(username)
 
     @Slot(str)
     def set_token(self, token: str):
         self._api.set_token(token)
 
-    def _detect_image_mime(self, data: bytes) -> str:
-        if data.startswith(b'\x89PNG\r\n\x1a\n'):
-            return "image/png"
-        elif data.startswith(b'\xff\xd8'):
-            return "image/jpeg"
-        elif data.startswith(b'GIF8'):
-            return "image/gif"
-        return "application/octet-stream"
-
     @Slot(str)
     @Slot(str, int)
     @Slot(str, int, int)
-    def requestThumbnail(self, file_path: str, width: Optional[int] = None, height: Optional[int] = None):
-        # print(f"[ThumbnailVM] requestThumbnail: file_path={file_path}, width={width}, height={height}")
-        result = self._api.get_thumbnail_files(fullpath=file_path, width=width, height=height)
-
-        if isinstance(result, bytes):
-            image = QImage.fromData(result)
-            if not image.isNull():
-                mime = self._detect_image_mime(result)
-                base64_str = base64.b64encode(result).decode("utf-8")
-                data_url = f"data:{mime};base64,{base64_str}"
-                self.thumbnailReady.emit(file_path, data_url)  # 这里直接传字符串
+    @Slot(str, int, int, str)
+    def requestThumbnail(self, file_path: str, width: Optional[int] = None, height: Optional[int] = None,
+                         updated_at: str = ""):
+        """预先加载缩略图，完成后通过 thumbnailReady 给出 image://thumb/ 地址"""
+        # 滚动时重建的委托会重复请求同一缩略图，进行中的相同请求直接复用其结果
+        task = self._executor.submit_shared(
+            ("thumbnail", file_path, width, height, updated_at),
+            self.load_image, file_path, width, height, updated_at
+        )
+        if task is not None:
+            task.finished.connect(
+                lambda result, args=(file_path, width, height, updated_at): self._on_thumbnail_loaded(args, result))
+
+    def schedule(self, view: str, index: int, request: tuple,
+                 callback: Callable[[Tuple[Optional[QImage], str]], None]) -> ThumbnailJob:
+        """
+        排队加载缩略图（可在任意线程调用，供 ThumbnailImageProvider 使用），
+        request 为 load_image 的参数，callback 在加载线程中收到 (QImage 或 None, 错误信息)
+        """
+        return self._scheduler.submit(view, index, request, callback)
+
+    @Slot(str, int, int)
+    def set_viewport(self, view: str, first: int, last: int):
+        """视图滚动时告知可见的行范围（含两端）"""
+        self._scheduler.set_viewport(view, first, last)
+
+    @Slot()
+    def shutdown(self):
+        """退出程序时丢弃排队的缩略图并等待加载线程结束"""
+        self._scheduler.shutdown()
+        if self._local is not None:
+            self._local.shutdown()
+
+    def _on_thumbnail_loaded(self, args: tuple, result: tuple):
+        image, error = result
+        if image is not None:
+            self.thumbnailReady.emit(args[0], thumbnail_url(*args))
+        else:
+            self.thumbnailFailed.emit(args[0], error)
+
+    def load_image(self, file_path: str, width: Optional[int], height: Optional[int],
+                   updated_at: str = "") -> Tuple[Optional[QImage], str]:
+        """在工作线程中取得解码后的缩略图，返回 (QImage 或 None, 错误信息)"""
+        key = (file_path, width or 0, height or 0, updated_at)
+        image = self._cache.get(key)
+        if image is not None:
+            return image, ""
+        return self._loads.do(key, lambda: self._load_image(key))
+
+    def _load_image(self, key: tuple) -> Tuple[Optional[QImage], str]:
+        file_path, width, height, updated_at = key
+        disk_key = thumbnail_key(self._scope, file_path, width, height, updated_at)
+        data = None
+        if self._store is not None:
+            mapped = self._store.get(disk_key)
+            if mapped is not None:
+                try:
+                    data = QByteArray(mapped[:])
+                finally:
+                    mapped.close()
+                with self._stats_lock:
+                    self._disk_hits += 1
+        if data is None:
+            result = self._local.generate(file_path, width, height) if self._local is not None else None
+            if result is not None:
+                with self._stats_lock:
+                    self._local_generated += 1
             else:
-                self.thumbnailFailed.emit(file_path, "Invalid image data")
+                result = self._api.get_thumbnail_files(fullpath=file_path, width=width or None, height=height or None)
+                if not isinstance(result, bytes):
+                    error = result.get("error", "Unknown error") if isinstance(result, dict) else str(result)
+                    return None, error
+                with self._stats_lock:
+                    self._downloads += 1
+            data = QByteArray(result)
+            image = self._decode(data, width, height)
+            if image.isNull():
+                return None, "Invalid image data"
+            if self._store is not None:
+                self._store.put(disk_key, result)
         else:
-            error = result.get("error", "Unknown error") if isinstance(result, dict) else str(result)
-            self.thumbnailFailed.emit(file_path, error)
+            image = self._decode(data, width, height)
+            if image.isNull():
+                return None, "Invalid image data"
+        self._cache.put(key, image)
+        return image, ""
+
+    @staticmethod
+    def _decode(data: QByteArray, width: int, height: int) -> QImage:
+        """解码为不大于显示尺寸的图片（按 PreserveAspectCrop 覆盖 width x height）"""
+        buffer = QBuffer()
+        buffer.setData(data)
+        buffer.open(QIODevice.ReadOnly)
+        reader = QImageReader(buffer)
+        size = reader.size()
+        if width and height and size.isValid() and (size.width() > width or size.height() > height):
+            reader.setScaledSize(size.scaled(width, height, Qt.KeepAspectRatioByExpanding))
+        return reader.read()
+
+    def _emit_stats(self):
+        scheduler = self._scheduler
+        snapshot = (self._cache.hits, self._cache.misses, self._cache.evictions,
+                    self._disk_hits, self._local_generated, self._downloads,
+                    scheduler.queue_depth, scheduler.running, scheduler.cancelled, scheduler.first_thumbnail_ms,
+                    self._executor.coalescing_stats(), get_session().coalescing_stats(), self._loads.stats())
+        if snapshot != self._stats_snapshot:
+            self._stats_snapshot = snapshot
+            self.cacheStatsChanged.emit()
+
+    @Slot()
+    def clear_cache(self):
+        """清空内存和磁盘缓存"""
+        self._cache.clear()
+        if self._store is not None:
+            self._store.clear()
+        self.cacheStatsChanged.emit()
+
+    # 缓存统计（用于调整 THUMBNAIL_CACHE_MB）
+    @Property(int, notify=cacheStatsChanged)
+    def cache_hits(self):
+        return self._cache.hits
+
+    @Property(int, notify=cacheStatsChanged)
+    def cache_misses(self):
+        return self._cache.misses
+
+    @Property(int, notify=cacheStatsChanged)
+    def disk_hits(self):
+        """内存缓存未命中、从磁盘缓存读到的次数"""
+        return self._disk_hits
+
+    @Property(int, notify=cacheStatsChanged)
+    def downloads(self):
+        """向服务器请求缩略图的次数"""
+        return self._downloads
+
+    @Property(int, notify=cacheStatsChanged)
+    def local_generated(self):
+        """从本地文件生成缩略图的次数"""
+        return self._local_generated
+
+    @Property(int, notify=cacheStatsChanged)
+    def cache_evictions(self):
+        return self._cache.evictions
+
+    @Property(int, notify=cacheStatsChanged)
+    def cache_entries(self):
+        return len(self._cache)
+
+    @Property(str, notify=cacheStatsChanged)
+    def cache_size_text(self):
+        return f"{format_size(self._cache.size_bytes)} / {format_size(self._cache.max_bytes)}"
+
+    # 调度统计
+    @Property(int, notify=cacheStatsChanged)
+    def queue_depth(self):
+        """排队等待加载的缩略图数"""
+        return self._scheduler.queue_depth
+
+    @Property(int, notify=cacheStatsChanged)
+    def running_loads(self):
+        return self._scheduler.running
+
+    @Property(int, notify=cacheStatsChanged)
+    def cancelled_loads(self):
+        """滚动离开后被丢弃、没有加载的请求数"""
+        return self._scheduler.cancelled
+
+    @Property(float, notify=cacheStatsChanged)
+    def first_thumbnail_ms(self):
+        """最近一次滚动后可见区域第一张缩略图的耗时（毫秒）"""
+        return self._scheduler.first_thumbnail_ms
+
+    @Property(float, notify=cacheStatsChanged)
+    def visible_latency_ms(self):
+        """可见单元格的缩略图从请求到完成的平均耗时（毫秒）"""
+        return self._scheduler.visible_latency_ms
+
+    # 重复请求合并统计
+    @Property(int, notify=cacheStatsChanged)
+    def shared_tasks(self):
+        """共享执行器中可合并任务（目录列表、分类文件分页等）的实际提交数"""
+        return self._executor.coalescing_stats()["submitted"]
+
+    @Property(int, notify=cacheStatsChanged)
+    def coalesced_tasks(self):
+        """合并到进行中任务上、没有再次提交的重复任务数"""
+        return self._executor.coalescing_stats()["coalesced"]
+
+    @Property(int, notify=cacheStatsChanged)
+    def coalesced_requests(self):
+        """共享 HTTP 会话中合并到进行中请求上的重复 GET 数"""
+        return get_session().coalescing_stats()["coalesced"]
+
+    @Property(int, notify=cacheStatsChanged)
+    def coalesced_loads(self):
+        """多个视图同时请求同一缩略图时被合并的加载数"""
+        return self._loads.stats()["coalesced"]
@@ -1,44 +1,531 @@
 from PySide6.QtCore import QObject, Signal, Slot, Property
+import time
+from config import config
 from api.typefiles_api import TypeFilesAPI
+from viewmodels.task_executor import get_executor
+from viewmodels.paged_files_model import PagedFilesModel
+from api.metadata_store import KIND_TYPEFILES, get_metadata_store, metadata_scope
+from api.search_index import get_search_index
+from api.file_entries import format_size
+from api.memory_usage import current_rss
+from api.timeline_index import format_key, granularity_of
+
+SERVER_MAX_PAGE_SIZE = 100  # /api/file/typefiles 的 pagesize 上限（接口文档 maximum: 100）
+MAX_PAGE_SIZE = 60  # 自适应调整每页条数的上限：不超过服务器上限的 30 * 2^k
+FAST_PAGE_MS = 200  # 一页耗时低于此值时每页条数加倍
+SLOW_PAGE_MS = 800  # 一页耗时高于此值时每页条数减半
+PREFETCH_ROWS = 20  # 显示到距末尾这么多条以内时追加下一页
+
+
+class TypeCategory:
+    """一个分类（video/photo/document/audio）的已加载内容与分页状态"""
+
+    def __init__(self, file_type: str, model: PagedFilesModel):
+        self.file_type = file_type
+        self.model = model
+        self.base_page_size = 30
+        self.tasks = {}  # 偏移 -> 进行中的请求
+        self.persisted_task = None  # 正在读取本地元数据缓存中的第一页
+        self.refills = {}  # 被释放的块的起始行 -> 重新加载的请求
+        self.pages = {}  # 偏移 -> 已取到但尚未追加的页
+        self.end_offset = None  # 最后一页不满时得知的总条数
+        self.want_more = False  # 视图已请求追加下一页
+        self.unverified = False  # 显示的内容来自缓存，第一页尚未与服务器核对
+        self.verified_at = None  # 第一页最近一次与服务器核对的时间（time.monotonic）
+        self.last_used = 0.0
+        self.last_error = ""
+        self.is_loading = False
+        self.seek_key = ""  # 时间线跳转的目标分组，尚未加载到时继续加载下一页
+        self.seek_status = ""  # 跳转的进度或结果（显示在页面上）
+
+    def row_count(self) -> int:
+        """模型中常驻的条数加上预取的条数"""
+        return self.model.resident_count() + sum(len(files) for files in self.pages.values())
+
+    def cancel_requests(self):
+        for task in list(self.tasks.values()) + list(self.refills.values()):
+            task.cancel()
+        if self.persisted_task is not None:
+            self.persisted_task.cancel()
+            self.persisted_task = None
+        self.tasks = {}
+        self.refills = {}
+        self.pages = {}
+        self.want_more = False
+
 
 class TypeFilesViewModel(QObject):
+    """
+    分类文件ViewModel（视频、图片、文档、音频）
+
+    每个分类有独立的模型（model_for）和分页状态，切换分类时直接显示已加载的内容；
+    超过 TYPEFILES_CACHE_TTL 的分类先显示旧内容，同时在后台核对第一页，
+    第一页变化时才替换。所有分类合计超过 TYPEFILES_CACHE_ROWS 条时，
+    最久未使用的分类只保留第一页。
+
+    第一页显示后立即在后台预取下一页，视图滚动到末尾附近时直接追加已取到的页，
+    并继续预取再下一页。每页条数按请求耗时在 pagesize 的 2 的幂倍之间调整，
+    已加载的条数总是新页大小的整数倍，页码换算不会错位。同一页只会请求一次。
+
+    模型只在内存中保留当前显示位置附近的块（TYPEFILES_MEMORY_MB），
+    滚动回被释放的位置时按 pagesize 重新请求对应的页，行数和滚动位置不变。
+
+    时间线跳转（seek_timeline）的目标分组尚未加载时，沿正常的分页路径继续追加页面，
+    直到出现该分组或已越过它（或到达末尾），再通过 timelineSeekFinished 给出行号。
+    """
+
     filesChanged = Signal()
     errorChanged = Signal()
+    loadingChanged = Signal()
+    activeChanged = Signal()  # 当前分类变化
     filesFetchedSuccess = Signal(str, list)
+    timelineSeekFinished = Signal(str, str, int)  # 分类, 分组, 行号（-1 表示没有照片）
+    seekStatusChanged = Signal()
 
     def __init__(self, token: str = "", parent=None):
         super().__init__(parent)
         self.api = TypeFilesAPI(token)
-        self._type_files = []
-        self._last_error = ""
+        self._executor = get_executor()
+        self._categories = {}  # 分类 -> TypeCategory
+        self._active = self._category("")  # 最近一次 fetchTypeFiles 的分类
+        self._generation = 0  # 切换用户时递增，旧请求的结果被丢弃
+        self._page_size = 30  # 按请求耗时调整，各分类共用
+        self._username = ""
+        self._metadata_store = get_metadata_store()  # 本地元数据缓存，未启用时为 None
+        self._search_index = get_search_index()
+
+    def _category(self, file_type: str) -> TypeCategory:
+        category = self._categories.get(file_type)
+        if category is None:
+            model = PagedFilesModel(self)
+            category = TypeCategory(file_type, model)
+            model.fetchMoreRequested.connect(lambda c=category: self._load_more(c))
+            model.blockNeeded.connect(lambda offset, c=category: self._refill(c, offset))
+            self._categories[file_type] = category
+        return category
+
+    @Slot(str, result=QObject)
+    def model_for(self, file_type: str):
+        """某个分类的模型（QAbstractListModel），各页面分别绑定"""
+        return self._category(file_type).model
 
     @Slot(str, int, int)
     def fetchTypeFiles(self, file_type, page=1, pagesize=30):
+        """
+        显示某个分类（切换分类时调用）：已加载且未过期时直接显示，
+        过期时先显示再后台核对，未加载过时从第一页开始加载；page 大于 1 时等同于 loadMore
+        """
+        category = self._category(file_type)
+        self._activate(category)
+        if page > 1:
+            self._load_more(category)
+            return
+        if category.verified_at is not None and category.base_page_size == pagesize:
+            if time.monotonic() - category.verified_at > config.get_typefiles_cache_ttl():
+                self._revalidate(category)
+            return
+        self._start(category, pagesize)
+
+    @Slot(str)
+    def refresh(self, file_type):
+        """刷新按钮：保留已显示的内容，后台核对第一页"""
+        category = self._category(file_type)
+        self._activate(category)
+        if category.verified_at is None:
+            self._start(category, category.base_page_size)
+        else:
+            self._revalidate(category)
+
+    @Slot()
+    def loadMore(self):
+        """当前分类需要更多条目"""
+        self._load_more(self._active)
+
+    @Slot(str, int)
+    def ensure_loaded(self, file_type: str, index: int):
+        """视图显示到第 index 条（委托创建时调用），接近末尾时追加下一页"""
+        category = self._category(file_type)
+        if index >= category.model.rowCount() - PREFETCH_ROWS and category.model.has_more:
+            self._load_more(category)
+        self._evict(category)
+
+    def _activate(self, category: TypeCategory):
+        category.last_used = time.monotonic()
+        if category is not self._active:
+            self._active = category
+            self.activeChanged.emit()
+            self.filesChanged.emit()
+            self.errorChanged.emit()
+            self.loadingChanged.emit()
+            self.seekStatusChanged.emit()
+
+    def _start(self, category: TypeCategory, pagesize: int):
+        """从第一页开始加载：先显示本地元数据缓存中的第一页"""
+        category.cancel_requests()
+        category.base_page_size = min(max(1, pagesize), SERVER_MAX_PAGE_SIZE)
+        category.end_offset = None
+        category.verified_at = None
+        self._set_seek(category, "", "")
+        category.model.set_block_size(category.base_page_size)
+        if self._page_size < category.base_page_size or self._page_size % category.base_page_size:
+            self._page_size = category.base_page_size
+        category.unverified = False
+        category.model.set_files([])
+        self._notify_files(category)
+        self._load_persisted_page(category)
+        self._request(category, 0)
+
+    def _revalidate(self, category: TypeCategory):
+        """保留已显示的内容，请求第一页与之核对"""
+        category.unverified = True
+        self._request(category, 0)
+
+    def _load_more(self, category: TypeCategory):
+        """视图需要更多条目：追加已预取的页，或请求下一页"""
+        if not category.file_type:
+            return
+        category.want_more = True
+        if not category.unverified:
+            self._drain(category)
+
+    @staticmethod
+    def _store_key(category: TypeCategory) -> str:
+        """本地元数据缓存中第一页的 key"""
+        return f"{category.file_type}:1:{category.base_page_size}"
+
+    def _load_persisted_page(self, category: TypeCategory):
+        """在工作线程中读取本地元数据缓存中上次获取的第一页，服务器结果到达前先显示"""
+        if self._metadata_store is None:
+            return
+        task = self._executor.submit(self._metadata_store.get_json, metadata_scope(self._username),
+                                     KIND_TYPEFILES, self._store_key(category))
+        generation = self._generation
+        task.finished.connect(lambda files, t=task: self._show_persisted_page(t, generation, category, files))
+        task.failed.connect(lambda error, t=task: self._show_persisted_page(t, generation, category, None))
+        category.persisted_task = task
+
+    def _show_persisted_page(self, task, generation, category: TypeCategory, files):
+        """显示缓存的第一页（GUI 线程）；服务器的第一页已经到达时丢弃"""
+        if generation != self._generation or category.persisted_task is not task:
+            return
+        category.persisted_task = None
+        if files is None:
+            return
+        category.unverified = True
+        category.model.set_files(files, has_more=len(files) >= category.base_page_size)
+        category.last_error = ""
+        self.filesFetchedSuccess.emit(category.file_type, files)
+        self._notify_files(category)
+        self._notify_error(category)
+
+    def _request(self, category: TypeCategory, offset: int):
+        """请求从 offset 开始的一页（已在请求或已取到时忽略）"""
+        if offset in category.tasks or offset in category.pages:
+            return
+        if offset and category.end_offset is not None and offset >= category.end_offset:
+            return
+        # 第一页固定使用 pagesize，之后用 pagesize * 2^k 中不超过当前每页条数、且整除 offset 的最大值
+        base = category.base_page_size
+        if offset % base:
+            return  # 只有最后一页不满 pagesize，此时 end_offset 已知
+        size = base
+        while offset and size * 2 <= self._page_size and offset % (size * 2) == 0:
+            size *= 2
+        page = offset // size + 1
+        scope = metadata_scope(self._username)
+        key = ("typefiles", category.file_type, page, size)
+        task = self._executor.submit_shared(
+            key, self._fetch_page, category.file_type, page, size, scope,
+            self._store_key(category) if offset == 0 else None
+        )
+        if task is None:
+            return
+        generation = self._generation
+        started = time.perf_counter()
+        task.finished.connect(
+            lambda result, t=task: self._on_page_fetched(t, generation, category, offset, size, started, result))
+        task.failed.connect(
+            lambda error, t=task: self._on_page_fetched(t, generation, category, offset, size, started,
+                                                        {"success": False, "error": error}))
+        category.tasks[offset] = task
+        self._update_loading(category)
+
+    @staticmethod
+    def _is_last_page(files: list, size: int) -> bool:
+        """不满一页才说明到了末尾；按服务器实际会返回的条数比较，超过上限的请求会被截断"""
+        return len(files) < min(size, SERVER_MAX_PAGE_SIZE)
+
+    def _fetch_page(self, file_type, page, pagesize, scope, store_key=None):
+        """在工作线程中获取一页分类文件、转换格式；第一页同时写入本地元数据缓存"""
         result = self.api.get_type_files(file_type, page, pagesize)
         if result["success"]:
-            files = result["data"].get("files", [])
-            self._type_files = [self.transform_file_data(f) for f in files]
-            self._last_error = ""
-            self.filesFetchedSuccess.emit(file_type, self._type_files)
+            files = result["data"].get("files") if result["data"] else None
+            result["files"] = [self.transform_file_data(f) for f in files or [] if f]
+            self._search_index.add_many((f["relPath"], False) for f in result["files"])
+            if self._metadata_store is not None and store_key is not None:
+                self._metadata_store.put_json(scope, KIND_TYPEFILES, store_key, result["files"])
+        return result
+
+    def _on_page_fetched(self, task, generation, category, offset, size, started, result):
+        if generation != self._generation or category.tasks.get(offset) is not task:
+            return
+        del category.tasks[offset]
+        if offset == 0:
+            category.persisted_task = None  # 服务器结果优先，不再显示缓存的第一页
+        if not result["success"]:
+            self._on_page_failed(category, offset, result)
+            return
+        self._adapt_page_size(category, (time.perf_counter() - started) * 1000)
+        files = result["files"]
+        if offset == 0:
+            self._on_first_page(category, files, size)
+        else:
+            if self._is_last_page(files, size):
+                category.end_offset = offset + len(files)
+            category.pages[offset] = files
+        self._drain(category)
+        self._enforce_cap()
+
+    def _on_first_page(self, category: TypeCategory, files: list, size: int):
+        """第一页到达：与已显示的内容相同时保留全部已加载的页，否则从这一页重新开始"""
+        model = category.model
+        if category.unverified and model.rowCount() and model.file_at(0) is None:
+            # 第一块已被释放（显示位置在很后面）：补上第一块，保留其余内容
+            model.fill_block(0, files)
+        unchanged = (category.unverified and model.head(len(files)) == files
+                     and (len(files) == size or model.rowCount() == len(files)))
+        category.unverified = False
+        category.verified_at = time.monotonic()
+        if self._is_last_page(files, size):
+            category.end_offset = len(files)
+        if not unchanged:
+            want_more = category.want_more
+            category.cancel_requests()
+            category.want_more = want_more
+            if not self._is_last_page(files, size):
+                category.end_offset = None
+            category.model.set_files(files, has_more=category.end_offset is None)
+            self.filesFetchedSuccess.emit(category.file_type, files)
+            self._notify_files(category)
+        if category.last_error:
+            category.last_error = ""
+            self._notify_error(category)
+
+    def _on_page_failed(self, category: TypeCategory, offset, result):
+        error = result.get("error") or "未知错误"
+        if offset == 0 and not category.unverified:
+            category.model.set_files([])
+            category.last_error = error
+            self._notify_files(category)
+            self._notify_error(category)
+        else:
+            # 保留已显示的内容，下次滚动到末尾时重试
+            print(f"分类文件 {category.file_type} 第 {offset} 条起的一页加载失败: {error}")
+            category.unverified = False
+            category.want_more = False
+            if category.seek_key:
+                self._finish_seek(category, f"加载失败，已跳到已加载的最近日期: {error}")
+        self._update_loading(category)
+
+    def _drain(self, category: TypeCategory):
+        """追加视图需要的下一页，并保持后面有一页已预取"""
+        model = category.model
+        loaded = model.rowCount()
+        has_more = category.end_offset is None or loaded < category.end_offset
+        if category.want_more and loaded in category.pages:
+            category.want_more = False
+            files = category.pages.pop(loaded)
+            loaded += len(files)
+            has_more = category.end_offset is None or loaded < category.end_offset
+            model.append_files(files, has_more=has_more)
+            self._notify_files(category)
+            self._evict(category)
+            if category.seek_key:
+                self._continue_seek(category, has_more)
+                return
+        else:
+            model.set_has_more(has_more)
+        ahead = loaded
+        while ahead in category.pages and category.pages[ahead]:
+            ahead += len(category.pages[ahead])
+        if ahead == loaded:
+            self._request(category, ahead)
+        self._update_loading(category)
+
+    @Slot(str, str)
+    def seek_timeline(self, file_type: str, key: str):
+        """
+        跳转到分组 key（"2021" / "2021-03" / "2021-03-14"）：已加载的内容中有该分组或已越过它时立即给出行号，
+        否则继续加载后面的页，直到能确定位置
+        """
+        category = self._category(file_type)
+        key = key.strip()
+        if granularity_of(key) is None:
+            self._set_seek(category, "", "日期格式应为 2021、2021-03 或 2021-03-14")
+            return
+        self._set_seek(category, key, f"正在加载到 {format_key(key)}…")
+        if category.model.covers(key) or not category.model.has_more:
+            self._finish_seek(category)
+        else:
+            self._load_more(category)
+
+    def _continue_seek(self, category: TypeCategory, has_more: bool):
+        """追加一页后：能确定跳转位置时结束，否则继续追加下一页"""
+        if category.model.covers(category.seek_key) or not has_more:
+            self._finish_seek(category)
+            self._drain(category)
+            return
+        category.want_more = True
+        self._drain(category)
+
+    def _finish_seek(self, category: TypeCategory, failure: str = ""):
+        key = category.seek_key
+        row = category.model.seek(key)
+        if row < 0:
+            status = f"没有 {format_key(key)} 的照片"
+        elif failure:
+            status = failure
+        elif category.model.section_key(row, granularity_of(key)) != key:
+            status = f"没有 {format_key(key)} 的照片，已跳到最近的日期"
         else:
-            self._type_files = []
-            self._last_error = result.get("error", "未知错误")
-        self.filesChanged.emit()
-        self.errorChanged.emit()
+            status = ""
+        self._set_seek(category, "", status)
+        self.timelineSeekFinished.emit(category.file_type, key, row)
+
+    def _set_seek(self, category: TypeCategory, key: str, status: str):
+        category.seek_key = key
+        if status != category.seek_status:
+            category.seek_status = status
+            if category is self._active:
+                self.seekStatusChanged.emit()
+
+    def _enforce_cap(self):
+        """所有分类合计超过上限时，最久未使用的分类只保留第一页（当前分类不受影响）"""
+        limit = config.get_typefiles_cache_rows()
+        total = sum(category.row_count() for category in self._categories.values())
+        if total <= limit:
+            return
+        others = sorted((category for category in self._categories.values() if category is not self._active),
+                        key=lambda category: category.last_used)
+        for category in others:
+            if total <= limit:
+                break
+            before = category.row_count()
+            category.cancel_requests()
+            category.model.truncate(category.base_page_size)
+            total -= before - category.row_count()
+
+    def _refill(self, category: TypeCategory, offset: int):
+        """视图显示到被释放的块：按第一页的 pagesize 重新请求这一页"""
+        if offset in category.refills:
+            return
+        size = category.base_page_size
+        page = offset // size + 1
+        scope = metadata_scope(self._username)
+        task = self._executor.submit_shared(
+            ("typefiles-refill", category.file_type, page, size), self._fetch_page,
+            category.file_type, page, size, scope
+        )
+        if task is None:
+            category.model.cancel_block_request(offset)
+            return
+        generation = self._generation
+        task.finished.connect(lambda result, t=task: self._on_refilled(t, generation, category, offset, result))
+        task.failed.connect(lambda error, t=task: self._on_refilled(t, generation, category, offset,
+                                                                    {"success": False, "error": error}))
+        category.refills[offset] = task
+
+    def _on_refilled(self, task, generation, category, offset, result):
+        if generation != self._generation or category.refills.get(offset) is not task:
+            return
+        del category.refills[offset]
+        if not result["success"]:
+            # 保持占位，视图再次显示到这些行时重试
+            print(f"分类文件 {category.file_type} 第 {offset} 条起的块重新加载失败: {result.get('error')}")
+            category.model.cancel_block_request(offset)
+            return
+        category.model.fill_block(offset, result["files"])
+        self._evict(category)
+
+    def _evict(self, category: TypeCategory):
+        """常驻数据超出 TYPEFILES_MEMORY_MB 时释放远离显示位置的块"""
+        model = category.model
+        evicted = model.evict(config.get_typefiles_memory_mb() * 1024 * 1024)
+        if evicted:
+            rss = current_rss()
+            print(f"分类文件 {category.file_type} 释放 {evicted} 块, 常驻 {model.resident_count()}/{model.rowCount()} 条 "
+                  f"({format_size(model.resident_bytes())}), 进程内存 {format_size(rss) if rss else '未知'}")
+
+    def _adapt_page_size(self, category: TypeCategory, elapsed_ms: float):
+        """在 pagesize * 2^k 之间调整，不小于 pagesize（更小的页与模型的分块和页码都对不齐）"""
+        if elapsed_ms < FAST_PAGE_MS and self._page_size * 2 <= MAX_PAGE_SIZE:
+            self._page_size *= 2
+        elif elapsed_ms > SLOW_PAGE_MS and self._page_size // 2 >= category.base_page_size:
+            self._page_size //= 2
+
+    def _update_loading(self, category: TypeCategory):
+        """第一页或视图正在等待的页仍在请求中"""
+        loading = ((0 in category.tasks and not category.unverified)
+                   or (category.want_more and bool(category.tasks)))
+        if loading != category.is_loading:
+            category.is_loading = loading
+            if category is self._active:
+                self.loadingChanged.emit()
+
+    def _notify_files(self, category: TypeCategory):
+        if category is self._active:
+            self.filesChanged.emit()
+
+    def _notify_error(self, category: TypeCategory):
+        if category is self._active:
+            self.errorChanged.emit()
 
     def getFiles(self):
-        return self._type_files
+        return self._active.model.files()
 
     def getError(self):
-        return self._last_error
+        return self._active.last_error
+
+    def getModel(self):
+        return self._active.model
+
+    def getLoading(self):
+        return self._active.is_loading
+
+    def getSeekStatus(self):
+        return self._active.seek_status
 
     files = Property('QVariantList', fget=getFiles, notify=filesChanged)
+    model = Property(QObject, fget=getModel, notify=activeChanged)
+    isLoading = Property(bool, fget=getLoading, notify=loadingChanged)
     lastError = Property(str, fget=getError, notify=errorChanged)
+    seekStatus = Property(str, fget=getSeekStatus, notify=seekStatusChanged)
 
     @Slot(str)
     def set_token(self, token: str):
         self.api.set_token(token)
 
+    @Slot(str)
+    def set_username(self, username: str):
+        """设置当前登录的用户名（决定使用哪个用户的本地缓存）；切换用户后清空所有分类"""
+        if username != self._username:
+            self._username = username
+            self._generation += 1
+            for category in self._categories.values():
+                category.cancel_requests()
+                category.end_offset = None
+                category.unverified = False
+                category.verified_at = None
+                category.last_error = ""
+                category.is_loading = False
+                category.seek_key = ""
+                category.seek_status = ""
+                category.model.set_files([])
+            self.filesChanged.emit()
+            self.errorChanged.emit()
+            self.loadingChanged.emit()
+            self.seekStatusChanged.emit()
+
     @staticmethod
     def transform_file_data(file_data: dict) -> dict:
         return {
@@ -6,6 +6,8 @@ import os
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+from viewmodels.task_executor import get_executor
+
 
 class UploadViewModel(QObject):
     """文件上传ViewModel，专门处理文件上传相关功能"""
@@ -19,6 +21,8 @@ class UploadViewModel(QObject):
     def __init__(self):
         super().__init__()
         self._upload_api = UploadAPI()
+        self._executor = get_executor()
+        self._current_task = None  # 当前上传任务
         self._upload_progress = 0
         self._is_uploading = False
         self._current_upload_file = ""
@@ -39,10 +43,24 @@ class UploadViewModel(QObject):
     @Slot(str)
     def upload_file(self, file_path: str):
         """上传单个文件到当前目录"""
+        self._start_upload(file_path)
+    
+    def _start_upload(self, file_path: str, on_finished=None):
+        """验证文件后在后台线程中上传，完成后回到 GUI 线程通知结果"""
         # 首先验证文件
         validation_result = self._upload_api.validate_file(file_path)
         if not validation_result["valid"]:
-            self.uploadFinished.emit(False, validation_result["error"])
+            if on_finished:
+                on_finished(False, validation_result["error"])
+            else:
+                self.uploadFinished.emit(False, validation_result["error"])
+            return
+        
+        if self._is_uploading:
+            message = "已有文件正在上传，请稍后再试"
+            self.uploadFinished.emit(False, message)
+            if on_finished:
+                on_finished(False, message)
             return
         
         self._is_uploading = True
@@ -51,25 +69,46 @@ class UploadViewModel(QObject):
         self.uploadProgressChanged.emit(0)
         self.uploadStarted.emit(self._current_upload_file)
         
-        # 定义进度回调函数
-        def progress_callback(progress):
-            self._upload_progress = progress
-            self.uploadProgressChanged.emit(progress)
-        
         # 调用上传API
-        result = self._upload_api.upload_file_with_progress(
-            file_path, 
-            self._current_directory,
-            progress_callback
+        current_directory = self._current_directory
+        task = self._executor.submit_task(
+            lambda t: self._upload_api.upload_file_with_progress(
+                file_path,
+                current_directory,
+                t.report_progress,
+                cancel_token=t.token
+            )
         )
+        task.progress.connect(self._on_upload_progress)
+        task.finished.connect(lambda result, t=task: self._on_upload_result(t, result, on_finished))
+        task.failed.connect(lambda error, t=task: self._on_upload_result(t, {"success": False, "error": error}, on_finished))
+        self._current_task = task
+    
+    def _on_upload_progress(self, progress: int):
+        """处理上传进度（GUI 线程）"""
+        if self._is_uploading:
+            self._upload_progress = progress
+            self.uploadProgressChanged.emit(progress)
+    
+    def _on_upload_result(self, task, result: dict, on_finished=None):
+        """处理上传结果（GUI 线程）"""
+        if task is not self._current_task:
+            return
+        self._current_task = None
         
         if result["success"]:
             self._upload_progress = 100
             self.uploadProgressChanged.emit(100)
-            self.uploadFinished.emit(True, f"文件 '{self._current_upload_file}' 上传成功")
+            success_message = f"文件 '{self._current_upload_file}' 上传成功"
+            self.uploadFinished.emit(True, success_message)
+            if on_finished:
+                on_finished(True, success_message)
         else:
             error_msg = result.get("error", "上传失败")
-            self.uploadFinished.emit(False, f"文件 '{self._current_upload_file}' 上传失败: {error_msg}")
+            error_message = f"文件 '{self._current_upload_file}' 上传失败: {error_msg}"
+            self.uploadFinished.emit(False, error_message)
+            if on_finished:
+                on_finished(False, error_message)
         
         self._is_uploading = False
         self._current_upload_file = ""
@@ -154,6 +193,10 @@ class UploadViewModel(QObject):
     def cancel_current_upload(self):
         """取消当前上传"""
         if self._is_uploading:
+            if self._current_task is not None:
+                # 取消令牌会中断请求体发送
+                self._current_task.cancel()
+                self._current_task = None
             self._is_uploading = False
             self._current_upload_file = ""
             self.uploadCancelled.emit()
@@ -191,48 +234,7 @@ class UploadViewModel(QObject):
     @Slot(str)
     def upload_file_with_callback(self, file_path: str, on_finished=None):
         """上传文件并执行回调"""
-        # 首先验证文件
-        validation_result = self._upload_api.validate_file(file_path)
-        if not validation_result["valid"]:
-            if on_finished:
-                on_finished(False, validation_result["error"])
-            return
-        
-        self._is_uploading = True
-        self._upload_progress = 0
-        self._current_upload_file = os.path.basename(file_path)
-        self.uploadProgressChanged.emit(0)
-        self.uploadStarted.emit(self._current_upload_file)
-        
-        # 定义进度回调函数
-        def progress_callback(progress):
-            self._upload_progress = progress
-            self.uploadProgressChanged.emit(progress)
-        
-        # 调用上传API
-        result = self._upload_api.upload_file_with_progress(
-            file_path, 
-            self._current_directory,
-            progress_callback
-        )
-        
-        if result["success"]:
-            self._upload_progress = 100
-            self.uploadProgressChanged.emit(100)
-            success_message = f"文件 '{self._current_upload_file}' 上传成功"
-            self.uploadFinished.emit(True, success_message)
-            if on_finished:
-                on_finished(True, success_message)
-        else:
-            error_msg = result.get("error", "上传失败")
-            error_message = f"文件 '{self._current_upload_file}' 上传失败: {error_msg}"
-            self.uploadFinished.emit(False, error_message)
-            if on_finished:
-                on_finished(False, error_message)
-        
-        self._is_uploading = False
-        self._current_upload_file = ""
-        self.uploadProgressChanged.emit(0)  # 重置进度
+        self._start_upload(file_path, on_finished)
     
     # 属性定义
     @Property(int, notify=uploadProgressChanged)